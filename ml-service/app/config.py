@@ -15,7 +15,7 @@ class Settings(BaseSettings):
         env_prefix="ML_",
         extra="ignore",
     )
-
+    
     # Server
     environment: str = "development"
     port: int = 8000
@@ -27,6 +27,31 @@ class Settings(BaseSettings):
     # ML Model paths
     model_path: str = "saved_models"
     
+    # Learning resource catalog directory (defaults to <model_path>/catalog);
+    # the built-in catalog is used when it does not exist
+    catalog_path: str = ""
+    catalog_cache_size: int = 1024
+    
+    # Role requirements file (defaults to <model_path>/roles.json);
+    # the built-in table is used when it does not exist
+    roles_path: str = ""
+    # Role id -> role key aliases registered through /admin/roles/aliases
+    # (defaults to <model_path>/role_aliases.json), shared by every worker
+    role_aliases_path: str = ""
+    
+    # Poll role/catalog files for changes every N seconds (0 = disabled).
+    # /admin/data/reload only reloads the process that answers it, so set
+    # this when running more than one worker.
+    data_watch_interval: float = 0.0
+    
+    # Warm up data, pool workers and routes (with synthetic requests) in
+    # the background at startup; /health/ready answers 503 until done.
+    # Disabled, startup only loads the data before serving.
+    warmup_enabled: bool = True
+    
+    # Token required in X-Admin-Token for /admin endpoints (unset = disabled)
+    admin_token: str = ""
+    
     # Scoring thresholds
     confidence_threshold: float = 0.7
     gap_critical_threshold: int = 3
@@ -34,6 +59,64 @@ class Settings(BaseSettings):
     
     # Learning time estimates (hours per level)
     hours_per_level: int = 20
+    
+    # Recommendations per request (default and largest allowed)
+    recommendation_limit: int = 10
+    recommendation_max_limit: int = 100
+    
+    # Skill name -> resource key resolution cache
+    skill_index_cache_size: int = 4096
+    
+    # Role id -> role key resolution cache
+    role_cache_size: int = 4096
+    
+    # Result cache backend: "memory" (per worker), "sqlite" (a file shared
+    # by all workers on the host) or "redis" (shared across hosts)
+    cache_backend: str = "memory"
+    cache_sqlite_path: str = ""  # defaults to <model_path>/cache.sqlite3
+    cache_redis_url: str = "redis://localhost:6379/0"  # a db used only by the cache
+    
+    # Result caches per service (entries, seconds; size 0 disables them)
+    prediction_cache_size: int = 10000
+    prediction_cache_ttl: float = 300.0
+    gap_cache_size: int = 10000
+    gap_cache_ttl: float = 300.0
+    recommendation_cache_size: int = 10000
+    recommendation_cache_ttl: float = 300.0
+    
+    # Coalesce concurrent /predict/proficiency calls: wait up to this many
+    # milliseconds (0 = disabled) or items, then score them in one pass
+    prediction_batch_window_ms: float = 0.0
+    prediction_batch_max_items: int = 64
+    
+    # Record request, service and cache metrics for /metrics
+    metrics_enabled: bool = True
+    
+    # Sampling profiler for the API routes (also startable via /admin/profiler):
+    # fraction of requests to sample at startup (0 = off), session length,
+    # sampling interval and sample cap; sessions stop themselves at the limits
+    profiler_sample_rate: float = 0.0
+    profiler_duration: float = 60.0
+    profiler_max_duration: float = 600.0
+    profiler_interval_ms: float = 5.0
+    profiler_max_samples: int = 100_000
+    
+    # Serialize trusted service output directly (orjson if installed)
+    # instead of re-validating it against the response models
+    fast_responses: bool = False
+    
+    # Where CPU-bound scoring runs: "inline" (event loop), "thread" or
+    # "process" pool. Only requests with at least execution_threshold
+    # assessment responses are dispatched; more than execution_max_pending
+    # dispatched requests per worker are rejected with 429.
+    execution_mode: str = "inline"
+    execution_workers: int = 2
+    execution_threshold: int = 2000
+    execution_max_pending: int = 8
+    
+    # Batch endpoints
+    batch_max_items: int = 5000
+    ndjson_max_line_bytes: int = 1_048_576
 
 
 settings = Settings()
@@ -4,11 +4,13 @@ SkillSense AI - ML Service Entry Point
 FastAPI application for skill gap analysis and recommendations
 """
 
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
-from app.routes import health, prediction, recommendation
+from app.routes import admin, health, pipeline, prediction, recommendation
 
 # Create FastAPI application
 app = FastAPI(
@@ -32,6 +34,8 @@ app.add_middleware(
 app.include_router(health.router, tags=["Health"])
 app.include_router(prediction.router, prefix="/api/v1", tags=["Prediction"])
 app.include_router(recommendation.router, prefix="/api/v1", tags=["Recommendation"])
+app.include_router(pipeline.router, prefix="/api/v1", tags=["Pipeline"])
+app.include_router(admin.router, prefix="/admin", tags=["Admin"])
 
 
 @app.on_event("startup")
@@ -44,13 +48,51 @@ async def startup_event():
     print(f"║  Port: {settings.port:<50}║")
     print("╚═══════════════════════════════════════════════════════════╝")
     
-    # Pre-load models
-    from app.services.predictor import predictor_service
-    predictor_service.initialize()
-    print("✓ ML models initialized")
+    from app.services.executor import scoring_executor
+    scoring_executor.start()
+    print(f"✓ Scoring execution mode: {scoring_executor.mode}")
+    
+    # Load models and data (services defer this until now to keep imports
+    # cheap); /health/ready answers 503 until this is done
+    from app.services.warmup import warmup_service
+    if settings.warmup_enabled:
+        warmup_service.start(app)
+        print("✓ Warm-up started")
+    else:
+        await warmup_service.run(app, synthetic=False)
+    
+    from app.services.data_store import data_store
+    if settings.data_watch_interval > 0:
+        data_store.start_watcher(settings.data_watch_interval)
+        print(f"✓ Watching data files every {settings.data_watch_interval}s")
+    elif os.environ.get("WEB_CONCURRENCY", "1").strip() not in ("", "1"):
+        print("⚠ Several workers but no data watcher: /admin/data/reload only "
+              "reloads one worker (set ML_DATA_WATCH_INTERVAL)")
+    
+    if settings.profiler_sample_rate > 0:
+        from app.utils.profiler import profiler
+        profiler.start(
+            sample_rate=settings.profiler_sample_rate,
+            duration=min(settings.profiler_duration, settings.profiler_max_duration),
+            interval=settings.profiler_interval_ms / 1000,
+        )
+        print(f"✓ Profiling {settings.profiler_sample_rate:.0%} of requests "
+              f"for {settings.profiler_duration:.0f}s")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     print("ML Service shutting down...")
+    
+    from app.services.warmup import warmup_service
+    warmup_service.cancel()
+    
+    from app.services.data_store import data_store
+    data_store.stop_watcher()
+    
+    from app.services.executor import scoring_executor
+    scoring_executor.shutdown()
+    
+    from app.utils.profiler import profiler
+    profiler.stop()
@@ -2,6 +2,6 @@
 SkillSense AI - Routes Package
 """
 
-from app.routes import health, prediction, recommendation
+from app.routes import admin, health, pipeline, prediction, recommendation
 
-__all__ = ["health", "prediction", "recommendation"]
+__all__ = ["admin", "health", "pipeline", "prediction", "recommendation"]
@@ -0,0 +1,130 @@
+"""
+SkillSense AI - Admin Routes
+"""
+
+import asyncio
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import Dict, Optional
+
+from app.config import settings
+from app.services.data_store import data_store
+from app.services.gap_analyzer import gap_analyzer_service
+from app.utils.profiler import profiler
+
+router = APIRouter()
+
+
+class RoleAliasRequest(BaseModel):
+    aliases: Dict[str, str]
+    replace: bool = False
+
+
+class ProfilerStartRequest(BaseModel):
+    sampleRate: float = Field(default=0.1, gt=0, le=1)
+    durationSeconds: float = Field(default=60.0, gt=0, le=settings.profiler_max_duration)
+    intervalMs: float = Field(default=5.0, ge=1, le=1000)
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    """Allow the request only with the configured admin token"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+@router.get("/data/version", dependencies=[Depends(require_admin)])
+async def data_version():
+    """Versions of the active role and catalog data"""
+    return data_store.versions()
+
+
+@router.post("/data/reload", dependencies=[Depends(require_admin)])
+async def reload_data():
+    """
+    Reload role requirements and the resource catalog from disk.
+    
+    New snapshots are built in a thread and swapped in atomically; requests
+    already in flight finish on the previous data.
+    
+    Only the worker process that answers is reloaded. With several uvicorn
+    workers (or pods), set ML_DATA_WATCH_INTERVAL so every process picks
+    up changed files itself.
+    """
+    try:
+        return await asyncio.to_thread(data_store.reload)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Data reload failed: {str(e)}")
+
+
+@router.get("/roles/aliases", dependencies=[Depends(require_admin)])
+async def list_role_aliases():
+    """Registered role id -> role key aliases"""
+    return {"aliases": gap_analyzer_service.role_aliases}
+
+
+@router.post("/roles/aliases", dependencies=[Depends(require_admin)])
+async def register_role_aliases(request: RoleAliasRequest):
+    """
+    Register role id -> role key aliases in bulk.
+    
+    Lets the backend map its role ObjectIds to role requirements instead of
+    having them fall back to the default role. Aliases are saved next to
+    the role data; other workers load them on their next data reload.
+    """
+    try:
+        total = gap_analyzer_service.register_role_aliases(
+            request.aliases, replace=request.replace
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Saving role aliases failed: {str(e)}")
+    
+    return {"registered": len(request.aliases), "total": total}
+
+
+@router.post("/profiler/start", dependencies=[Depends(require_admin)])
+async def start_profiler(request: ProfilerStartRequest):
+    """
+    Start sampling a fraction of API requests.
+    
+    The session switches itself off after ``durationSeconds`` or the
+    configured sample cap; earlier results are discarded.
+    """
+    profiler.start(
+        sample_rate=request.sampleRate,
+        duration=request.durationSeconds,
+        interval=request.intervalMs / 1000,
+    )
+    return profiler.status()
+
+
+@router.post("/profiler/stop", dependencies=[Depends(require_admin)])
+async def stop_profiler():
+    """Stop the profiling session, keeping its results"""
+    profiler.stop()
+    return profiler.status()
+
+
+@router.get("/profiler", dependencies=[Depends(require_admin)])
+async def profiler_results(format: str = "status"):
+    """
+    Profiling session state or results.
+    
+    ``format``: "status", "collapsed" (one ``root;...;leaf count`` line per
+    stack) or "speedscope" (JSON for https://www.speedscope.app).
+    """
+    if format == "status":
+        return profiler.status()
+    if format == "collapsed":
+        return PlainTextResponse(profiler.collapsed())
+    if format == "speedscope":
+        return profiler.speedscope()
+    
+    raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
@@ -3,11 +3,65 @@ SkillSense AI - Health Check Routes
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
 from datetime import datetime
 
+from app.utils.metrics import metrics
+
 router = APIRouter()
 
 
+def _runtime_metrics():
+    """Cache, executor and micro-batcher counters, read at scrape time"""
+    from app.services.predictor import predictor_service
+    from app.services.gap_analyzer import gap_analyzer_service
+    from app.services.recommender import recommender_service
+    from app.services.executor import scoring_executor
+    from app.routes.prediction import prediction_batcher
+    
+    caches = {
+        "prediction": predictor_service.cache,
+        "gap_analysis": gap_analyzer_service.cache,
+        "recommendations": recommender_service.cache,
+    }
+    for field in ("hits", "misses", "evictions", "expirations", "errors"):
+        yield (
+            f"skillsense_cache_{field}_total", "counter", f"Result cache {field}",
+            {(("cache", name),): getattr(cache, field) for name, cache in caches.items()},
+        )
+    
+    role_cache = gap_analyzer_service.data.resolve_role_key.cache_info()
+    yield (
+        "skillsense_role_resolution_lookups_total", "counter",
+        "Role id resolutions by cache result (per role data snapshot)",
+        {(("result", "hit"),): role_cache.hits, (("result", "miss"),): role_cache.misses},
+    )
+    
+    executor = scoring_executor.stats()
+    yield (
+        "skillsense_executor_pending", "gauge",
+        "Scoring calls running or queued in the pool", {(): executor["pending"]},
+    )
+    yield (
+        "skillsense_executor_calls_total", "counter", "Scoring calls by where they ran",
+        {
+            (("outcome", outcome),): executor[outcome]
+            for outcome in ("inline", "dispatched", "rejected")
+        },
+    )
+    yield (
+        "skillsense_prediction_batches_total", "counter",
+        "Micro-batches of /predict/proficiency calls", {(): prediction_batcher.batches},
+    )
+    yield (
+        "skillsense_prediction_batch_items_total", "counter",
+        "Requests scored in micro-batches", {(): prediction_batcher.items},
+    )
+
+
+metrics.register_collector(_runtime_metrics)
+
+
 @router.get("/health")
 async def health_check():
     """Service health check endpoint"""
@@ -21,14 +75,55 @@ async def health_check():
 
 @router.get("/health/ready")
 async def readiness_check():
-    """Readiness probe for orchestration"""
-    # Check if models are loaded
+    """
+    Readiness probe for orchestration.
+    
+    Answers 503 until the startup warm-up has finished (or if it failed),
+    with per-component readiness and warm-up timings either way.
+    """
     from app.services.predictor import predictor_service
+    from app.services.gap_analyzer import gap_analyzer_service
+    from app.services.recommender import recommender_service
+    from app.services.executor import scoring_executor
+    from app.services.warmup import warmup_service
     
-    is_ready = predictor_service.is_initialized
+    is_ready = warmup_service.ready
+    body = {
+        "ready": is_ready,
+        "models_loaded": predictor_service.is_initialized,
+        "warmup": warmup_service.status(),
+        "execution": scoring_executor.stats(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+    # Reading data versions builds missing snapshots; only do it once loaded
+    if gap_analyzer_service.is_initialized and recommender_service.is_initialized:
+        from app.services.data_store import data_store
+        body["data_version"] = data_store.versions()
+    
+    if not is_ready:
+        return JSONResponse(status_code=503, content=body)
+    return body
+
+
+@router.get("/health/cache")
+async def cache_stats():
+    """Result cache counters, for sizing the caches"""
+    from app.services.predictor import predictor_service
+    from app.services.gap_analyzer import gap_analyzer_service
+    from app.services.recommender import recommender_service
     
     return {
-        "ready": is_ready,
-        "models_loaded": is_ready,
+        "prediction": predictor_service.cache.stats(),
+        "gap_analysis": gap_analyzer_service.cache.stats(),
+        "recommendations": recommender_service.cache.stats(),
+        "role_resolution": gap_analyzer_service.data.resolve_role_key.cache_info()._asdict(),
         "timestamp": datetime.utcnow().isoformat(),
     }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Request, service and cache metrics in the Prometheus text format"""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,100 @@
+"""
+SkillSense AI - Pipeline Routes
+"""
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional
+
+from app.config import settings
+from app.routes.prediction import (
+    AssessmentResponse,
+    GapAnalysisResponse,
+    ProficiencyPredictionResponse,
+    SkillProfile,
+    _saturated,
+)
+from app.routes.recommendation import GapInfo, LearningRecommendation
+from app.services import tasks
+from app.services.executor import ExecutorSaturated, scoring_executor
+from app.services.pipeline import PIPELINE_STAGES
+from app.utils.metrics import InstrumentedRoute
+from app.utils.responses import trusted_response
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+PipelineStage = Literal["predict", "gaps", "recommend"]
+
+
+class PipelineRequest(BaseModel):
+    userId: str
+    stages: List[PipelineStage] = Field(
+        default_factory=lambda: list(PIPELINE_STAGES), min_length=1
+    )
+    assessmentResponses: Optional[List[AssessmentResponse]] = None
+    skillProfile: Optional[SkillProfile] = None
+    targetRoleId: Optional[str] = None
+    gaps: Optional[List[GapInfo]] = None
+    limit: Optional[int] = Field(
+        default=None, ge=1, le=settings.recommendation_max_limit
+    )
+    
+    @model_validator(mode="after")
+    def check_stage_inputs(self) -> "PipelineRequest":
+        if "predict" in self.stages and self.assessmentResponses is None:
+            raise ValueError("stage 'predict' requires assessmentResponses")
+        if "gaps" in self.stages:
+            if self.targetRoleId is None:
+                raise ValueError("stage 'gaps' requires targetRoleId")
+            if "predict" not in self.stages and self.skillProfile is None:
+                raise ValueError("stage 'gaps' requires skillProfile or stage 'predict'")
+        if "recommend" in self.stages and "gaps" not in self.stages and self.gaps is None:
+            raise ValueError("stage 'recommend' requires gaps or stage 'gaps'")
+        return self
+
+
+class PipelineResponse(BaseModel):
+    prediction: Optional[ProficiencyPredictionResponse] = None
+    gapAnalysis: Optional[GapAnalysisResponse] = None
+    recommendations: Optional[List[LearningRecommendation]] = None
+
+
+@router.post("/pipeline", response_model=PipelineResponse)
+async def run_pipeline(request: PipelineRequest):
+    """
+    Predict proficiency, analyze gaps and recommend resources in one call.
+    
+    Stages run in-process on the previous stage's results: predicted
+    levels update ``skillProfile`` for gap analysis, and the analysis gaps
+    feed the recommender. ``stages`` selects a subset; a skipped stage's
+    input must then be given in the request (``skillProfile`` for gaps,
+    ``gaps`` for recommendations). Results of stages that did not run are
+    null.
+    """
+    try:
+        result = await scoring_executor.run(
+            len(request.assessmentResponses or ()),
+            tasks.run_pipeline,
+            user_id=request.userId,
+            stages=request.stages,
+            responses=(
+                [r.model_dump() for r in request.assessmentResponses]
+                if request.assessmentResponses is not None else None
+            ),
+            skill_profile=(
+                request.skillProfile.model_dump() if request.skillProfile else None
+            ),
+            target_role_id=request.targetRoleId,
+            gaps=(
+                [g.model_dump() for g in request.gaps]
+                if request.gaps is not None else None
+            ),
+            limit=request.limit,
+        )
+        
+        return trusted_response(result)
+    except ExecutorSaturated as e:
+        raise _saturated(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Pipeline failed: {str(e)}")
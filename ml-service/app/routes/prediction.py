@@ -2,15 +2,22 @@
 SkillSense AI - Prediction Routes
 """
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Optional, Union
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 from datetime import datetime
+import json
 
-from app.services.predictor import predictor_service
+from app.config import settings
+from app.services import tasks
+from app.services.executor import ExecutorSaturated, scoring_executor
 from app.services.gap_analyzer import gap_analyzer_service
+from app.utils.batching import MicroBatcher
+from app.utils.metrics import InstrumentedRoute
+from app.utils.responses import dumps, trusted_response
+from app.utils.streaming import DuplexStreamingResponse, LineTooLong, iter_ndjson_lines
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 
 # Request/Response Models
@@ -38,6 +45,23 @@ class ProficiencyPredictionResponse(BaseModel):
     confidence: float
 
 
+class ProficiencyBatchRequest(BaseModel):
+    # Items are validated one by one so a bad item (even a non-object)
+    # only fails itself
+    requests: List[Any]
+
+
+class ProficiencyBatchItem(BaseModel):
+    userId: Optional[str] = None
+    predictions: Optional[List[SkillPrediction]] = None
+    confidence: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ProficiencyBatchResponse(BaseModel):
+    results: List[ProficiencyBatchItem]
+
+
 class SkillAssessment(BaseModel):
     skillId: str
     skillName: str
@@ -78,6 +102,55 @@ class GapAnalysisResponse(BaseModel):
     improvementAreas: List[str]
 
 
+class RoleFitRequest(BaseModel):
+    skillProfile: SkillProfile
+    topK: Optional[int] = Field(default=None, ge=1)
+    maxGaps: int = Field(default=3, ge=0)
+
+
+class RoleFit(BaseModel):
+    roleId: str
+    title: str
+    readiness: float
+    topGaps: List[SkillGap]
+    strengthAreas: List[str]
+
+
+class RoleFitResponse(BaseModel):
+    roles: List[RoleFit]
+
+
+def _describe_validation_error(error: ValidationError) -> str:
+    """Summarize the first validation error of a batch or stream item"""
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    if not location:
+        return f"Invalid request: {first['msg']}"
+    return f"Invalid request: {location}: {first['msg']}"
+
+
+async def _score_coalesced(assessments: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Score a micro-batch of single prediction requests in one pass"""
+    return await scoring_executor.run(
+        sum(len(assessment) for assessment in assessments),
+        tasks.predict_proficiency_batch,
+        assessments,
+    )
+
+
+# Opt-in coalescing of concurrent /predict/proficiency calls
+prediction_batcher = MicroBatcher(
+    _score_coalesced,
+    window=settings.prediction_batch_window_ms / 1000,
+    max_items=settings.prediction_batch_max_items,
+)
+
+
+def _saturated(error: ExecutorSaturated) -> HTTPException:
+    """429 for requests rejected by a full scoring pool"""
+    return HTTPException(status_code=429, detail=str(error), headers={"Retry-After": "1"})
+
+
 @router.post("/predict/proficiency", response_model=ProficiencyPredictionResponse)
 async def predict_proficiency(request: ProficiencyPredictionRequest):
     """
@@ -88,19 +161,89 @@ async def predict_proficiency(request: ProficiencyPredictionRequest):
     - Question difficulty
     - Response time
     - Self-assessment calibration
+    
+    With micro-batching enabled, concurrent requests are scored together
+    (adding at most prediction_batch_window_ms of latency).
     """
     try:
-        predictions = predictor_service.predict_proficiency(
-            user_id=request.userId,
-            responses=[r.model_dump() for r in request.assessmentResponses]
-        )
+        responses = [r.model_dump() for r in request.assessmentResponses]
         
-        return ProficiencyPredictionResponse(
-            predictions=[SkillPrediction(**p) for p in predictions["predictions"]],
-            confidence=predictions["confidence"]
-        )
+        if prediction_batcher.enabled:
+            predictions = await prediction_batcher.submit(responses)
+        else:
+            predictions = await scoring_executor.run(
+                len(responses), tasks.predict_proficiency, request.userId, responses
+            )
+    except ExecutorSaturated as e:
+        raise _saturated(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    
+    # A failing request in a micro-batch only fails itself
+    if "error" in predictions:
+        raise HTTPException(status_code=500, detail=predictions["error"])
+    
+    return trusted_response(predictions)
+
+
+@router.post("/predict/proficiency:batch", response_model=ProficiencyBatchResponse)
+async def predict_proficiency_batch(request: ProficiencyBatchRequest):
+    """
+    Predict skill proficiency for many users in one call.
+    
+    Every item is a ProficiencyPredictionRequest payload. Valid items are
+    scored together in a single vectorized pass; results are returned in
+    input order and invalid items carry their own error instead of failing
+    the whole batch.
+    """
+    if len(request.requests) > settings.batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: at most {settings.batch_max_items} items allowed",
+        )
+    
+    results: List[Dict[str, Any]] = []
+    valid: List[ProficiencyPredictionRequest] = []
+    valid_positions: List[int] = []
+    
+    for item in request.requests:
+        try:
+            parsed = ProficiencyPredictionRequest.model_validate(item)
+        except ValidationError as e:
+            user_id = item.get("userId") if isinstance(item, dict) else None
+            results.append({
+                "userId": user_id if isinstance(user_id, str) else None,
+                "predictions": None,
+                "confidence": None,
+                "error": _describe_validation_error(e),
+            })
+            continue
+        valid_positions.append(len(results))
+        valid.append(parsed)
+        results.append({
+            "userId": parsed.userId,
+            "predictions": None,
+            "confidence": None,
+            "error": None,
+        })
+    
+    assessments = [
+        [r.model_dump() for r in item.assessmentResponses] for item in valid
+    ]
+    
+    try:
+        predictions = await scoring_executor.run(
+            sum(len(assessment) for assessment in assessments),
+            tasks.predict_proficiency_batch,
+            assessments,
+        )
+    except ExecutorSaturated as e:
+        raise _saturated(e)
+    
+    for position, prediction in zip(valid_positions, predictions):
+        results[position].update(prediction)
+    
+    return trusted_response({"results": results})
 
 
 @router.post("/analyze/gaps", response_model=GapAnalysisResponse)
@@ -120,6 +263,72 @@ async def analyze_gaps(request: GapAnalysisRequest):
             target_role_id=request.targetRoleId
         )
         
-        return GapAnalysisResponse(**analysis)
+        return trusted_response(analysis)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Gap analysis failed: {str(e)}")
+
+
+@router.post("/analyze/roles", response_model=RoleFitResponse)
+async def analyze_roles(request: RoleFitRequest):
+    """
+    Rank every role by how well a skill profile fits it.
+    
+    Returns readiness and the top-priority gaps for each role (or only the
+    best ``topK`` roles), computed in one pass over all role requirements
+    instead of one /analyze/gaps call per role.
+    """
+    try:
+        roles = gap_analyzer_service.rank_roles(
+            skill_profile=request.skillProfile.model_dump(),
+            top_k=request.topK,
+            max_gaps=request.maxGaps
+        )
+        
+        return trusted_response({"roles": roles})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Role ranking failed: {str(e)}")
+
+
+@router.post(
+    "/analyze/gaps:stream",
+    response_class=DuplexStreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def analyze_gaps_stream(request: Request):
+    """
+    Stream gap analyses for a cohort.
+    
+    Accepts an NDJSON body with one GapAnalysisRequest per line and streams
+    back one line per non-empty input line, in order: a GapAnalysisResponse,
+    or ``{"line": n, "error": "..."}`` if that line could not be analyzed
+    (n counts every line of the body, blank ones included).
+    Lines are processed as they arrive, so results start flowing before the
+    upload finishes and memory does not grow with the cohort size.
+    """
+    async def generate() -> AsyncIterator[bytes]:
+        lines = iter_ndjson_lines(request.stream(), settings.ndjson_max_line_bytes)
+        
+        try:
+            async for line_number, line in lines:
+                try:
+                    item = GapAnalysisRequest.model_validate_json(line)
+                    analysis = gap_analyzer_service.analyze_gaps(
+                        user_id=item.userId,
+                        skill_profile=item.skillProfile.model_dump(),
+                        target_role_id=item.targetRoleId
+                    )
+                    if settings.fast_responses:
+                        yield dumps(analysis) + b"\n"
+                    else:
+                        yield GapAnalysisResponse(**analysis).model_dump_json().encode() + b"\n"
+                except ValidationError as e:
+                    error = _describe_validation_error(e)
+                    yield json.dumps({"line": line_number, "error": error}).encode() + b"\n"
+                except Exception as e:
+                    error = f"Gap analysis failed: {str(e)}"
+                    yield json.dumps({"line": line_number, "error": error}).encode() + b"\n"
+        except LineTooLong as e:
+            # Oversized line: report it and stop reading the body
+            yield json.dumps({"line": e.line, "error": str(e)}).encode() + b"\n"
+    
+    return DuplexStreamingResponse(generate())
@@ -3,12 +3,15 @@ SkillSense AI - Recommendation Routes
 """
 
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
+from app.config import settings
 from app.services.recommender import recommender_service
+from app.utils.metrics import InstrumentedRoute
+from app.utils.responses import trusted_response
 
-router = APIRouter()
+router = APIRouter(route_class=InstrumentedRoute)
 
 
 class GapInfo(BaseModel):
@@ -21,6 +24,9 @@ class GapInfo(BaseModel):
 class RecommendationRequest(BaseModel):
     userId: str
     gaps: List[GapInfo]
+    limit: Optional[int] = Field(
+        default=None, ge=1, le=settings.recommendation_max_limit
+    )
 
 
 class LearningRecommendation(BaseModel):
@@ -52,12 +58,11 @@ async def get_recommendations(request: RecommendationRequest):
     try:
         recommendations = recommender_service.generate_recommendations(
             user_id=request.userId,
-            gaps=[g.model_dump() for g in request.gaps]
+            gaps=[g.model_dump() for g in request.gaps],
+            limit=request.limit
         )
         
-        return RecommendationResponse(
-            recommendations=[LearningRecommendation(**r) for r in recommendations]
-        )
+        return trusted_response({"recommendations": recommendations})
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -1,9 +1,24 @@
 """
 SkillSense AI - Services Package
+
+Services are exported lazily: importing one service module (e.g.
+``app.services.tasks`` in a process-pool worker, or running
+``python -m app.services.catalog``) does not import the others.
 """
 
-from app.services.predictor import predictor_service
-from app.services.gap_analyzer import gap_analyzer_service
-from app.services.recommender import recommender_service
+from importlib import import_module
+
+_EXPORTS = {
+    "predictor_service": "app.services.predictor",
+    "gap_analyzer_service": "app.services.gap_analyzer",
+    "recommender_service": "app.services.recommender",
+}
+
+__all__ = list(_EXPORTS)
+
 
-__all__ = ["predictor_service", "gap_analyzer_service", "recommender_service"]
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module), name)
@@ -0,0 +1,385 @@
+"""
+SkillSense AI - Learning Resource Catalog
+
+Catalog backends for the recommender: the built-in dictionary, and a
+columnar on-disk format opened with mmap so that every worker on a host
+shares the same pages.
+
+On-disk layout (one directory):
+    meta.json          version, skill keys and small vocabularies
+                       (resource types, levels, providers)
+    skill_offsets.npy  int64, resource row range of each skill
+    type_codes.npy     uint8/uint16, index into the type vocabulary
+    level_codes.npy    uint8/uint16, index into the level vocabulary
+    provider_codes.npy uint32, index into the provider vocabulary
+    durations.npy      int32, estimated hours
+    title_offsets.npy  int64, byte ranges of titles in strings.bin
+    url_offsets.npy    int64, byte ranges of URLs in strings.bin
+    strings.bin        UTF-8 text of all titles and URLs
+
+Rows are grouped by skill in catalog order, so a skill's resources are a
+contiguous slice. Only the skill keys and vocabularies are read eagerly;
+resources are decoded on demand and kept in a bounded cache.
+
+Build a catalog directory with:
+    python -m app.services.catalog build [source.json] <directory>
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+
+META_FILE = "meta.json"
+
+
+class Resource:
+    """
+    One learning resource.
+    
+    Slotted rather than a dict, since a worker holds every resource of
+    every scored skill. The vocabulary strings (type, provider, level)
+    are interned, so all resources share one copy of each. Converted to a
+    dict only where one is returned to callers.
+    """
+    
+    __slots__ = ("title", "type", "provider", "url", "duration", "level")
+    
+    def __init__(
+        self,
+        title: str,
+        type: str,
+        provider: str,
+        url: str,
+        duration: int,
+        level: Optional[str] = None
+    ):
+        self.title = title
+        self.type = sys.intern(type)
+        self.provider = sys.intern(provider)
+        self.url = url
+        self.duration = duration
+        self.level = sys.intern(level) if level is not None else None
+    
+    @classmethod
+    def from_dict(cls, resource: Dict[str, Any]) -> "Resource":
+        return cls(
+            resource["title"], resource["type"], resource["provider"],
+            resource["url"], resource["duration"], resource.get("level"),
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Resource in the catalog source format (no level key if unset)"""
+        resource = {
+            "title": self.title,
+            "type": self.type,
+            "provider": self.provider,
+            "url": self.url,
+            "duration": self.duration,
+        }
+        if self.level is not None:
+            resource["level"] = self.level
+        return resource
+    
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Resource):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __repr__(self) -> str:
+        return f"Resource({self.title!r}, {self.type!r}, {self.provider!r})"
+
+
+class BuiltinCatalog:
+    """Catalog backed by an in-memory dictionary of skill key -> resources"""
+    
+    def __init__(self, resources: Dict[str, List[Dict[str, Any]]], version: str = "builtin"):
+        self._resources: Dict[str, Tuple[Resource, ...]] = {
+            key: tuple(Resource.from_dict(resource) for resource in entries)
+            for key, entries in resources.items()
+        }
+        self.keys: List[str] = list(resources)
+        self.version = version
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def resources(self, key: str) -> Tuple[Resource, ...]:
+        """Get the resources of a skill key"""
+        return self._resources[key]
+
+
+class MappedCatalog:
+    """Catalog backed by a memory-mapped columnar directory"""
+    
+    def __init__(self, path: str, cache_size: int = 1024):
+        with open(os.path.join(path, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+        
+        self.path = path
+        self.version: str = meta["version"]
+        self.keys: List[str] = meta["skills"]
+        # Interned, like the strings of built-in resources
+        self._types: List[str] = [sys.intern(t) for t in meta["types"]]
+        self._levels: List[Optional[str]] = [
+            sys.intern(level) if level is not None else None for level in meta["levels"]
+        ]
+        self._providers: List[str] = [sys.intern(p) for p in meta["providers"]]
+        self._rows = {key: i for i, key in enumerate(self.keys)}
+        
+        def column(name: str) -> np.ndarray:
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        
+        self._skill_offsets = column("skill_offsets")
+        self._type_codes = column("type_codes")
+        self._level_codes = column("level_codes")
+        self._provider_codes = column("provider_codes")
+        self._durations = column("durations")
+        self._title_offsets = column("title_offsets")
+        self._url_offsets = column("url_offsets")
+        strings_path = os.path.join(path, "strings.bin")
+        if os.path.getsize(strings_path):
+            self._strings = np.memmap(strings_path, dtype=np.uint8, mode="r")
+        else:
+            # mmap cannot map an empty file
+            self._strings = np.zeros(0, dtype=np.uint8)
+        
+        self._validate(meta)
+        
+        self.resources = lru_cache(maxsize=cache_size)(self._decode_resources)
+    
+    def _validate(self, meta: Dict[str, Any]):
+        """
+        Check that the columns belong to the metadata.
+        
+        Guards against opening a directory while a writer is half-way
+        through replacing its files.
+        """
+        rows = meta.get("rows", len(self._type_codes))
+        consistent = (
+            len(self._skill_offsets) == len(self.keys) + 1
+            and int(self._skill_offsets[-1]) == rows
+            and all(
+                len(column) == rows
+                for column in (
+                    self._type_codes, self._level_codes,
+                    self._provider_codes, self._durations,
+                )
+            )
+            and len(self._title_offsets) == len(self._url_offsets) == rows + 1
+            and len(self._strings) == meta.get("string_bytes", len(self._strings))
+        )
+        if not consistent:
+            raise ValueError(f"Catalog at {self.path} is incomplete or inconsistent")
+        if "default" not in self._rows:
+            raise ValueError(f"Catalog at {self.path} must define a 'default' skill")
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def _text(self, offsets: np.ndarray, row: int) -> str:
+        """Decode one string from the shared string blob"""
+        return self._strings[offsets[row]:offsets[row + 1]].tobytes().decode("utf-8")
+    
+    def _decode_resources(self, key: str) -> Tuple[Resource, ...]:
+        """Materialize the resources of a skill key"""
+        skill = self._rows[key]
+        start, end = int(self._skill_offsets[skill]), int(self._skill_offsets[skill + 1])
+        
+        types = self._type_codes[start:end].tolist()
+        levels = self._level_codes[start:end].tolist()
+        providers = self._provider_codes[start:end].tolist()
+        durations = self._durations[start:end].tolist()
+        
+        return tuple(
+            Resource(
+                self._text(self._title_offsets, row),
+                self._types[types[i]],
+                self._providers[providers[i]],
+                self._text(self._url_offsets, row),
+                durations[i],
+                self._levels[levels[i]],
+            )
+            for i, row in enumerate(range(start, end))
+        )
+
+
+@contextmanager
+def _replace_file(directory: str, name: str) -> Iterator[BinaryIO]:
+    """Write a file under a temporary name and atomically rename it into place"""
+    target = os.path.join(directory, name)
+    temporary = f"{target}.tmp-{os.getpid()}"
+    
+    try:
+        with open(temporary, "wb") as f:
+            yield f
+        os.replace(temporary, target)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def write_catalog(
+    resources: Dict[str, List[Dict[str, Any]]],
+    path: str,
+    version: Optional[str] = None
+) -> str:
+    """
+    Write a catalog to a columnar directory readable by MappedCatalog.
+    
+    Args:
+        resources: Skill key -> list of resource dicts
+        path: Destination directory (created if missing)
+        version: Catalog version; defaults to a content hash
+    
+    Returns:
+        The version written
+    
+    Raises:
+        ValueError: If there is no "default" skill (the fallback for
+            skills the catalog does not know)
+    """
+    if "default" not in resources:
+        raise ValueError("Catalog must define a 'default' skill")
+    
+    os.makedirs(path, exist_ok=True)
+    
+    types: Dict[str, int] = {}
+    levels: Dict[Optional[str], int] = {}
+    providers: Dict[str, int] = {}
+    
+    skill_offsets = [0]
+    type_codes, level_codes, provider_codes, durations = [], [], [], []
+    title_offsets, url_offsets = [0], [0]
+    titles, urls = [], []
+    
+    for entries in resources.values():
+        for resource in entries:
+            type_codes.append(types.setdefault(resource["type"], len(types)))
+            level_codes.append(levels.setdefault(resource.get("level"), len(levels)))
+            provider_codes.append(providers.setdefault(resource["provider"], len(providers)))
+            durations.append(resource["duration"])
+            titles.append(resource["title"].encode("utf-8"))
+            urls.append(resource["url"].encode("utf-8"))
+        skill_offsets.append(len(type_codes))
+    
+    title_blob = b"".join(titles)
+    for title in titles:
+        title_offsets.append(title_offsets[-1] + len(title))
+    for url in urls:
+        url_offsets.append(url_offsets[-1] + len(url))
+    url_offsets = [len(title_blob) + offset for offset in url_offsets]
+    strings = title_blob + b"".join(urls)
+    
+    def code_dtype(vocabulary: Dict) -> type:
+        return np.uint8 if len(vocabulary) <= 256 else np.uint16
+    
+    columns = {
+        "skill_offsets": np.array(skill_offsets, dtype=np.int64),
+        "type_codes": np.array(type_codes, dtype=code_dtype(types)),
+        "level_codes": np.array(level_codes, dtype=code_dtype(levels)),
+        "provider_codes": np.array(provider_codes, dtype=np.uint32),
+        "durations": np.array(durations, dtype=np.int32),
+        "title_offsets": np.array(title_offsets, dtype=np.int64),
+        "url_offsets": np.array(url_offsets, dtype=np.int64),
+    }
+    
+    if version is None:
+        digest = hashlib.sha256(strings)
+        for array in columns.values():
+            digest.update(array.tobytes())
+        digest.update(json.dumps(list(resources)).encode("utf-8"))
+        version = digest.hexdigest()[:12]
+    
+    # Every file is written aside and renamed into place: workers that still
+    # map the previous catalog keep their (unlinked) files intact
+    for name, array in columns.items():
+        with _replace_file(path, f"{name}.npy") as f:
+            np.save(f, array)
+    with _replace_file(path, "strings.bin") as f:
+        f.write(strings)
+    
+    # Written last so a reader never sees meta for incomplete columns
+    meta = {
+        "version": version,
+        "skills": list(resources),
+        "rows": len(type_codes),
+        "string_bytes": len(strings),
+        "types": list(types),
+        "levels": list(levels),
+        "providers": list(providers),
+    }
+    with _replace_file(path, META_FILE) as f:
+        f.write(json.dumps(meta).encode("utf-8"))
+    
+    return version
+
+
+def default_catalog_path() -> str:
+    """Catalog directory from settings (catalog_path, else model_path/catalog)"""
+    return settings.catalog_path or os.path.join(settings.model_path, "catalog")
+
+
+def load_catalog(
+    fallback: Dict[str, List[Dict[str, Any]]],
+    path: Optional[str] = None
+):
+    """
+    Open the on-disk catalog if one exists, else wrap the built-in dict.
+    
+    Args:
+        fallback: Built-in catalog used when no catalog directory is present
+        path: Catalog directory (defaults to default_catalog_path())
+    
+    Returns:
+        A MappedCatalog or BuiltinCatalog
+    
+    Raises:
+        ValueError: If the catalog directory is inconsistent or has no
+            "default" skill
+    """
+    path = path or default_catalog_path()
+    
+    if os.path.isfile(os.path.join(path, META_FILE)):
+        return MappedCatalog(path, cache_size=settings.catalog_cache_size)
+    
+    return BuiltinCatalog(fallback)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build a learning resource catalog")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Write a columnar catalog directory")
+    build.add_argument(
+        "source", nargs="?",
+        help="JSON file of skill key -> resources (built-in catalog if omitted)",
+    )
+    build.add_argument("destination", help="Output directory")
+    build.add_argument("--version", help="Catalog version (content hash if omitted)")
+    args = parser.parse_args(argv)
+    
+    if args.source:
+        with open(args.source, encoding="utf-8") as f:
+            resources = json.load(f)
+    else:
+        from app.services.recommender import LEARNING_RESOURCES
+        resources = LEARNING_RESOURCES
+    
+    version = write_catalog(resources, args.destination, version=args.version)
+    count = sum(len(entries) for entries in resources.values())
+    print(f"Wrote {count} resources for {len(resources)} skills "
+          f"(version {version}) to {args.destination}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+SkillSense AI - Data Store
+
+Versioned role and catalog data behind the gap analyzer and recommender.
+
+Each service holds an immutable snapshot (RoleData / CatalogData) with all
+of its precomputed structures. A reload builds fresh snapshots off the hot
+path and swaps them in with a single attribute assignment; requests that
+already started keep the snapshot they read, so no locks are taken while
+serving.
+"""
+
+import os
+import threading
+from typing import Dict, Optional
+
+from app.services.catalog import META_FILE, default_catalog_path, load_catalog
+from app.services.gap_analyzer import (
+    default_role_aliases_path, default_roles_path, gap_analyzer_service, load_roles,
+)
+from app.services.recommender import LEARNING_RESOURCES, recommender_service
+
+
+class DataStore:
+    """Reloads role and catalog snapshots on demand or on file changes"""
+    
+    def __init__(self):
+        # Serializes reloads only; readers never take it
+        self._reload_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._mtimes = self._source_mtimes()
+    
+    def versions(self) -> Dict[str, str]:
+        """Versions of the active role and catalog snapshots"""
+        return {
+            "roles": gap_analyzer_service.data.version,
+            "catalog": recommender_service.data.version,
+        }
+    
+    def reload(self) -> Dict[str, str]:
+        """
+        Load role and catalog data from their sources and swap them in.
+        
+        Both snapshots are fully built before either is published; if
+        loading fails, the active snapshots stay in place.
+        
+        Returns:
+            Versions of the active snapshots after the reload
+        
+        Raises:
+            ValueError: If the role or catalog data is invalid
+        """
+        with self._reload_lock:
+            mtimes = self._source_mtimes()
+            
+            role_data = gap_analyzer_service.build_data(*load_roles())
+            catalog_data = recommender_service.build_data(load_catalog(LEARNING_RESOURCES))
+            
+            gap_analyzer_service.publish(role_data)
+            recommender_service.data = catalog_data
+            self._mtimes = mtimes
+        
+        return self.versions()
+    
+    def _source_mtimes(self) -> Dict[str, float]:
+        """Modification times of the role file, role aliases and catalog metadata"""
+        paths = {
+            "roles": default_roles_path(),
+            "aliases": default_role_aliases_path(),
+            "catalog": os.path.join(default_catalog_path(), META_FILE),
+        }
+        return {
+            name: os.path.getmtime(path) if os.path.exists(path) else 0.0
+            for name, path in paths.items()
+        }
+    
+    def check_for_changes(self) -> bool:
+        """
+        Reload if a data file changed since the last load.
+        
+        Returns:
+            True if a reload happened
+        """
+        mtimes = self._source_mtimes()
+        if mtimes == self._mtimes:
+            return False
+        
+        if all(mtimes[name] == self._mtimes[name] for name in mtimes if name != "aliases"):
+            # Only aliases changed (registered by another worker): no rebuild
+            with self._reload_lock:
+                gap_analyzer_service.publish(gap_analyzer_service.data)
+                self._mtimes = mtimes
+            return True
+        
+        self.reload()
+        return True
+    
+    def start_watcher(self, interval: float):
+        """Poll data files for changes in a background thread"""
+        if self._watcher is not None:
+            return
+        
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, args=(interval,), name="data-watcher", daemon=True
+        )
+        self._watcher.start()
+    
+    def stop_watcher(self):
+        """Stop the background watcher thread"""
+        if self._watcher is None:
+            return
+        
+        self._stop.set()
+        self._watcher.join()
+        self._watcher = None
+    
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                if self.check_for_changes():
+                    print(f"  Data reloaded: {self.versions()}")
+            except Exception as e:
+                # Keep serving the previous snapshot; retry on the next tick
+                print(f"  Data reload failed: {e}")
+
+
+# Singleton instance
+data_store = DataStore()
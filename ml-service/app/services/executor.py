@@ -0,0 +1,187 @@
+"""
+SkillSense AI - Scoring Executor
+
+Runs CPU-bound scoring off the event loop so that one large request does
+not stall every other request in the worker.
+
+Modes (settings.execution_mode):
+- inline: call the function on the event loop (no overhead)
+- thread: run it in a thread pool
+- process: run it in a process pool (sidesteps the GIL)
+
+Only work at or above settings.execution_threshold is dispatched; small
+requests stay inline. At most execution_max_pending dispatched calls may
+be running or queued per worker; beyond that, calls are rejected with
+ExecutorSaturated so the route can answer 429 instead of queueing without
+bound.
+
+Process-pool functions and arguments must be picklable, so pass
+module-level functions (see app.services.tasks). Workers are spawned
+fresh and load role and catalog data and role aliases themselves; the
+pool is replaced when the parent's data snapshots or role aliases change.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+
+
+EXECUTION_MODES = ("inline", "thread", "process")
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the pool already has its maximum of pending calls"""
+
+
+def _initialize_worker():
+    """Process-pool initializer: load data (and role aliases) from their files"""
+    from app.services.gap_analyzer import gap_analyzer_service
+    from app.services.recommender import recommender_service
+    
+    gap_analyzer_service.initialize()
+    recommender_service.initialize()
+
+
+def _data_token() -> Tuple[int, int]:
+    """
+    Revisions of the active data snapshots (bumped on reload or new aliases).
+    
+    Monotonic counters rather than snapshot ids, which CPython may reuse
+    once an old snapshot is freed.
+    """
+    from app.services.gap_analyzer import gap_analyzer_service
+    from app.services.recommender import recommender_service
+    
+    gap_analyzer_service.initialize()
+    recommender_service.initialize()
+    return gap_analyzer_service.revision, recommender_service.revision
+
+
+class ScoringExecutor:
+    """Dispatches large scoring calls to a bounded thread or process pool"""
+    
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        workers: Optional[int] = None,
+        threshold: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.mode = mode or settings.execution_mode
+        if self.mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode: {self.mode}")
+        
+        self.workers = workers or settings.execution_workers
+        self.threshold = settings.execution_threshold if threshold is None else threshold
+        self.max_pending = settings.execution_max_pending if max_pending is None else max_pending
+        
+        self._pool: Optional[Executor] = None
+        self._pool_token: Optional[Tuple[int, int]] = None
+        
+        # Only touched from the event loop thread, so plain ints suffice
+        self.pending = 0
+        self.dispatched = 0
+        self.inline = 0
+        self.rejected = 0
+    
+    def _get_pool(self) -> Executor:
+        if self.mode == "thread":
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="scoring"
+                )
+            return self._pool
+        
+        token = _data_token()
+        if self._pool is None or token != self._pool_token:
+            if self._pool is not None:
+                # Calls already submitted still finish on the old workers
+                self._pool.shutdown(wait=False)
+            
+            # Only process mode needs these; keep them out of startup otherwise
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_initialize_worker,
+            )
+            self._pool_token = token
+        return self._pool
+    
+    def start(self):
+        """Create the pool ahead of the first request (workers start lazily)"""
+        if self.mode != "inline":
+            pool = self._get_pool()
+            # Spawned workers import the app and load data on first use
+            for _ in range(self.workers):
+                pool.submit(int)
+    
+    async def warm_up(self):
+        """Wait until every pool worker is running (and, for processes, has loaded its data)"""
+        if self.mode == "inline":
+            return
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        await asyncio.gather(*(loop.run_in_executor(pool, int) for _ in range(self.workers)))
+    
+    async def run(self, size: int, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run ``func(*args, **kwargs)``, off the event loop if the work is large.
+        
+        Args:
+            size: Work size in the route's unit (e.g. assessment responses)
+            func: Function to call (module-level for process mode)
+        
+        Returns:
+            The function's result
+        
+        Raises:
+            ExecutorSaturated: If max_pending calls are already in flight
+        """
+        if self.mode == "inline" or size < self.threshold:
+            self.inline += 1
+            return func(*args, **kwargs)
+        
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ExecutorSaturated(
+                f"Scoring pool is saturated ({self.pending} pending requests)"
+            )
+        
+        self.pending += 1
+        self.dispatched += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_pool(), partial(func, *args, **kwargs)
+            )
+        finally:
+            self.pending -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Mode, limits and dispatch counters"""
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "threshold": self.threshold,
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "dispatched": self.dispatched,
+            "inline": self.inline,
+            "rejected": self.rejected,
+        }
+    
+    def shutdown(self):
+        """Stop the pool, waiting for running calls"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+# Singleton instance
+scoring_executor = ScoringExecutor()
@@ -5,16 +5,33 @@ Analyzes skill gaps between user's current profile and target role requirements.
 Uses intelligent prioritization and time estimation.
 """
 
-from typing import List, Dict, Any
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple
+import hashlib
+import itertools
+import json
+import os
+import re
+import sys
+import threading
 import numpy as np
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not on Windows
+    fcntl = None
+
 from app.config import settings
+from app.utils.cache import create_cache, fingerprint
+from app.utils.metrics import FALLBACKS, timed
 
 
 # Role requirements dictionary keyed by lowercase role title
 # The backend sends a MongoDB ObjectId as target_role_id, but the skill profile
-# and role data come through as context.  We match by normalized title when an
-# ObjectId lookup fails.
+# and role data come through as context.  ObjectIds resolve through aliases
+# registered by the backend (register_role_aliases); other ids are matched by
+# normalized title.
 ROLE_REQUIREMENTS = {
     "frontend_developer": {
         "title": "Frontend Developer",
@@ -88,17 +105,511 @@ ROLE_REQUIREMENTS = {
     }
 }
 
-# Reverse lookup: normalized title -> key
-_TITLE_TO_KEY = {
-    v["title"].lower().replace(" ", "_"): k
-    for k, v in ROLE_REQUIREMENTS.items()
-    if k != "default"
+# Priority labels in sort order (most urgent first)
+PRIORITY_LEVELS = ["critical", "high", "medium", "low"]
+
+# Importance labels; anything else is scored like nice_to_have
+IMPORTANCE_LEVELS = ["must_have", "good_to_have", "nice_to_have"]
+
+# Readiness weight per importance (unknown importance counts as 1.0)
+IMPORTANCE_WEIGHTS = {
+    "must_have": 1.5,
+    "good_to_have": 1.0,
+    "nice_to_have": 0.5,
 }
 
 
+# Fields every role requirement must define
+REQUIREMENT_FIELDS = frozenset({"skillId", "skillName", "requiredLevel", "importance"})
+
+
+class RoleRequirements:
+    """
+    Requirements of one role as parallel tuples, in requirement order.
+    
+    Takes a fraction of the memory of one dict per requirement. Skill ids,
+    names and importances are interned, so roles that share a skill share
+    its strings.
+    """
+    
+    __slots__ = ("title", "skill_ids", "skill_names", "required_levels", "importances")
+    
+    def __init__(self, role: Dict[str, Any]):
+        reqs = role["skills"]
+        self.title: str = role["title"]
+        self.skill_ids: Tuple[str, ...] = tuple(sys.intern(req["skillId"]) for req in reqs)
+        self.skill_names: Tuple[str, ...] = tuple(sys.intern(req["skillName"]) for req in reqs)
+        self.required_levels: Tuple[int, ...] = tuple(req["requiredLevel"] for req in reqs)
+        self.importances: Tuple[str, ...] = tuple(sys.intern(req["importance"]) for req in reqs)
+    
+    def __len__(self) -> int:
+        return len(self.skill_ids)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Role in the role table format"""
+        return {
+            "title": self.title,
+            "skills": [
+                {
+                    "skillId": skill_id,
+                    "skillName": name,
+                    "requiredLevel": level,
+                    "importance": importance,
+                }
+                for skill_id, name, level, importance in zip(
+                    self.skill_ids, self.skill_names, self.required_levels, self.importances
+                )
+            ],
+        }
+
+
+class CompiledRoles:
+    """
+    Dense array form of a role requirements table.
+    
+    Every skill mentioned by any role gets a column in a shared skill
+    vocabulary. Each role keeps, in requirement order, the vocabulary index,
+    required level, importance code and readiness weight of its skills.
+    The same data is also stacked into zero-padded role x requirement
+    matrices for scoring one profile against every role at once; per-role
+    columns, levels and weights are views of those matrices.
+    """
+    
+    def __init__(self, roles: Dict[str, Any]):
+        self.roles: Dict[str, RoleRequirements] = {
+            key: role if isinstance(role, RoleRequirements) else RoleRequirements(role)
+            for key, role in roles.items()
+        }
+        self.keys: List[str] = list(roles)
+        self.role_index = {key: i for i, key in enumerate(self.keys)}
+        
+        # Reverse lookup: normalized title -> key
+        self.title_to_key = {
+            v.title.lower().replace(" ", "_"): k
+            for k, v in self.roles.items()
+            if k != "default"
+        }
+        
+        self.skill_index: Dict[str, int] = {}
+        for role in self.roles.values():
+            for skill_id in role.skill_ids:
+                self.skill_index.setdefault(skill_id, len(self.skill_index))
+        
+        self.skill_columns: List[np.ndarray] = []
+        self.required_levels: List[np.ndarray] = []
+        self.importance_codes: List[np.ndarray] = []
+        self.weights: List[np.ndarray] = []
+        self.total_weights: List[float] = []
+        self.skill_names: List[Tuple[str, ...]] = []
+        self.importances: List[Tuple[str, ...]] = []
+        
+        n_roles = len(self.keys)
+        width = max((len(role) for role in self.roles.values()), default=0)
+        self.column_matrix = np.zeros((n_roles, width), dtype=np.intp)
+        self.required_matrix = np.zeros((n_roles, width), dtype=np.int64)
+        self.weight_matrix = np.zeros((n_roles, width))
+        importance_matrix = np.zeros((n_roles, width), dtype=np.intp)
+        
+        for r, key in enumerate(self.keys):
+            role = self.roles[key]
+            n = len(role)
+            self.column_matrix[r, :n] = [self.skill_index[s] for s in role.skill_ids]
+            self.required_matrix[r, :n] = role.required_levels
+            self.weight_matrix[r, :n] = [
+                IMPORTANCE_WEIGHTS.get(importance, 1.0) for importance in role.importances
+            ]
+            importance_matrix[r, :n] = [
+                IMPORTANCE_LEVELS.index(importance) if importance in IMPORTANCE_LEVELS else 2
+                for importance in role.importances
+            ]
+            
+            weights = self.weight_matrix[r, :n]
+            self.skill_columns.append(self.column_matrix[r, :n])
+            self.required_levels.append(self.required_matrix[r, :n])
+            self.importance_codes.append(importance_matrix[r, :n])
+            self.weights.append(weights)
+            # Sequential sum, matching the original per-request loop
+            self.total_weights.append(float(np.cumsum(weights)[-1]) if n else 0.0)
+            self.skill_names.append(role.skill_names)
+            self.importances.append(role.importances)
+        
+        self.total_weight_vector = np.array(self.total_weights)
+        self.requirement_counts = np.array([len(self.roles[k]) for k in self.keys])
+        self.max_required_level = int(self.required_matrix.max(initial=0))
+    
+    def skill_levels(self, skill_profile: Dict[str, Any]) -> np.ndarray:
+        """
+        Map a skill profile onto the skill vocabulary.
+        
+        Skills no role requires are ignored; unassessed skills are 0. When a
+        skill appears twice, the last entry wins.
+        """
+        levels = np.zeros(len(self.skill_index), dtype=np.int64)
+        
+        for skill in skill_profile.get("skills", []):
+            column = self.skill_index.get(skill["skillId"])
+            if column is not None:
+                levels[column] = skill.get("proficiencyLevel", 0)
+        
+        return levels
+    
+    def readiness_matrix(self, levels: np.ndarray) -> np.ndarray:
+        """
+        Readiness percentage of a vocabulary-mapped profile for every role.
+        
+        A met requirement (including one with requiredLevel 0) scores 1, an
+        unmet one scores current / required; readiness is the
+        importance-weighted mean of those scores. Rows are accumulated in
+        requirement order (padding has weight 0, so it adds exact zeros),
+        so each value equals the readiness analyze_gaps reports for that
+        role.
+        """
+        required = self.required_matrix
+        current = levels[self.column_matrix]
+        met = np.minimum(np.maximum(current, 0), required)
+        scores = np.ones(required.shape)
+        np.divide(met, required, out=scores, where=(current < required) & (required > 0))
+        
+        if required.shape[1]:
+            weighted = np.cumsum(scores * self.weight_matrix, axis=1)[:, -1]
+        else:
+            weighted = np.zeros(len(self.keys))
+        totals = self.total_weight_vector
+        
+        readiness = np.divide(
+            weighted, totals, out=np.zeros(len(self.keys)), where=totals > 0
+        ) * 100
+        readiness[self.requirement_counts == 0] = 100.0
+        
+        return readiness
+
+
+# MongoDB ObjectId (24 hex digits); these only resolve through registered aliases
+OBJECT_ID_PATTERN = re.compile(r"[0-9a-fA-F]{24}")
+
+
+class RoleData:
+    """
+    Snapshot of role requirements and everything precomputed from them.
+    
+    Snapshots are never modified after construction (role id resolution is
+    only memoized). A reload or alias registration builds a new one and
+    swaps it in; requests read ``GapAnalyzerService.data`` once and keep
+    using that snapshot, so they never need a lock.
+    """
+    
+    def __init__(
+        self,
+        version: str,
+        compiled: CompiledRoles,
+        priority_table: np.ndarray,
+        time_table: np.ndarray,
+        aliases: Dict[str, str],
+        lookup_role_key: Callable[[str, CompiledRoles, Dict[str, str]], str]
+    ):
+        self.version = version
+        self.compiled = compiled
+        self.priority_table = priority_table
+        self.time_table = time_table
+        self.aliases = aliases
+        self._lookup_role_key = lookup_role_key
+        # Bounded, and caches misses too: unknown ObjectIds repeat per user
+        self.resolve_role_key = lru_cache(maxsize=settings.role_cache_size)(
+            lambda role_id: lookup_role_key(role_id, compiled, aliases)
+        )
+    
+    def with_aliases(self, aliases: Dict[str, str]) -> "RoleData":
+        """Copy of this snapshot with a different alias table"""
+        return RoleData(
+            self.version, self.compiled, self.priority_table, self.time_table,
+            aliases, self._lookup_role_key,
+        )
+
+
+def default_roles_path() -> str:
+    """Role requirements file from settings (roles_path, else model_path/roles.json)"""
+    return settings.roles_path or os.path.join(settings.model_path, "roles.json")
+
+
+def default_role_aliases_path() -> str:
+    """Role alias file from settings (role_aliases_path, else model_path/role_aliases.json)"""
+    return settings.role_aliases_path or os.path.join(settings.model_path, "role_aliases.json")
+
+
+def load_role_aliases(path: Optional[str] = None) -> Dict[str, str]:
+    """
+    Load registered role aliases (none if the file does not exist).
+    
+    Args:
+        path: Alias file (defaults to default_role_aliases_path())
+    
+    Returns:
+        Role id -> role key
+    
+    Raises:
+        ValueError: If the file is not a JSON object of strings
+    """
+    path = path or default_role_aliases_path()
+    
+    if not os.path.isfile(path):
+        return {}
+    
+    with open(path, "rb") as f:
+        aliases = json.loads(f.read())
+    
+    if not isinstance(aliases, dict) or not all(
+        isinstance(role_id, str) and isinstance(key, str) for role_id, key in aliases.items()
+    ):
+        raise ValueError("Role aliases must map role ids to role keys")
+    return aliases
+
+
+def write_role_aliases(aliases: Dict[str, str], path: Optional[str] = None):
+    """
+    Replace the role alias file atomically.
+    
+    Args:
+        aliases: Role id -> role key
+        path: Alias file (defaults to default_role_aliases_path())
+    """
+    path = path or default_role_aliases_path()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    
+    temporary = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(aliases, f, indent=2, sort_keys=True)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+@contextmanager
+def role_aliases_lock(path: Optional[str] = None) -> Iterator[None]:
+    """
+    Hold an exclusive lock on the role alias file across processes.
+    
+    Uses flock on a ``.lock`` file next to it, so every worker sharing
+    the file serializes its read-merge-write (a no-op where fcntl is
+    unavailable).
+    
+    Args:
+        path: Alias file (defaults to default_role_aliases_path())
+    """
+    path = path or default_role_aliases_path()
+    if fcntl is None:
+        yield
+        return
+    
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _compact_role(obj: Dict[str, Any]) -> Any:
+    """JSON object hook: a well-formed role as RoleRequirements, anything else as is"""
+    skills = obj.get("skills")
+    if "title" in obj and isinstance(skills, list) and all(
+        isinstance(req, dict) and REQUIREMENT_FIELDS <= req.keys() for req in skills
+    ):
+        return RoleRequirements(obj)
+    return obj
+
+
+def load_roles(path: Optional[str] = None) -> Tuple[Dict[str, Any], str]:
+    """
+    Load role requirements from a JSON file, or the built-in table.
+    
+    The file holds either a role table or ``{"version": ..., "roles": ...}``;
+    without an explicit version, a content hash is used.
+    
+    Args:
+        path: Roles file (defaults to default_roles_path())
+    
+    Returns:
+        Tuple of (role key -> role dict or RoleRequirements, version)
+    
+    Raises:
+        ValueError: If the file content is not a valid role table
+    """
+    path = path or default_roles_path()
+    
+    if not os.path.isfile(path):
+        return ROLE_REQUIREMENTS, "builtin"
+    
+    with open(path, "rb") as f:
+        raw = f.read()
+    # Well-formed roles are compacted as soon as they are parsed, so the
+    # dicts of every requirement never exist at the same time
+    data = json.loads(raw, object_hook=_compact_role)
+    
+    if "roles" in data and isinstance(data["roles"], dict):
+        roles, version = data["roles"], data.get("version")
+    else:
+        roles, version = data, None
+    
+    if "default" not in roles:
+        raise ValueError("Role requirements must define a 'default' role")
+    for key, role in roles.items():
+        if isinstance(role, RoleRequirements):
+            continue
+        if "title" not in role or not isinstance(role.get("skills"), list):
+            raise ValueError(f"Role '{key}' needs a title and a skills list")
+        for req in role["skills"]:
+            missing = REQUIREMENT_FIELDS - set(req)
+            if missing:
+                raise ValueError(f"Role '{key}' skill is missing {sorted(missing)}")
+    
+    return roles, str(version or hashlib.sha256(raw).hexdigest()[:12])
+
+
 class GapAnalyzerService:
     """Service for analyzing skill gaps with intelligent prioritization"""
     
+    def __init__(self):
+        # Role id -> role key aliases, persisted in the role alias file
+        self.role_aliases: Dict[str, str] = {}
+        # Built on first use (normally initialize() at startup), not at import
+        self._data: Optional[RoleData] = None
+        # Guards publishing snapshots and aliases, so a reload never drops
+        # aliases registered while it was building
+        self._data_lock = threading.RLock()
+        # Bumped whenever a snapshot is swapped in (keys process pools)
+        self._revisions = itertools.count(1)
+        self.revision = 0
+        self.cache = create_cache("gaps", settings.gap_cache_size, settings.gap_cache_ttl)
+    
+    @property
+    def data(self) -> RoleData:
+        """Active snapshot, loaded from the configured roles on first access"""
+        data = self._data
+        if data is None:
+            with self._data_lock:
+                if self._data is None:
+                    self.role_aliases = load_role_aliases()
+                    self.data = self.build_data(*load_roles())
+                data = self._data
+        return data
+    
+    @data.setter
+    def data(self, data: RoleData):
+        self._data = data
+        self.revision = next(self._revisions)
+    
+    def publish(self, data: RoleData):
+        """
+        Swap in a freshly built snapshot with the aliases from the alias file.
+        
+        Aliases are read under the same lock registration holds, so ones
+        registered while the snapshot was being built are kept, and other
+        workers' registrations are picked up.
+        
+        Raises:
+            ValueError: If the alias file is invalid (nothing is swapped)
+        """
+        with self._data_lock:
+            self.role_aliases = load_role_aliases()
+            self.data = data.with_aliases(self.role_aliases)
+    
+    @property
+    def is_initialized(self) -> bool:
+        return self._data is not None
+    
+    def initialize(self):
+        """Load and compile role data ahead of the first request"""
+        self.data
+    
+    @property
+    def compiled(self) -> CompiledRoles:
+        """Compiled role table of the active snapshot"""
+        return self.data.compiled
+    
+    def build_data(self, roles: Dict[str, Any], version: str) -> RoleData:
+        """
+        Compile role requirements into a snapshot.
+        
+        Priority and time-to-close are tabulated by gap size. Priority is
+        constant once the gap reaches the critical threshold, so that table
+        stops there and larger gaps are clipped onto its last row.
+        Time-to-close is tabulated up to the largest required level; bigger
+        gaps (only possible with negative current levels) fall back to
+        _estimate_time_to_close.
+        """
+        compiled = CompiledRoles(roles)
+        
+        max_priority_gap = max(
+            settings.gap_critical_threshold, settings.gap_high_threshold, 1
+        )
+        priority_table = np.array([
+            [
+                PRIORITY_LEVELS.index(self._calculate_priority(gap, importance))
+                for importance in IMPORTANCE_LEVELS
+            ]
+            for gap in range(max_priority_gap + 1)
+        ], dtype=np.intp)
+        
+        time_table = np.array([
+            self._estimate_time_to_close(gap, "")
+            for gap in range(compiled.max_required_level + 1)
+        ], dtype=np.int64)
+        
+        return RoleData(
+            version, compiled, priority_table, time_table,
+            self.role_aliases, self._lookup_role_key,
+        )
+    
+    def register_role_aliases(
+        self,
+        aliases: Dict[str, str],
+        replace: bool = False
+    ) -> int:
+        """
+        Map role ids the backend sends (e.g. MongoDB ObjectIds) to role keys.
+        
+        Alias targets may be role keys or titles; they are resolved once
+        here. Aliases are merged into the role alias file under an
+        inter-process lock (so registrations on other workers are kept),
+        take effect atomically and survive data reloads and restarts; an
+        alias whose role disappears in a reload is ignored. Other workers
+        pick them up on their next reload (or data watcher tick).
+        
+        Args:
+            aliases: Role id -> role key or title
+            replace: Drop all previously registered aliases first
+        
+        Returns:
+            Number of registered aliases
+        
+        Raises:
+            ValueError: If a target does not name a known role
+            OSError: If the alias file cannot be written
+        """
+        with self._data_lock, role_aliases_lock():
+            compiled = self.data.compiled
+            resolved = {
+                role_id: self._lookup_role_key(target, compiled, {})
+                for role_id, target in aliases.items()
+            }
+            unknown = sorted(
+                target for role_id, target in aliases.items()
+                if resolved[role_id] == "default" and target.lower() != "default"
+            )
+            if unknown:
+                raise ValueError(f"Unknown roles: {unknown}")
+            
+            # Merge into the file, not this worker's copy, which may be stale
+            merged = resolved if replace else {**load_role_aliases(), **resolved}
+            write_role_aliases(merged)
+            self.role_aliases = merged
+            self.data = self.data.with_aliases(merged)
+            return len(merged)
+    
+    @timed("analyze_gaps")
     def analyze_gaps(
         self,
         user_id: str,
@@ -119,63 +630,163 @@ class GapAnalyzerService:
             user_id: User identifier
             skill_profile: User's current skill profile
             target_role_id: Target role identifier
-            
+        
         Returns:
             Gap analysis with prioritized gaps and recommendations
+            (possibly shared with other callers through the result cache,
+            so treat it as read-only)
         """
-        # Get role requirements
-        role_reqs = self._get_role_requirements(target_role_id)
+        data = self.data
+        compiled = data.compiled
+        role_key = self._resolve_role_key(target_role_id, data)
+        if role_key == "default" and target_role_id != "default":
+            FALLBACKS.inc(("role",))
+        
+        cache_key = None
+        if self.cache.enabled:
+            cache_key = self._cache_key(role_key, skill_profile, data.version)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        analysis = self._analyze_role(
+            data, compiled.role_index[role_key], compiled.skill_levels(skill_profile)
+        )
         
-        # Build user skill map
-        user_skills = {
-            s["skillId"]: s 
+        if cache_key is not None:
+            self.cache.set(cache_key, analysis)
+        
+        return analysis
+    
+    def _cache_key(
+        self,
+        role_key: str,
+        skill_profile: Dict[str, Any],
+        version: str
+    ) -> str:
+        """
+        Fingerprint of everything analyze_gaps depends on.
+        
+        The profile is reduced to sorted (skillId, proficiencyLevel) pairs
+        (last entry wins for repeated skills, as in the analysis), so
+        timestamps, confidence and list order do not defeat the cache.
+        """
+        levels = {
+            s["skillId"]: s.get("proficiencyLevel", 0)
             for s in skill_profile.get("skills", [])
         }
+        return fingerprint(role_key, sorted(levels.items()), version)
+    
+    @timed("rank_roles")
+    def rank_roles(
+        self,
+        skill_profile: Dict[str, Any],
+        top_k: Optional[int] = None,
+        max_gaps: int = 3
+    ) -> List[Dict[str, Any]]:
+        """
+        Score a skill profile against every role at once.
         
-        gaps = []
-        strength_areas = []
-        improvement_areas = []
+        Readiness for all roles comes from a single pass over the compiled
+        role x requirement matrices; full gap lists are only built for the
+        roles that are returned.
         
-        for req in role_reqs["skills"]:
-            skill_id = req["skillId"]
-            required_level = req["requiredLevel"]
-            
-            # Get user's current level (default to 0 if not assessed)
-            user_skill = user_skills.get(skill_id, {})
-            current_level = user_skill.get("proficiencyLevel", 0)
-            
-            # Calculate gap
-            gap_size = max(0, required_level - current_level)
-            
-            if gap_size > 0:
-                # Calculate priority based on gap size and importance
-                priority = self._calculate_priority(gap_size, req["importance"])
-                
-                # Estimate time to close gap
-                estimated_time = self._estimate_time_to_close(gap_size, skill_id)
-                
-                gaps.append({
-                    "skillId": skill_id,
-                    "skillName": req["skillName"],
-                    "currentLevel": current_level,
-                    "requiredLevel": required_level,
-                    "gapSize": gap_size,
-                    "priority": priority,
-                    "importance": req["importance"],
-                    "estimatedTimeToClose": estimated_time,
-                })
-                
-                improvement_areas.append(req["skillName"])
-            else:
-                # User meets or exceeds requirement
-                strength_areas.append(req["skillName"])
+        Args:
+            skill_profile: User's current skill profile
+            top_k: Number of best-fit roles to return (all roles if None)
+            max_gaps: Number of top-priority gaps to include per role
+        
+        Returns:
+            Roles ordered by readiness (highest first) with their top gaps
+        """
+        data = self.data
+        compiled = data.compiled
+        levels = compiled.skill_levels(skill_profile)
+        readiness = compiled.readiness_matrix(levels)
+        
+        ranked = [
+            r for r in np.argsort(-readiness, kind="stable").tolist()
+            if compiled.keys[r] != "default"
+        ]
+        if top_k is not None:
+            ranked = ranked[:top_k]
+        
+        results = []
+        for role in ranked:
+            key = compiled.keys[role]
+            analysis = self._analyze_role(data, role, levels)
+            results.append({
+                "roleId": key,
+                "title": compiled.roles[key].title,
+                "readiness": round(float(readiness[role]), 1),
+                "topGaps": analysis["gaps"][:max_gaps],
+                "strengthAreas": analysis["strengthAreas"],
+            })
+        
+        return results
+    
+    def _analyze_role(
+        self,
+        data: RoleData,
+        role: int,
+        levels: np.ndarray
+    ) -> Dict[str, Any]:
+        """Gap analysis of a vocabulary-mapped profile against a compiled role"""
+        compiled = data.compiled
+        
+        # Compare each requirement with the user's current level (0 if unassessed)
+        current = levels[compiled.skill_columns[role]]
+        required = compiled.required_levels[role]
+        gap_sizes = np.maximum(0, required - current)
+        has_gap = gap_sizes > 0
+        
+        # Priority from the (gap size, importance) table
+        priorities = data.priority_table[
+            np.minimum(gap_sizes, len(data.priority_table) - 1),
+            compiled.importance_codes[role],
+        ]
+        
+        # Time to close from the gap size table
+        times = data.time_table[np.minimum(gap_sizes, len(data.time_table) - 1)]
         
-        # Sort gaps by priority
-        priority_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-        gaps.sort(key=lambda g: priority_order.get(g["priority"], 4))
+        # Gap rows sorted by priority, keeping requirement order within a priority
+        gap_rows = np.flatnonzero(has_gap)
+        gap_rows = gap_rows[np.argsort(priorities[gap_rows], kind="stable")]
+        
+        skill_names = compiled.skill_names[role]
+        skill_ids = compiled.roles[compiled.keys[role]].skill_ids
+        current_list = current.tolist()
+        required_list = required.tolist()
+        gap_list = gap_sizes.tolist()
+        priority_list = priorities.tolist()
+        time_list = times.tolist()
+        
+        gaps = []
+        for i in gap_rows.tolist():
+            gap_size = gap_list[i]
+            estimated_time = (
+                time_list[i] if gap_size < len(data.time_table)
+                else self._estimate_time_to_close(gap_size, skill_ids[i])
+            )
+            gaps.append({
+                "skillId": skill_ids[i],
+                "skillName": skill_names[i],
+                "currentLevel": current_list[i],
+                "requiredLevel": required_list[i],
+                "gapSize": gap_size,
+                "priority": PRIORITY_LEVELS[priority_list[i]],
+                "importance": compiled.importances[role][i],
+                "estimatedTimeToClose": estimated_time,
+            })
+        
+        has_gap_list = has_gap.tolist()
+        improvement_areas = [n for n, g in zip(skill_names, has_gap_list) if g]
+        strength_areas = [n for n, g in zip(skill_names, has_gap_list) if not g]
         
         # Calculate overall readiness
-        overall_readiness = self._calculate_readiness(gaps, role_reqs["skills"])
+        overall_readiness = self._calculate_readiness_vector(
+            compiled, required, gap_sizes, has_gap, role
+        )
         
         return {
             "gaps": gaps,
@@ -184,29 +795,52 @@ class GapAnalyzerService:
             "improvementAreas": improvement_areas[:5],
         }
     
-    def _get_role_requirements(self, role_id: str) -> Dict[str, Any]:
+    def _resolve_role_key(self, role_id: str, data: Optional[RoleData] = None) -> str:
+        """Resolve a role identifier to its role key (memoized per snapshot)"""
+        return (data or self.data).resolve_role_key(role_id)
+    
+    def _lookup_role_key(
+        self,
+        role_id: str,
+        compiled: CompiledRoles,
+        aliases: Dict[str, str]
+    ) -> str:
         """
-        Get role skill requirements.
+        Resolve a role identifier to its role requirements key.
         
         Lookup order:
         1. Exact key match (e.g. "frontend_developer")
-        2. Normalized title match (e.g. "Frontend Developer" -> "frontend_developer")
-        3. Fallback to default
+        2. Registered alias (e.g. a MongoDB ObjectId)
+        3. Normalized title match (e.g. "Frontend Developer" -> "frontend_developer")
+        4. Fallback to default
         """
         # Exact key match
-        if role_id in ROLE_REQUIREMENTS:
-            return ROLE_REQUIREMENTS[role_id]
+        if role_id in compiled.role_index:
+            return role_id
+        
+        alias = aliases.get(role_id)
+        if alias in compiled.role_index:
+            return alias
+        
+        # An unregistered ObjectId cannot match a title
+        if OBJECT_ID_PATTERN.fullmatch(role_id):
+            return "default"
         
         # Try normalized title match
         normalized = role_id.lower().replace(" ", "_").replace("-", "_")
-        if normalized in ROLE_REQUIREMENTS:
-            return ROLE_REQUIREMENTS[normalized]
+        if normalized in compiled.role_index:
+            return normalized
         
         # Try reverse title lookup
-        if normalized in _TITLE_TO_KEY:
-            return ROLE_REQUIREMENTS[_TITLE_TO_KEY[normalized]]
+        if normalized in compiled.title_to_key:
+            return compiled.title_to_key[normalized]
         
-        return ROLE_REQUIREMENTS["default"]
+        return "default"
+    
+    def _get_role_requirements(self, role_id: str) -> Dict[str, Any]:
+        """Get role skill requirements (see _lookup_role_key for lookup order)"""
+        data = self.data
+        return data.compiled.roles[self._resolve_role_key(role_id, data)].to_dict()
     
     def _calculate_priority(self, gap_size: int, importance: str) -> str:
         """
@@ -304,6 +938,34 @@ class GapAnalyzerService:
         
         readiness = (total_weighted_score / total_weight) * 100 if total_weight > 0 else 0
         return round(readiness, 1)
+    
+    def _calculate_readiness_vector(
+        self,
+        compiled: CompiledRoles,
+        required: np.ndarray,
+        gap_sizes: np.ndarray,
+        has_gap: np.ndarray,
+        role: int
+    ) -> float:
+        """
+        Vectorized _calculate_readiness over a compiled role.
+        
+        Scores are summed sequentially so the result is identical to the
+        per-requirement loop.
+        """
+        if not len(required):
+            return 100.0
+        
+        total_weight = compiled.total_weights[role]
+        if total_weight <= 0:
+            return 0
+        
+        met = np.maximum(0, required - gap_sizes)
+        scores = np.ones(len(required))
+        np.divide(met, required, out=scores, where=has_gap)
+        total_weighted_score = np.cumsum(scores * compiled.weights[role])[-1]
+        
+        return round(float(total_weighted_score / total_weight) * 100, 1)
 
 
 # Singleton instance
@@ -0,0 +1,111 @@
+"""
+SkillSense AI - Assessment Pipeline Service
+
+Chains proficiency prediction, gap analysis and recommendations in-process,
+passing each stage's internal results straight to the next.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.services.predictor import predictor_service
+from app.services.gap_analyzer import gap_analyzer_service
+from app.services.recommender import recommender_service
+from app.utils.metrics import timed
+
+
+# Stages in execution order
+PIPELINE_STAGES = ("predict", "gaps", "recommend")
+
+
+class PipelineService:
+    """Runs the assess -> gaps -> recommendations flow in one call"""
+    
+    @timed("pipeline")
+    def run(
+        self,
+        user_id: str,
+        stages: Sequence[str] = PIPELINE_STAGES,
+        responses: Optional[List[Dict[str, Any]]] = None,
+        skill_profile: Optional[Dict[str, Any]] = None,
+        target_role_id: Optional[str] = None,
+        gaps: Optional[List[Dict[str, Any]]] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the selected stages, feeding each one the previous stage's output.
+        
+        Predicted levels are appended to ``skill_profile`` (they win over
+        older entries for the same skill) before gap analysis, and the
+        analysis gaps are used for recommendations. A stage that is not
+        selected takes its input from the arguments instead.
+        
+        Args:
+            user_id: User identifier
+            stages: Stages to run (subset of PIPELINE_STAGES)
+            responses: Assessment responses (required for "predict")
+            skill_profile: Existing skill profile (optional with "predict")
+            target_role_id: Target role identifier (required for "gaps")
+            gaps: Skill gaps (required for "recommend" without "gaps")
+            limit: Maximum number of recommendations
+        
+        Returns:
+            Results keyed by "prediction", "gapAnalysis" and
+            "recommendations"; stages that did not run are None
+        
+        Raises:
+            ValueError: If a stage is missing its input
+        """
+        result: Dict[str, Any] = {
+            "prediction": None,
+            "gapAnalysis": None,
+            "recommendations": None,
+        }
+        
+        if "predict" in stages:
+            if responses is None:
+                raise ValueError("The predict stage needs assessmentResponses")
+            prediction = predictor_service.predict_proficiency(user_id, responses)
+            result["prediction"] = prediction
+            skill_profile = self._merge_predictions(user_id, skill_profile, prediction)
+        
+        if "gaps" in stages:
+            if skill_profile is None or target_role_id is None:
+                raise ValueError(
+                    "The gaps stage needs targetRoleId and a skillProfile or the predict stage"
+                )
+            analysis = gap_analyzer_service.analyze_gaps(user_id, skill_profile, target_role_id)
+            result["gapAnalysis"] = analysis
+            gaps = analysis["gaps"]
+        
+        if "recommend" in stages:
+            if gaps is None:
+                raise ValueError("The recommend stage needs gaps or the gaps stage")
+            result["recommendations"] = recommender_service.generate_recommendations(
+                user_id, gaps, limit=limit
+            )
+        
+        return result
+    
+    def _merge_predictions(
+        self,
+        user_id: str,
+        skill_profile: Optional[Dict[str, Any]],
+        prediction: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Skill profile with predicted levels appended after existing skills"""
+        skills = list(skill_profile.get("skills", [])) if skill_profile else []
+        skills.extend(
+            {
+                "skillId": p["skillId"],
+                "skillName": p["skillName"],
+                "proficiencyLevel": p["proficiencyLevel"],
+                "confidence": p["confidence"],
+                "source": "assessment",
+            }
+            for p in prediction["predictions"]
+        )
+        return {"userId": user_id, "skills": skills}
+
+
+# Singleton instance
+pipeline_service = PipelineService()
@@ -5,24 +5,33 @@ Predicts skill proficiency levels from assessment responses using
 weighted scoring with explainable components.
 """
 
-from typing import List, Dict, Any
-from collections import defaultdict
+from typing import List, Dict, Any, Tuple
 import numpy as np
 
 from app.config import settings
+from app.utils.cache import create_cache, fingerprint
+from app.utils.metrics import timed
 from app.utils.scoring import (
     calculate_weighted_score,
     calibrate_self_assessment,
+    calibrate_self_assessments,
     normalize_time_factor,
 )
 
 
+# Score thresholds separating proficiency levels 1-5
+PROFICIENCY_THRESHOLDS = np.array([0.2, 0.4, 0.6, 0.8])
+
+
 class PredictorService:
     """Service for predicting skill proficiency from assessments"""
     
     def __init__(self):
         self.is_initialized = False
         self.skill_weights: Dict[str, float] = {}
+        self.cache = create_cache(
+            "prediction", settings.prediction_cache_size, settings.prediction_cache_ttl
+        )
     
     def initialize(self):
         """Initialize the predictor with any pre-trained models or data"""
@@ -37,6 +46,7 @@ class PredictorService:
         
         print("  Predictor service initialized")
     
+    @timed("predict_proficiency")
     def predict_proficiency(
         self, 
         user_id: str, 
@@ -62,29 +72,226 @@ class PredictorService:
         Returns:
             Dictionary with predictions and confidence
         """
-        # Group responses by skill
-        skill_responses: Dict[str, List[Dict]] = defaultdict(list)
+        return self.predict_proficiency_batch([responses])[0]
+    
+    @timed("predict_proficiency_batch")
+    def predict_proficiency_batch(
+        self,
+        assessments: List[List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict proficiency for many users' assessments in one pass.
         
-        for response in responses:
-            skill_id = response.get("skillId")
-            if skill_id:
-                skill_responses[skill_id].append(response)
+        Args:
+            assessments: One list of assessment responses per user
+            
+        Returns:
+            Prediction results in the same order as the input assessments
+            (possibly shared with other callers through the result cache,
+            so treat them as read-only)
+        """
+        if not self.cache.enabled:
+            return self._score_assessments(assessments)
         
-        predictions = []
-        total_confidence = 0.0
+        keys = [self._cache_key(responses) for responses in assessments]
+        results = self.cache.get_many(keys)
         
-        for skill_id, skill_resp_list in skill_responses.items():
-            prediction = self._predict_skill_proficiency(skill_id, skill_resp_list)
-            predictions.append(prediction)
-            total_confidence += prediction["confidence"]
+        # Score all misses together, then store them (one round trip each
+        # way on shared backends)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            scored = self._score_assessments([assessments[i] for i in missing])
+            for i, result in zip(missing, scored):
+                results[i] = result
+            self.cache.set_many([(keys[i], results[i]) for i in missing])
         
-        # Average confidence across all skills
-        avg_confidence = total_confidence / len(predictions) if predictions else 0.0
+        return results
+    
+    def _cache_key(self, responses: List[Dict[str, Any]]) -> str:
+        """
+        Fingerprint of the response fields that scoring reads.
         
-        return {
-            "predictions": predictions,
-            "confidence": round(avg_confidence, 2),
-        }
+        Response order is kept (it decides prediction order); ids and
+        timestamps are left out so they do not defeat the cache.
+        """
+        return fingerprint([
+            (
+                r.get("skillId"),
+                r.get("skillName"),
+                r.get("answer", ""),
+                bool(r.get("isCorrect", False)),
+                r.get("difficultyWeight", 1.0),
+                r.get("timeSpent", 60),
+            )
+            for r in responses
+        ])
+    
+    def _score_assessments(
+        self,
+        assessments: List[List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Score one or more assessments in a single vectorized pass.
+        
+        Every response becomes a row in a set of NumPy columns (skill group,
+        self-rating, correctness, difficulty weight, time spent).  Per-skill
+        aggregates are then computed with ``np.bincount`` instead of looping
+        over responses, reproducing ``_predict_skill_proficiency`` exactly.
+        
+        Args:
+            assessments: One list of assessment responses per user
+            
+        Returns:
+            One prediction result (predictions and confidence) per assessment
+        """
+        groups: Dict[Tuple[int, str], int] = {}
+        group_skill_ids: List[str] = []
+        group_skill_names: List[str] = []
+        group_bounds = [0]
+        
+        row_group: List[int] = []
+        rows: List[Dict[str, Any]] = []
+        
+        for index, responses in enumerate(assessments):
+            scored = [r for r in responses if r.get("skillId")]
+            for response in scored:
+                key = (index, response["skillId"])
+                if key not in groups:
+                    groups[key] = len(group_skill_ids)
+                    group_skill_ids.append(key[1])
+                    group_skill_names.append(response.get("skillName", key[1]))
+            row_group.extend([groups[(index, r["skillId"])] for r in scored])
+            rows.extend(scored)
+            group_bounds.append(len(group_skill_ids))
+        
+        answers = [r.get("answer", "") for r in rows]
+        row_rating = [
+            int(a) if isinstance(a, str) and a.isdigit() and 1 <= int(a) <= 5 else 0
+            for a in answers
+        ]
+        
+        n_groups = len(group_skill_ids)
+        group_idx = np.array(row_group, dtype=np.intp)
+        rating = np.array(row_rating, dtype=np.int64)
+        correct = np.array(
+            [bool(r.get("isCorrect", False)) for r in rows], dtype=bool
+        )
+        weight = np.array(
+            [r.get("difficultyWeight", 1.0) for r in rows], dtype=np.float64
+        )
+        time_spent = np.array(
+            [r.get("timeSpent", 60) for r in rows], dtype=np.float64
+        )
+        
+        is_rating = rating > 0
+        is_objective = ~is_rating
+        response_counts = np.bincount(group_idx, minlength=n_groups)
+        
+        # Objective score: difficulty-weighted correctness
+        objective_groups = group_idx[is_objective]
+        objective_counts = np.bincount(objective_groups, minlength=n_groups)
+        total_weight = np.bincount(
+            objective_groups, weights=weight[is_objective], minlength=n_groups
+        )
+        correct_rows = is_objective & correct
+        weighted_correct = np.bincount(
+            group_idx[correct_rows], weights=weight[correct_rows], minlength=n_groups
+        )
+        objective_score = np.divide(
+            weighted_correct,
+            total_weight,
+            out=np.zeros(n_groups),
+            where=total_weight > 0,
+        )
+        objective_score *= self._calculate_time_factors(
+            time_spent[is_objective], objective_groups, objective_counts
+        )
+        
+        # Self-assessment score, calibrated against objective performance
+        rating_groups = group_idx[is_rating]
+        rating_counts = np.bincount(rating_groups, minlength=n_groups)
+        rating_sums = np.bincount(
+            rating_groups, weights=rating[is_rating], minlength=n_groups
+        )
+        self_rating_score = np.divide(
+            rating_sums,
+            rating_counts,
+            out=np.zeros(n_groups),
+            where=rating_counts > 0,
+        ) / 5.0
+        has_objective = objective_counts > 0
+        has_rating = rating_counts > 0
+        self_rating_score = np.where(
+            has_objective,
+            calibrate_self_assessments(self_rating_score, objective_score),
+            self_rating_score,
+        )
+        
+        # Combine scores, weighting objective higher than self-assessment
+        combined_score = np.where(
+            has_objective & has_rating,
+            0.7 * objective_score + 0.3 * self_rating_score,
+            np.where(has_objective, objective_score, self_rating_score),
+        )
+        
+        levels = (np.digitize(combined_score, PROFICIENCY_THRESHOLDS) + 1).tolist()
+        confidences = np.round(self._calculate_confidence(response_counts), 2)
+        confidence_list = confidences.tolist()
+        
+        results = []
+        for start, end in zip(group_bounds, group_bounds[1:]):
+            predictions = [
+                {
+                    "skillId": group_skill_ids[g],
+                    "skillName": group_skill_names[g],
+                    "proficiencyLevel": levels[g],
+                    "confidence": confidence_list[g],
+                }
+                for g in range(start, end)
+            ]
+            
+            # Average confidence across all skills (sequential sum)
+            if end > start:
+                avg_confidence = np.cumsum(confidences[start:end])[-1] / (end - start)
+            else:
+                avg_confidence = 0.0
+            
+            results.append({
+                "predictions": predictions,
+                "confidence": float(round(avg_confidence, 2)),
+            })
+        
+        return results
+    
+    def _calculate_time_factors(
+        self,
+        time_spent: np.ndarray,
+        groups: np.ndarray,
+        counts: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate the time efficiency factor of every skill group at once.
+        
+        Groups with the same number of responses are reshaped into a 2-D
+        block and averaged along rows, which matches ``np.mean`` on each
+        group bit for bit (``np.add.reduceat`` does not).
+        """
+        factors = np.where(
+            time_spent < 30, 1.1, np.where(time_spent > 120, 0.9, 1.0)
+        )
+        time_factors = np.ones(len(counts))
+        
+        # Order rows by (group size, group), keeping response order within groups
+        ordered = factors[np.lexsort((groups, counts[groups]))]
+        
+        offset = 0
+        for size in np.unique(counts[counts > 0]).tolist():
+            members = np.flatnonzero(counts == size)
+            block = ordered[offset:offset + len(members) * size]
+            time_factors[members] = block.reshape(len(members), size).mean(axis=1)
+            offset += len(members) * size
+        
+        return time_factors
     
     def _predict_skill_proficiency(
         self, 
@@ -94,6 +301,9 @@ class PredictorService:
         """
         Predict proficiency for a single skill.
         
+        Reference implementation of the per-skill model; the request path
+        uses the vectorized ``_score_assessments`` which must agree with it.
+        
         Uses a multi-factor scoring approach:
         - Correctness score (weighted by difficulty)
         - Time efficiency factor
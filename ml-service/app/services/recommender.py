@@ -5,10 +5,22 @@ Generates personalized learning recommendations based on skill gaps.
 Uses content-based filtering with rule-based prioritization.
 """
 
-from typing import List, Dict, Any
+import itertools
+import threading
+from array import array
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 
+from app.config import settings
+from app.services.catalog import BuiltinCatalog, Resource, load_catalog
+from app.utils.cache import create_cache, fingerprint
+from app.utils.metrics import FALLBACKS, timed
+from app.utils.skill_index import SkillNameIndex
 
-# Learning resource catalog covering all skills in the SkillSense platform
+
+# Learning resource catalog covering all skills in the SkillSense platform.
+# Built-in fallback; a columnar catalog under settings.model_path takes
+# precedence when present (see app.services.catalog).
 LEARNING_RESOURCES = {
     "javascript": [
         {
@@ -429,13 +441,175 @@ LEARNING_RESOURCES = {
 }
 
 
+# Short skill names that no catalog key contains, mapped to their key
+RESOURCE_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "ds": "datastructures",
+    "dsa": "datastructures",
+    "ml": "machinelearning",
+}
+
+
+# Largest gap size with its own score table; bigger gaps score like this one
+MAX_GAP_SIZE = 5
+
+# Minimum score for a resource to be recommended
+RELEVANCE_THRESHOLD = 0.3
+
+
+class ScoreTable:
+    """
+    A skill's resources ranked for every gap size 0..MAX_GAP_SIZE.
+    
+    ``rankings[gap_size]`` is a compact array of indexes into
+    ``resources`` (and their title/provider dedup ``keys``), in
+    descending score order and cut off at RELEVANCE_THRESHOLD. Scores are
+    not kept: only the order is needed at request time.
+    """
+    
+    __slots__ = ("resources", "keys", "rankings")
+    
+    def __init__(
+        self,
+        resources: Tuple[Resource, ...],
+        keys: Tuple[str, ...],
+        rankings: Tuple[array, ...]
+    ):
+        self.resources = resources
+        self.keys = keys
+        self.rankings = rankings
+
+
+class CatalogData:
+    """
+    Snapshot of a resource catalog and the structures derived from it.
+    
+    Snapshots are never modified after construction (score tables are only
+    memoized). A reload builds a new one and swaps it in; requests read
+    ``RecommenderService.data`` once and keep using that snapshot.
+    """
+    
+    def __init__(self, catalog, skill_index: SkillNameIndex, build_score_table):
+        self.catalog = catalog
+        self.version: str = catalog.version
+        self.skill_index = skill_index
+        self.score_table = lru_cache(maxsize=settings.catalog_cache_size)(
+            build_score_table
+        )
+
+
 class RecommenderService:
     """Service for generating personalized learning recommendations"""
     
+    def __init__(self, catalog=None):
+        # The configured catalog is loaded on first use (normally
+        # initialize() at startup), not at import
+        self._data: Optional[CatalogData] = None
+        self._data_lock = threading.Lock()
+        # Bumped whenever a snapshot is swapped in (keys process pools)
+        self._revisions = itertools.count(1)
+        self.revision = 0
+        if catalog is not None:
+            self.data = self.build_data(catalog)
+        self.cache = create_cache(
+            "recommendations",
+            settings.recommendation_cache_size,
+            settings.recommendation_cache_ttl,
+        )
+    
+    @property
+    def data(self) -> CatalogData:
+        """Active snapshot, loaded from the configured catalog on first access"""
+        data = self._data
+        if data is None:
+            with self._data_lock:
+                if self._data is None:
+                    self.data = self.build_data(load_catalog(LEARNING_RESOURCES))
+                data = self._data
+        return data
+    
+    @data.setter
+    def data(self, data: CatalogData):
+        self._data = data
+        self.revision = next(self._revisions)
+    
+    @property
+    def is_initialized(self) -> bool:
+        return self._data is not None
+    
+    def initialize(self):
+        """Load the catalog and build its indexes ahead of the first request"""
+        self.data
+    
+    @property
+    def catalog(self):
+        """Resource catalog of the active snapshot"""
+        return self.data.catalog
+    
+    @property
+    def skill_index(self) -> SkillNameIndex:
+        """Skill name index of the active snapshot"""
+        return self.data.skill_index
+    
+    def score_table(self, key: str) -> ScoreTable:
+        """Score table of a skill key in the active snapshot"""
+        return self.data.score_table(key)
+    
+    def build_data(self, catalog) -> "CatalogData":
+        """
+        Build a snapshot with the name index and score tables of a catalog.
+        
+        The built-in catalog is scored up front. Mapped catalogs stay fully
+        lazy (tables are built on first use), so startup time and worker
+        memory do not grow with the number of resources on disk.
+        """
+        data = CatalogData(
+            catalog,
+            SkillNameIndex(
+                catalog.keys,
+                aliases=RESOURCE_ALIASES,
+                cache_size=settings.skill_index_cache_size,
+            ),
+            lambda key: self._build_score_table(catalog, key),
+        )
+        
+        if isinstance(catalog, BuiltinCatalog):
+            for key in catalog.keys:
+                data.score_table(key)
+        
+        return data
+    
+    def _build_score_table(self, catalog, key: str) -> ScoreTable:
+        """
+        Rank a skill's resources at every gap size.
+        
+        For each gap size 0..MAX_GAP_SIZE, the skill's resources are scored
+        once and sorted by descending score (catalog order breaks ties);
+        resources at or below RELEVANCE_THRESHOLD are left out. Repeated
+        title/provider pairs within a skill are dropped up front, keeping
+        the first, as the per-request loop did.
+        """
+        unique: Dict[str, Resource] = {}
+        for resource in catalog.resources(key):
+            unique.setdefault(f"{resource.title}_{resource.provider}", resource)
+        keys, resources = tuple(unique), tuple(unique.values())
+        
+        typecode = "H" if len(resources) <= 0xFFFF else "I"
+        rankings = []
+        for gap_size in range(MAX_GAP_SIZE + 1):
+            scores = [self._score_resource(resource, gap_size) for resource in resources]
+            order = sorted(range(len(resources)), key=lambda i: -scores[i])
+            rankings.append(array(typecode, (i for i in order if scores[i] > RELEVANCE_THRESHOLD)))
+        
+        return ScoreTable(resources, keys, tuple(rankings))
+    
+    @timed("generate_recommendations")
     def generate_recommendations(
         self,
         user_id: str,
-        gaps: List[Dict[str, Any]]
+        gaps: List[Dict[str, Any]],
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Generate learning recommendations based on skill gaps.
@@ -443,22 +617,65 @@ class RecommenderService:
         Algorithm:
         1. Sort gaps by priority (critical -> high -> medium -> low)
         2. For each gap, find relevant learning resources
-        3. Score resources based on:
-           - Gap size (larger gap = prefer comprehensive resources)
-           - Current level (match resource difficulty)
-           - Resource type variety
-        4. Return prioritized list of recommendations
+        3. Take the skill's resources in precomputed score order for the
+           gap size (see _build_score_table), skipping ones already used
+        4. Stop as soon as ``limit`` recommendations are collected; later
+           candidates could only rank lower
         
         Args:
             user_id: User identifier
             gaps: List of skill gaps with priority
-            
+            limit: Maximum number of recommendations (settings default if None)
+        
         Returns:
-            Prioritized list of learning recommendations
+            Prioritized list of learning recommendations (possibly shared
+            with other callers through the result cache, so treat it as
+            read-only)
         """
-        if not gaps:
+        if limit is None:
+            limit = settings.recommendation_limit
+        
+        if not gaps or limit <= 0:
             return []
         
+        data = self.data
+        
+        cache_key = None
+        if self.cache.enabled:
+            cache_key = self._cache_key(gaps, limit, data.version)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        recommendations = self._collect_recommendations(data, gaps, limit)
+        
+        if cache_key is not None:
+            self.cache.set(cache_key, recommendations)
+        
+        return recommendations
+    
+    def _cache_key(self, gaps: List[Dict[str, Any]], limit: int, version: str) -> str:
+        """
+        Fingerprint of everything generate_recommendations depends on.
+        
+        Gap order is kept: it breaks ties between gaps of equal priority.
+        """
+        return fingerprint(
+            [
+                (g["skillId"], g["skillName"], g["gapSize"], g["priority"])
+                for g in gaps
+            ],
+            limit,
+            version,
+        )
+    
+    def _collect_recommendations(
+        self,
+        data: "CatalogData",
+        gaps: List[Dict[str, Any]],
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Walk the gaps in priority order and collect up to ``limit`` resources"""
         # Sort gaps by priority
         priority_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
         sorted_gaps = sorted(gaps, key=lambda g: priority_order.get(g["priority"], 4))
@@ -466,67 +683,48 @@ class RecommenderService:
         recommendations = []
         seen_resources = set()
         
+        # Each gap gets its own priority, so merging the per-gap lists (each
+        # already sorted by score) is a plain concatenation in gap order
         for i, gap in enumerate(sorted_gaps):
             skill_name = gap["skillName"].lower().replace(" ", "")
-            gap_size = gap["gapSize"]
+            gap_size = min(max(gap["gapSize"], 0), MAX_GAP_SIZE)
             
-            # Get resources for this skill
-            resources = self._get_resources_for_skill(skill_name)
-            
-            for resource in resources:
-                resource_key = f"{resource['title']}_{resource['provider']}"
-                
+            # Get pre-scored resources for this skill
+            table = data.score_table(self._lookup_skill(data, skill_name))
+            resources, resource_keys = table.resources, table.keys
+            for index in table.rankings[gap_size]:
+                resource_key = resource_keys[index]
                 if resource_key in seen_resources:
                     continue
                 
-                # Score the resource
-                score = self._score_resource(resource, gap_size)
+                resource = resources[index]
+                recommendations.append({
+                    "skillId": gap["skillId"],
+                    "skillName": gap["skillName"],
+                    "resourceType": resource.type,
+                    "title": resource.title,
+                    "description": f"Close your {gap['skillName']} gap with this {resource.type}",
+                    "url": resource.url,
+                    "provider": resource.provider,
+                    "estimatedDuration": resource.duration,
+                    "priority": i + 1,
+                })
+                seen_resources.add(resource_key)
                 
-                if score > 0.3:  # Threshold for relevance
-                    recommendations.append({
-                        "skillId": gap["skillId"],
-                        "skillName": gap["skillName"],
-                        "resourceType": resource["type"],
-                        "title": resource["title"],
-                        "description": f"Close your {gap['skillName']} gap with this {resource['type']}",
-                        "url": resource["url"],
-                        "provider": resource["provider"],
-                        "estimatedDuration": resource["duration"],
-                        "priority": i + 1,
-                        "score": score,
-                    })
-                    seen_resources.add(resource_key)
-        
-        # Sort by priority and score
-        recommendations.sort(key=lambda r: (r["priority"], -r["score"]))
-        
-        # Remove score from output (internal use only)
-        for rec in recommendations:
-            del rec["score"]
+                if len(recommendations) >= limit:
+                    return recommendations
         
-        # Limit to top recommendations
-        return recommendations[:10]
+        return recommendations
     
-    def _get_resources_for_skill(self, skill_name: str) -> List[Dict]:
-        """Get learning resources for a skill, using flexible matching"""
-        # Normalize: lowercase, strip spaces/dots/hyphens
-        normalized = skill_name.lower().replace(" ", "").replace(".", "").replace("-", "")
-        
-        # Exact match on normalized key
-        if normalized in LEARNING_RESOURCES:
-            return LEARNING_RESOURCES[normalized]
-        
-        # Check partial/substring matches both directions
-        for key in LEARNING_RESOURCES:
-            if key == "default":
-                continue
-            if key in normalized or normalized in key:
-                return LEARNING_RESOURCES[key]
-        
-        # Fall back to default
-        return LEARNING_RESOURCES["default"]
+    @timed("_lookup_skill")
+    def _lookup_skill(self, data: "CatalogData", skill_name: str) -> str:
+        """Catalog key for a skill name, using flexible matching"""
+        key = data.skill_index.lookup(skill_name)
+        if key == data.skill_index.fallback:
+            FALLBACKS.inc(("resource",))
+        return key
     
-    def _score_resource(self, resource: Dict, gap_size: int) -> float:
+    def _score_resource(self, resource: Resource, gap_size: int) -> float:
         """
         Score a resource based on gap characteristics.
         
@@ -540,26 +738,26 @@ class RecommenderService:
         # Gap size -> resource type mapping
         if gap_size >= 3:
             # Large gap: prefer comprehensive courses
-            if resource["type"] == "course":
+            if resource.type == "course":
                 score += 0.3
-            elif resource["type"] == "book":
+            elif resource.type == "book":
                 score += 0.2
         elif gap_size == 2:
             # Medium gap: tutorials and projects
-            if resource["type"] in ["tutorial", "project"]:
+            if resource.type in ["tutorial", "project"]:
                 score += 0.3
-            elif resource["type"] == "course":
+            elif resource.type == "course":
                 score += 0.1
         else:
             # Small gap: quick tutorials and docs
-            if resource["type"] in ["tutorial", "documentation"]:
+            if resource.type in ["tutorial", "documentation"]:
                 score += 0.3
-            elif resource["type"] == "video":
+            elif resource.type == "video":
                 score += 0.2
         
         # Level matching bonus
         level_scores = {"beginner": 1, "intermediate": 2, "advanced": 3}
-        resource_level = level_scores.get(resource.get("level", "intermediate"), 2)
+        resource_level = level_scores.get(resource.level or "intermediate", 2)
         
         # Prefer resources that match current level + 1
         if resource_level <= gap_size:
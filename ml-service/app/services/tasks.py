@@ -0,0 +1,43 @@
+"""
+SkillSense AI - Scoring Tasks
+
+Module-level entry points for work dispatched by the scoring executor.
+They are referenced by name when pickled, so they also run in process-pool
+workers, where they use that worker's own service instances.
+"""
+
+from typing import Any, Dict, List
+
+from app.services.predictor import predictor_service
+from app.services.pipeline import pipeline_service
+
+
+def predict_proficiency(user_id: str, responses: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """See PredictorService.predict_proficiency"""
+    return predictor_service.predict_proficiency(user_id, responses)
+
+
+def predict_proficiency_batch(assessments: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Score a batch of assessments, isolating failures to their own item.
+    
+    The batch is scored in one pass; if that raises, items are scored one
+    by one and a failing item gets an ``error`` entry instead of a result.
+    """
+    try:
+        return predictor_service.predict_proficiency_batch(assessments)
+    except Exception:
+        predictions = []
+        for assessment in assessments:
+            try:
+                predictions.append(
+                    predictor_service.predict_proficiency_batch([assessment])[0]
+                )
+            except Exception as e:
+                predictions.append({"error": f"Prediction failed: {str(e)}"})
+        return predictions
+
+
+def run_pipeline(**kwargs: Any) -> Dict[str, Any]:
+    """See PipelineService.run"""
+    return pipeline_service.run(**kwargs)
@@ -0,0 +1,214 @@
+"""
+SkillSense AI - Warm-up
+
+Builds everything the first requests would otherwise pay for, then marks
+the worker ready, so a new pod only receives traffic once it answers at
+steady-state latency.
+
+Components, in order:
+- predictor: scoring weights
+- roles: compiled role matrices, priority/time tables and role id resolution
+- catalog: skill name index and score tables (all of them for the built-in
+  catalog; mapped catalogs build theirs on first use)
+- executor: thread/process pool workers, which load their own data
+- routes: one synthetic request per scoring route, through the ASGI app, so
+  lazily imported modules, route contexts and response models are set up
+
+Data is built in a thread so /health keeps answering meanwhile.
+/health/ready reports 503 until every component is ready. Synthetic
+requests use the user id "warmup" and are counted in /metrics like any
+other request.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+
+COMPONENTS = ("predictor", "roles", "catalog", "executor", "routes")
+
+WARMUP_USER_ID = "warmup"
+
+
+def _warm_predictor():
+    from app.services.predictor import predictor_service
+    predictor_service.initialize()
+
+
+def _warm_roles():
+    from app.services.gap_analyzer import gap_analyzer_service
+    gap_analyzer_service.initialize()
+    data = gap_analyzer_service.data
+    for key in data.compiled.keys:
+        data.resolve_role_key(key)
+
+
+def _warm_catalog():
+    # Small catalogs get every score table here; large ones fill on use
+    from app.services.recommender import recommender_service
+    recommender_service.initialize()
+
+
+def synthetic_requests() -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    (path, body) of one small request per scoring route.
+    
+    Built from the active role data, so the gap and recommendation paths
+    see skills that exist in the roles and catalog.
+    """
+    from app.services.gap_analyzer import gap_analyzer_service
+    
+    compiled = gap_analyzer_service.data.compiled
+    role_key = next((key for key in compiled.keys if key != "default"), "default")
+    role = compiled.roles[role_key]
+    skills = list(zip(role.skill_ids, role.skill_names))[:3]
+    
+    responses = [
+        {"questionId": f"q{i}", "skillId": skill_id, "answer": answer, "timeSpent": 30}
+        for i, ((skill_id, _), answer) in enumerate(zip(skills * 2, ["a", "3", "b", "4", "c", "2"]))
+    ]
+    now = datetime.now(timezone.utc).isoformat()
+    profile = {
+        "userId": WARMUP_USER_ID,
+        "skills": [
+            {
+                "skillId": skill_id,
+                "skillName": skill_name,
+                "proficiencyLevel": 1,
+                "confidence": 0.8,
+                "assessedAt": now,
+                "source": "assessment",
+            }
+            for skill_id, skill_name in skills
+        ],
+        "overallScore": 20.0,
+        "lastUpdated": now,
+    }
+    gaps = [
+        {"skillId": skill_id, "skillName": skill_name, "gapSize": 2, "priority": "high"}
+        for skill_id, skill_name in skills
+    ]
+    
+    return [
+        ("/api/v1/predict/proficiency", {
+            "userId": WARMUP_USER_ID, "assessmentResponses": responses,
+        }),
+        ("/api/v1/predict/proficiency:batch", {
+            "requests": [{"userId": WARMUP_USER_ID, "assessmentResponses": responses}],
+        }),
+        ("/api/v1/analyze/gaps", {
+            "userId": WARMUP_USER_ID, "skillProfile": profile, "targetRoleId": role_key,
+        }),
+        ("/api/v1/analyze/roles", {"skillProfile": profile, "topK": 3}),
+        ("/api/v1/recommend", {"userId": WARMUP_USER_ID, "gaps": gaps}),
+        ("/api/v1/pipeline", {
+            "userId": WARMUP_USER_ID,
+            "assessmentResponses": responses,
+            "targetRoleId": role_key,
+        }),
+    ]
+
+
+class WarmupService:
+    """Runs the warm-up once and tracks readiness per component"""
+    
+    def __init__(self):
+        self.state = "pending"  # pending, running, ready or failed
+        self.seconds: Optional[float] = None
+        self.components: Dict[str, Dict[str, Any]] = {
+            name: {"ready": False, "seconds": None, "error": None} for name in COMPONENTS
+        }
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+    
+    def start(self, app) -> asyncio.Task:
+        """Run the warm-up in the background on the running event loop"""
+        self._task = asyncio.ensure_future(self.run(app))
+        return self._task
+    
+    def cancel(self):
+        """Stop a warm-up that is still running (on shutdown)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+    
+    async def run(self, app, synthetic: bool = True) -> bool:
+        """
+        Warm up every component in order, stopping at the first failure.
+        
+        Args:
+            app: ASGI app the synthetic requests go through
+            synthetic: Also start pool workers and send synthetic requests;
+                without it, only data structures are built
+        
+        Returns:
+            True if the worker is ready
+        """
+        from app.services.executor import scoring_executor
+        
+        steps = {
+            "predictor": lambda: asyncio.to_thread(_warm_predictor),
+            "roles": lambda: asyncio.to_thread(_warm_roles),
+            "catalog": lambda: asyncio.to_thread(_warm_catalog),
+            "executor": scoring_executor.warm_up,
+            "routes": lambda: self._send_requests(app),
+        }
+        if not synthetic:
+            for name in ("executor", "routes"):
+                steps[name] = None
+        
+        self.state = "running"
+        started = time.perf_counter()
+        for name, step in steps.items():
+            component = self.components[name]
+            if step is None:
+                component["ready"] = True
+                continue
+            step_started = time.perf_counter()
+            try:
+                await step()
+            except Exception as e:
+                component["error"] = str(e) or type(e).__name__
+                self.state = "failed"
+                print(f"✗ Warm-up failed at {name}: {component['error']}")
+                return False
+            component["ready"] = True
+            component["seconds"] = round(time.perf_counter() - step_started, 4)
+        
+        self.seconds = round(time.perf_counter() - started, 4)
+        self.state = "ready"
+        timings = ", ".join(
+            f"{name} {component['seconds'] * 1000:.0f}ms"
+            for name, component in self.components.items()
+            if component["seconds"] is not None
+        )
+        print(f"✓ Warm-up complete in {self.seconds * 1000:.0f}ms ({timings})")
+        return True
+    
+    async def _send_requests(self, app):
+        import httpx
+        
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://warmup"
+        ) as client:
+            for path, body in synthetic_requests():
+                response = await client.post(path, json=body)
+                if response.status_code != 200:
+                    raise RuntimeError(
+                        f"POST {path} answered {response.status_code}: {response.text[:200]}"
+                    )
+    
+    def status(self) -> Dict[str, Any]:
+        """Overall state, total seconds and per-component readiness"""
+        return {
+            "state": self.state,
+            "seconds": self.seconds,
+            "components": {name: dict(component) for name, component in self.components.items()},
+        }
+
+
+# Singleton instance
+warmup_service = WarmupService()
@@ -5,11 +5,13 @@ SkillSense AI - Utils Package
 from app.utils.scoring import (
     calculate_weighted_score,
     calibrate_self_assessment,
+    calibrate_self_assessments,
     normalize_time_factor,
 )
 
 __all__ = [
     "calculate_weighted_score",
     "calibrate_self_assessment", 
+    "calibrate_self_assessments",
     "normalize_time_factor",
 ]
@@ -0,0 +1,93 @@
+"""
+SkillSense AI - Micro-Batching
+
+Coalesces concurrent single-item calls into one batched call. Items are
+collected for up to ``window`` seconds or ``max_items`` items, whichever
+comes first, processed together, and each caller gets its own result.
+The window caps the latency added to any request.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """Collects items from concurrent coroutines and processes them in batches"""
+    
+    def __init__(
+        self,
+        process: Callable[[List[Any]], Awaitable[List[Any]]],
+        window: float,
+        max_items: int
+    ):
+        """
+        Args:
+            process: Coroutine function mapping a list of items to one
+                result per item, in order
+            window: Longest time (seconds) an item waits for others
+            max_items: Batch size that triggers an immediate flush
+        """
+        self.process = process
+        self.window = window
+        self.max_items = max_items
+        
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+        
+        self.batches = 0
+        self.items = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0 and self.max_items > 1
+    
+    async def submit(self, item: Any) -> Any:
+        """
+        Add an item to the current batch and wait for its result.
+        
+        Raises:
+            Exception: Whatever ``process`` raised for the batch
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        
+        return await future
+    
+    def _flush(self):
+        """Start processing everything collected so far"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        self.batches += 1
+        self.items += len(batch)
+        
+        # Keep a reference so the task is not garbage collected mid-run
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+    
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            results = await self.process([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        # Callers that gave up (e.g. disconnected) have cancelled futures
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
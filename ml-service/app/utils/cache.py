@@ -0,0 +1,594 @@
+"""
+SkillSense AI - Result Cache
+
+Pluggable caches for service results:
+- LRUCache: in-process, per worker
+- SQLiteCache: a SQLite file shared by all workers on a host
+- RedisCache: any server speaking the Redis protocol, shared across hosts
+
+Keys include the role/catalog data version where results depend on it,
+so a data reload makes stale entries unreachable; they then age out
+through TTL or eviction.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Canonical hash of JSON-serializable parts.
+    
+    Equal inputs always give the same key, independent of process or
+    dict ordering (keys are sorted).
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CacheBackend(ABC):
+    """
+    Interface of a result cache.
+    
+    Backends never raise from get/set: a failing shared cache degrades to
+    misses (counted in ``errors``) instead of failing requests. Cached
+    values are shared between callers and must be treated as read-only.
+    get_many/set_many default to one call per key; shared backends
+    override them to use one round trip.
+    """
+    
+    backend = "none"
+    
+    def __init__(self, maxsize: int, ttl: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.errors = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None on a miss"""
+    
+    @abstractmethod
+    def set(self, key: str, value: Any):
+        """Store a value"""
+    
+    @abstractmethod
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+    
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """Get cached values in key order, None for each miss"""
+        return [self.get(key) for key in keys]
+    
+    def set_many(self, items: Sequence[Tuple[str, Any]]):
+        """Store (key, value) pairs"""
+        for key, value in items:
+            self.set(key, value)
+    
+    def size(self) -> int:
+        """Number of stored entries (-1 if unknown)"""
+        return -1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "size": self.size(),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class LRUCache(CacheBackend):
+    """
+    Least-recently-used in-process cache with an optional time-to-live.
+    
+    Entries beyond ``maxsize`` evict the least recently used one; entries
+    older than ``ttl`` seconds are treated as misses and dropped.
+    """
+    
+    backend = "memory"
+    
+    def __init__(self, maxsize: int, ttl: float = 0.0):
+        super().__init__(maxsize, ttl)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def size(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            value, expires_at = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        if not self.enabled:
+            return
+        
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else 0.0
+        
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(CacheBackend):
+    """
+    Cache in a SQLite file shared by every worker process on a host.
+    
+    Values are stored as JSON. Each process keeps its own connection (WAL
+    mode lets readers and one writer work concurrently). Reads never
+    write: hits are remembered in memory and their access times are
+    written with the next write, and expired entries are deleted when the
+    cache is trimmed. The oldest entries are trimmed back to ``maxsize``
+    every ``trim_interval`` writes, so writes stay O(1) amortized.
+    ``sqlite3`` is imported on use, so workers on the memory backend do
+    not load it.
+    """
+    
+    # Bound on bound parameters per statement (SQLite's old default is 999)
+    _QUERY_BATCH = 500
+    
+    backend = "sqlite"
+    
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        maxsize: int,
+        ttl: float = 0.0,
+        trim_interval: int = 100
+    ):
+        super().__init__(maxsize, ttl)
+        self.path = path
+        self.namespace = namespace
+        self.trim_interval = trim_interval
+        self._writes = 0
+        # Keys hit since the last write -> access time
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._pid = None
+        self._conn: Optional["sqlite3.Connection"] = None
+    
+    def _connection(self) -> "sqlite3.Connection":
+        import sqlite3
+        
+        # Reconnect after fork: SQLite connections must not cross processes
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=1.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_recency"
+                " ON cache (namespace, accessed_at)"
+            )
+            conn.commit()
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+    
+    def get(self, key: str) -> Optional[Any]:
+        return self.get_many([key])[0]
+    
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        import sqlite3
+        
+        now = time.time()
+        found: Dict[str, Tuple[str, float]] = {}
+        try:
+            with self._lock:
+                conn = self._connection()
+                for start in range(0, len(keys), self._QUERY_BATCH):
+                    batch = keys[start:start + self._QUERY_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    found.update(
+                        (key, (value, expires_at))
+                        for key, value, expires_at in conn.execute(
+                            "SELECT key, value, expires_at FROM cache"
+                            f" WHERE namespace = ? AND key IN ({placeholders})",
+                            (self.namespace, *batch),
+                        )
+                    )
+        except sqlite3.Error:
+            self.errors += 1
+            found = {}
+        
+        results: List[Optional[Any]] = []
+        for key in keys:
+            row = found.get(key)
+            if row is not None and row[1] and row[1] <= now:
+                # Left for _trim to delete, so reads stay read-only
+                self.expirations += 1
+                row = None
+            
+            if row is None:
+                self.misses += 1
+                results.append(None)
+                continue
+            
+            self.hits += 1
+            if len(self._touched) < max(self.maxsize, 1):
+                self._touched[key] = now
+            results.append(json.loads(row[0]))
+        return results
+    
+    def set(self, key: str, value: Any):
+        self.set_many([(key, value)])
+    
+    def set_many(self, items: Sequence[Tuple[str, Any]]):
+        if not self.enabled or not items:
+            return
+        
+        import sqlite3
+        
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl > 0 else 0.0
+        rows = [
+            (self.namespace, key, json.dumps(value, separators=(",", ":")), expires_at, now)
+            for key, value in items
+        ]
+        
+        try:
+            with self._lock:
+                conn = self._connection()
+                if self._touched:
+                    conn.executemany(
+                        "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                        [(at, self.namespace, key) for key, at in self._touched.items()],
+                    )
+                    self._touched.clear()
+                conn.executemany("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)", rows)
+                
+                writes = self._writes + len(rows)
+                if writes // self.trim_interval != self._writes // self.trim_interval:
+                    self._trim(conn, now)
+                self._writes = writes
+                conn.commit()
+        except sqlite3.Error:
+            self.errors += 1
+    
+    def _trim(self, conn: "sqlite3.Connection", now: float):
+        """Delete expired entries, then the least recently used ones beyond maxsize"""
+        conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND expires_at > 0 AND expires_at <= ?",
+            (self.namespace, now),
+        )
+        cursor = conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache WHERE namespace = ?"
+            " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.maxsize),
+        )
+        self.evictions += max(cursor.rowcount, 0)
+    
+    def clear(self):
+        import sqlite3
+        
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+                conn.commit()
+        except sqlite3.Error:
+            self.errors += 1
+    
+    def size(self) -> int:
+        import sqlite3
+        
+        try:
+            with self._lock:
+                return self._connection().execute(
+                    "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+                ).fetchone()[0]
+        except sqlite3.Error:
+            self.errors += 1
+            return -1
+
+
+class RedisError(Exception):
+    """Error reply or protocol failure from a Redis-protocol server"""
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache on a server speaking the Redis protocol (RESP).
+    
+    Implements just the commands it needs (GET, MGET, SET with PX,
+    DBSIZE, SCAN, DEL) on a plain socket, so no client library is
+    required. Batches use one MGET or one pipelined round trip. Entry
+    limits are left to the server's maxmemory policy; ``maxsize`` only
+    switches the cache on or off. Connection failures count as misses.
+    
+    ``size()`` is the server's DBSIZE, which counts every key in the
+    database: give the cache a database of its own (the db number in
+    cache_redis_url).
+    """
+    
+    # Keys per MGET / commands per pipelined write
+    _BATCH = 500
+    
+    backend = "redis"
+    
+    def __init__(
+        self,
+        url: str,
+        namespace: str,
+        maxsize: int,
+        ttl: float = 0.0,
+        timeout: float = 0.25
+    ):
+        super().__init__(maxsize, ttl)
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.prefix = f"skillsense:{namespace}:"
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._pid = None
+    
+    def _connect(self):
+        if self._sock is not None and self._pid == os.getpid():
+            return
+        
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock, self._reader, self._pid = sock, sock.makefile("rb"), os.getpid()
+        
+        if self.password:
+            self._send("AUTH", self.password)
+        if self.db:
+            self._send("SELECT", str(self.db))
+    
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = self._reader = None
+    
+    @staticmethod
+    def _encode(args: Sequence[str]) -> bytes:
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg.encode("utf-8")
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b"".join(parts)
+    
+    def _send(self, *args: str) -> Any:
+        self._sock.sendall(self._encode(args))
+        return self._read_reply()
+    
+    def _send_pipeline(self, commands: Sequence[Sequence[str]]) -> List[Any]:
+        self._sock.sendall(b"".join(self._encode(args) for args in commands))
+        replies, error = [], None
+        # Read every reply even after an error reply, to keep the stream in sync
+        for _ in commands:
+            try:
+                replies.append(self._read_reply())
+            except RedisError as e:
+                # Error replies only; a dropped connection raises ConnectionError
+                error = error or e
+        if error is not None:
+            raise error
+        return replies
+    
+    def _read_reply(self) -> Any:
+        line = self._reader.readline()
+        if not line:
+            # An OSError, so pipeline() reconnects (e.g. idle connection closed by the server)
+            raise ConnectionError("Connection closed")
+        
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            raise RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2].decode("utf-8")
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+    
+    def command(self, *args: str) -> Any:
+        """Run one command, reconnecting once if the connection dropped"""
+        return self.pipeline([args])[0]
+    
+    def pipeline(self, commands: Sequence[Sequence[str]]) -> List[Any]:
+        """
+        Run commands in one round trip, reconnecting once if the connection dropped.
+        
+        Raises:
+            RedisError: On an error reply, or if the retry fails too
+        """
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    self._connect()
+                    return self._send_pipeline(commands)
+                except (OSError, RedisError) as e:
+                    self._disconnect()
+                    if attempt or isinstance(e, RedisError):
+                        raise RedisError(str(e)) from e
+    
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            payload = self.command("GET", self.prefix + key)
+        except RedisError:
+            self.errors += 1
+            payload = None
+        
+        if payload is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return json.loads(payload)
+    
+    def get_many(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        try:
+            payloads = self.pipeline([
+                ("MGET", *(self.prefix + key for key in keys[start:start + self._BATCH]))
+                for start in range(0, len(keys), self._BATCH)
+            ]) if keys else []
+            payloads = [payload for batch in payloads for payload in batch]
+        except RedisError:
+            self.errors += 1
+            payloads = [None] * len(keys)
+        
+        results: List[Optional[Any]] = []
+        for payload in payloads:
+            if payload is None:
+                self.misses += 1
+                results.append(None)
+            else:
+                self.hits += 1
+                results.append(json.loads(payload))
+        return results
+    
+    def _set_command(self, key: str, value: Any) -> List[str]:
+        args = ["SET", self.prefix + key, json.dumps(value, separators=(",", ":"))]
+        if self.ttl > 0:
+            args += ["PX", str(int(self.ttl * 1000))]
+        return args
+    
+    def set(self, key: str, value: Any):
+        if not self.enabled:
+            return
+        
+        try:
+            self.command(*self._set_command(key, value))
+        except RedisError:
+            self.errors += 1
+    
+    def set_many(self, items: Sequence[Tuple[str, Any]]):
+        if not self.enabled:
+            return
+        
+        commands = [self._set_command(key, value) for key, value in items]
+        for start in range(0, len(commands), self._BATCH):
+            try:
+                self.pipeline(commands[start:start + self._BATCH])
+            except RedisError:
+                self.errors += 1
+    
+    def _keys(self) -> List[str]:
+        keys, cursor = [], "0"
+        while True:
+            cursor, batch = self.command("SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", "1000")
+            keys.extend(batch)
+            if cursor == "0":
+                return keys
+    
+    def clear(self):
+        try:
+            keys = self._keys()
+            for start in range(0, len(keys), 500):
+                self.command("DEL", *keys[start:start + 500])
+        except RedisError:
+            self.errors += 1
+    
+    def size(self) -> int:
+        try:
+            return self.command("DBSIZE")
+        except RedisError:
+            self.errors += 1
+            return -1
+
+
+def create_cache(namespace: str, maxsize: int, ttl: float) -> CacheBackend:
+    """
+    Create the cache backend selected by settings.cache_backend.
+    
+    Args:
+        namespace: Keeps services apart in shared backends
+        maxsize: Maximum number of entries (0 disables the cache)
+        ttl: Entry lifetime in seconds (0 = no expiry)
+    
+    Returns:
+        A memory, sqlite or redis cache backend
+    """
+    backend = settings.cache_backend
+    
+    if backend == "memory":
+        return LRUCache(maxsize, ttl)
+    if backend == "sqlite":
+        path = settings.cache_sqlite_path or os.path.join(settings.model_path, "cache.sqlite3")
+        return SQLiteCache(path, namespace, maxsize, ttl)
+    if backend == "redis":
+        return RedisCache(settings.cache_redis_url, namespace, maxsize, ttl)
+    
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -0,0 +1,351 @@
+"""
+SkillSense AI - Metrics
+
+Minimal in-process counters and histograms rendered in the Prometheus text
+exposition format, so /metrics needs no client library or collector.
+
+Each metric keeps plain per-label-set totals behind one lock; recording is
+a few dictionary operations, cheap enough to leave on in production.
+Metrics are per process: with several uvicorn workers each scrape sees the
+worker that answered it, and work done in process-pool workers is not
+included.
+"""
+
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+from app.utils.profiler import profiler
+
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+SIZE_BUCKETS = tuple(256 * 4 ** i for i in range(10))  # 256 B .. 64 MiB
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+    
+    def value(self, labels: Tuple[str, ...] = ()) -> float:
+        return self._values.get(labels, 0.0)
+    
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Histogram with fixed buckets and optional labels"""
+    
+    kind = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last = +Inf), sum, count]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, labels: Tuple[str, ...] = ()):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+    
+    def count(self, labels: Tuple[str, ...] = ()) -> int:
+        entry = self._values.get(labels)
+        return entry[2] if entry else 0
+    
+    def sum(self, labels: Tuple[str, ...] = ()) -> float:
+        entry = self._values.get(labels)
+        return entry[1] if entry else 0.0
+    
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [(labels, list(e[0]), e[1], e[2]) for labels, e in self._values.items()]
+        for labels, counts, total, count in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                label_text = _format_labels(self.labelnames, labels, f'le="{le}"')
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {count}"
+
+
+class Registry:
+    """Set of metrics plus collectors that report values at scrape time"""
+    
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[Tuple, float]]]]] = []
+    
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+    
+    def register_collector(self, collector: Callable):
+        """
+        Add a callable yielding (name, kind, help, {label pairs: value}).
+        
+        Used for values that already live elsewhere (e.g. cache counters),
+        so they cost nothing until scraped.
+        """
+        self._collectors.append(collector)
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        
+        for collector in self._collectors:
+            for name, kind, documentation, values in collector():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for label_pairs, value in values.items():
+                    names = [n for n, _ in label_pairs]
+                    label_values = [v for _, v in label_pairs]
+                    lines.append(
+                        f"{name}{_format_labels(names, label_values)} {_format_value(value)}"
+                    )
+        
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+metrics = Registry()
+
+REQUESTS = metrics.counter(
+    "skillsense_requests_total", "HTTP requests by route and status", ("route", "status")
+)
+REQUEST_STAGE_SECONDS = metrics.histogram(
+    "skillsense_request_stage_seconds",
+    "Time per request stage: parse (body decoding and validation), "
+    "endpoint (handler incl. service calls) and serialize (response rendering)",
+    ("route", "stage"),
+)
+SERVICE_SECONDS = metrics.histogram(
+    "skillsense_service_seconds", "Time spent in service methods", ("method",)
+)
+REQUEST_BYTES = metrics.histogram(
+    "skillsense_request_bytes", "Request body size", ("route",), SIZE_BUCKETS
+)
+RESPONSE_BYTES = metrics.histogram(
+    "skillsense_response_bytes", "Response body size", ("route",), SIZE_BUCKETS
+)
+FALLBACKS = metrics.counter(
+    "skillsense_fallbacks_total",
+    "Lookups that fell back to default data (role requirements or resources)",
+    ("kind",),
+)
+
+
+def timed(method: str) -> Callable:
+    """Decorator recording a function's duration in SERVICE_SECONDS"""
+    def decorate(func: Callable) -> Callable:
+        if not settings.metrics_enabled:
+            return func
+        
+        labels = (method,)
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                SERVICE_SECONDS.observe(perf_counter() - start, labels)
+        
+        return wrapper
+    return decorate
+
+
+# [request start, endpoint start, endpoint end] of the current request
+_request_marks: ContextVar[Optional[List[float]]] = ContextVar("request_marks", default=None)
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    """Wrap an async endpoint so InstrumentedRoute can split parse/endpoint/serialize"""
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        marks = _request_marks.get()
+        if marks is not None:
+            marks[1] = perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            if marks is not None:
+                marks[2] = perf_counter()
+    
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def _counting_receive(receive: Callable, labels: Tuple[str, ...]) -> Callable:
+    """
+    Wrap an ASGI receive to record the request body size in REQUEST_BYTES.
+    
+    Bytes are counted as the body is read, so chunked uploads without a
+    content-length (e.g. NDJSON streams) are measured too; the size is
+    recorded once the last chunk arrives, which for streaming routes is
+    after the handler has returned.
+    """
+    received = 0
+    
+    async def counting_receive():
+        nonlocal received
+        message = await receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                REQUEST_BYTES.observe(received, labels)
+        return message
+    
+    return counting_receive
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    Route that records request stage timings, status and payload sizes,
+    and lets the sampling profiler sample its requests.
+    
+    Parse covers body decoding and request-model validation, endpoint the
+    handler itself, and serialize response-model validation and rendering.
+    """
+    
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if settings.metrics_enabled and not getattr(endpoint, "__instrumented__", False):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+    
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+        
+        async def handler(request: Request) -> Response:
+            if not profiler.active:
+                return await route_handler(request)
+            with profiler.sample_request():
+                return await route_handler(request)
+        
+        if not settings.metrics_enabled:
+            return handler
+        
+        path = self.path
+        labels: Dict[str, Tuple[str, ...]] = {}
+        
+        async def instrumented_handler(request: Request) -> Response:
+            if not labels:
+                # Routers are included lazily, so the mount prefix is only
+                # known from a request; templated paths keep their template
+                route = request.scope["path"] if "{" not in path else path
+                labels.update(
+                    route=(route,),
+                    parse=(route, "parse"),
+                    endpoint=(route, "endpoint"),
+                    serialize=(route, "serialize"),
+                )
+            
+            request = Request(request.scope, _counting_receive(request.receive, labels["route"]))
+            marks = [perf_counter(), 0.0, 0.0]
+            token = _request_marks.set(marks)
+            response = None
+            status = 500
+            try:
+                response = await handler(request)
+                status = response.status_code
+                return response
+            except HTTPException as e:
+                status = e.status_code
+                raise
+            except RequestValidationError:
+                status = 422
+                raise
+            finally:
+                _request_marks.reset(token)
+                end = perf_counter()
+                
+                REQUESTS.inc(labels["route"] + (str(status),))
+                if marks[1]:
+                    REQUEST_STAGE_SECONDS.observe(marks[1] - marks[0], labels["parse"])
+                if marks[2]:
+                    REQUEST_STAGE_SECONDS.observe(marks[2] - marks[1], labels["endpoint"])
+                    REQUEST_STAGE_SECONDS.observe(end - marks[2], labels["serialize"])
+                
+                if response is not None:
+                    body = getattr(response, "body", None)
+                    if body is not None:
+                        RESPONSE_BYTES.observe(len(body), labels["route"])
+        
+        return instrumented_handler
@@ -0,0 +1,243 @@
+"""
+SkillSense AI - Sampling Profiler
+
+Wall-clock sampling profiler for diagnosing latency under real traffic.
+
+While a profiling session is active, a fraction of requests to the
+instrumented API routes is marked as sampled. A background thread
+periodically captures the stacks of the threads serving sampled requests
+(plus scoring pool threads running app code) and counts identical stacks
+in memory. Results are served as collapsed stacks (flamegraph.pl,
+speedscope) or speedscope JSON.
+
+Overhead is bounded by the sampling interval and the maximum session
+length and sample count; a session switches itself off when either limit
+is reached. Stacks are captured per thread, so concurrent requests on the
+same event loop can contribute samples to each other.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+
+
+Frame = Tuple[str, str, int]  # (function, file, first line)
+
+MAX_STACK_DEPTH = 128
+
+
+def _frame_key(frame) -> Frame:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return name, code.co_filename, code.co_firstlineno
+
+
+def _is_app_frame(key: Frame) -> bool:
+    return f"{os.sep}app{os.sep}" in key[1]
+
+
+class SamplingProfiler:
+    """In-memory stack sampler with an automatic off switch"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._targets: Dict[int, int] = {}  # thread id -> sampled requests in flight
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        
+        self.active = False
+        self.sample_rate = 0.0
+        self.interval = 0.005
+        self.max_samples = 0
+        self.started_at = 0.0
+        self.expires_at = 0.0
+        self.stopped_reason: Optional[str] = None
+        
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.sampled_requests = 0
+    
+    def start(
+        self,
+        sample_rate: float,
+        duration: float,
+        interval: float = 0.005,
+        max_samples: Optional[int] = None
+    ):
+        """
+        Start a profiling session, discarding the previous results.
+        
+        Args:
+            sample_rate: Fraction of requests to sample (0-1]
+            duration: Seconds until the session switches itself off
+            interval: Seconds between stack samples
+            max_samples: Stop after this many stack samples
+        """
+        self.stop()
+        
+        with self._lock:
+            self.stacks = Counter()
+            self.samples = 0
+            self.sampled_requests = 0
+            self.sample_rate = sample_rate
+            self.interval = interval
+            self.max_samples = max_samples or settings.profiler_max_samples
+            self.started_at = time.time()
+            self.expires_at = time.monotonic() + duration
+            self.stopped_reason = None
+            self.active = True
+        
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self, reason: str = "stopped"):
+        """End the session; collected stacks stay available"""
+        thread = self._thread
+        if thread is None:
+            return
+        
+        self._finish(reason)
+        self._stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+        self._thread = None
+    
+    def _finish(self, reason: str):
+        if self.active:
+            self.active = False
+            self.stopped_reason = reason
+    
+    @contextmanager
+    def sample_request(self) -> Iterator[None]:
+        """Mark the current thread as serving a sampled request (if chosen)"""
+        if not self.active or random.random() >= self.sample_rate:
+            yield
+            return
+        
+        ident = threading.get_ident()
+        with self._lock:
+            self._targets[ident] = self._targets.get(ident, 0) + 1
+            self.sampled_requests += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                remaining = self._targets[ident] - 1
+                if remaining:
+                    self._targets[ident] = remaining
+                else:
+                    del self._targets[ident]
+    
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            if time.monotonic() >= self.expires_at:
+                self._finish("duration elapsed")
+                return
+            if self.samples >= self.max_samples:
+                self._finish("sample limit reached")
+                return
+            
+            with self._lock:
+                targets = set(self._targets)
+            if not targets:
+                continue
+            
+            pool_threads = {
+                thread.ident for thread in threading.enumerate()
+                if thread.name.startswith("scoring")
+            }
+            for ident, frame in sys._current_frames().items():
+                if ident == own or (ident not in targets and ident not in pool_threads):
+                    continue
+                stack = self._collapse(frame)
+                # Idle pool threads only show executor internals
+                if ident not in targets and not any(_is_app_frame(f) for f in stack):
+                    continue
+                with self._lock:
+                    self.stacks[stack] += 1
+                    self.samples += 1
+    
+    def _collapse(self, frame) -> Tuple[Frame, ...]:
+        """Stack of a frame as frame keys, root first"""
+        keys: List[Frame] = []
+        while frame is not None and len(keys) < MAX_STACK_DEPTH:
+            keys.append(_frame_key(frame))
+            frame = frame.f_back
+        keys.reverse()
+        return tuple(keys)
+    
+    def status(self) -> Dict[str, Any]:
+        """Session state and counters"""
+        remaining = max(0.0, self.expires_at - time.monotonic()) if self.active else 0.0
+        return {
+            "active": self.active,
+            "sampleRate": self.sample_rate,
+            "intervalMs": self.interval * 1000,
+            "startedAt": self.started_at or None,
+            "remainingSeconds": round(remaining, 1),
+            "stoppedReason": self.stopped_reason,
+            "sampledRequests": self.sampled_requests,
+            "samples": self.samples,
+            "maxSamples": self.max_samples,
+            "uniqueStacks": len(self.stacks),
+        }
+    
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format: ``root;...;leaf count`` per line"""
+        with self._lock:
+            stacks = self.stacks.most_common()
+        lines = [
+            ";".join(f"{name} ({os.path.basename(path)}:{line})" for name, path, line in stack)
+            + f" {count}"
+            for stack, count in stacks
+        ]
+        return "\n".join(lines) + ("\n" if lines else "")
+    
+    def speedscope(self) -> Dict[str, Any]:
+        """Stacks as a speedscope "sampled" profile, weighted in milliseconds"""
+        with self._lock:
+            stacks = self.stacks.most_common()
+        
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[Frame, int] = {}
+        samples, weights = [], []
+        weight = round(self.interval * 1000, 3)
+        
+        for stack, count in stacks:
+            indices = []
+            for key in stack:
+                if key not in frame_index:
+                    frame_index[key] = len(frames)
+                    frames.append({"name": key[0], "file": key[1], "line": key[2]})
+                indices.append(frame_index[key])
+            samples.append(indices)
+            weights.append(count * weight)
+        
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "SkillSense ML Service",
+            "exporter": "skillsense-ml-service",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": "Sampled requests",
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": sum(weights),
+                "samples": samples,
+                "weights": weights,
+            }],
+        }
+
+
+# Process-wide profiler
+profiler = SamplingProfiler()
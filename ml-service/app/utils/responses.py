@@ -0,0 +1,60 @@
+"""
+SkillSense AI - Fast JSON Responses
+
+Service results already have the exact shape of their response models, so
+re-validating them only costs CPU. With ``settings.fast_responses`` routes
+hand such trusted output straight to a JSON encoder (orjson when installed,
+else the standard library) and skip response-model validation. Routes keep
+their ``response_model``, so the OpenAPI schemas are unchanged.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON (NumPy scalars and arrays allowed)"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+    
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=lambda value: value.tolist(),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when available"""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def trusted_response(content: Any) -> Any:
+    """
+    Return service output that already matches the route's response model.
+    
+    With fast responses enabled the content is serialized as is; otherwise
+    it is returned for FastAPI to validate against the response model.
+    
+    Args:
+        content: Dicts/lists in the exact response model shape
+    
+    Returns:
+        A FastJSONResponse, or the content unchanged
+    """
+    if settings.fast_responses:
+        return FastJSONResponse(content)
+    return content
@@ -66,6 +66,28 @@ def calibrate_self_assessment(
     return max(0.0, min(1.0, calibrated))
 
 
+def calibrate_self_assessments(
+    self_ratings: np.ndarray,
+    objective_scores: np.ndarray,
+    calibration_factor: float = 0.3
+) -> np.ndarray:
+    """
+    Vectorized form of calibrate_self_assessment.
+    
+    Args:
+        self_ratings: Self-reported ratings (0-1)
+        objective_scores: Objective test scores (0-1)
+        calibration_factor: How much to adjust (0-1)
+        
+    Returns:
+        Calibrated self-ratings (0-1)
+    """
+    difference = objective_scores - self_ratings
+    adjustment = difference * calibration_factor
+    
+    return np.clip(self_ratings + adjustment, 0.0, 1.0)
+
+
 def normalize_time_factor(
     time_spent: int,
     expected_time: int = 60,
@@ -0,0 +1,89 @@
+"""
+SkillSense AI - Skill Name Index
+
+Resolves free-form skill names to catalog keys without scanning the catalog.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+
+def normalize_skill_name(name: str) -> str:
+    """Lowercase a skill name and strip spaces, dots and hyphens"""
+    return name.lower().replace(" ", "").replace(".", "").replace("-", "")
+
+
+class SkillNameIndex:
+    """
+    Inverted index from skill names to catalog keys.
+    
+    Resolution order for a normalized name:
+    1. Exact key match
+    2. Alias match
+    3. Substring match in either direction; when several keys match, the
+       one that comes first in catalog order wins
+    4. The fallback key
+    
+    Step 3 uses two tables built once: the keys themselves (for keys
+    contained in the name, probed with every substring of the name of a
+    length some key has) and every substring of every key (for names
+    contained in a key). A lookup therefore costs O(len(name) * distinct
+    key lengths) instead of O(number of keys), and results are memoized.
+    """
+    
+    def __init__(
+        self,
+        keys: Iterable[str],
+        aliases: Optional[Dict[str, str]] = None,
+        fallback: str = "default",
+        cache_size: int = 4096,
+    ):
+        self.fallback = fallback
+        
+        # Catalog order decides ties between substring matches
+        self._rank: Dict[str, int] = {}
+        for key in keys:
+            self._rank.setdefault(key, len(self._rank))
+        
+        self._aliases = {
+            normalize_skill_name(alias): key
+            for alias, key in (aliases or {}).items()
+            if key in self._rank
+        }
+        
+        searchable = [key for key in self._rank if key != fallback]
+        self._key_lengths = sorted({len(key) for key in searchable})
+        self._substring_owner: Dict[str, str] = {}
+        for key in searchable:
+            for start in range(len(key) + 1):
+                for end in range(start, len(key) + 1):
+                    self._substring_owner.setdefault(key[start:end], key)
+        
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+    
+    def _resolve(self, normalized: str) -> str:
+        """Resolve an already-normalized skill name to a catalog key"""
+        if normalized in self._rank:
+            return normalized
+        
+        if normalized in self._aliases:
+            return self._aliases[normalized]
+        
+        best: Optional[str] = self._substring_owner.get(normalized)
+        
+        # Keys contained in the name
+        for length in self._key_lengths:
+            if length > len(normalized):
+                break
+            for start in range(len(normalized) - length + 1):
+                candidate = normalized[start:start + length]
+                if candidate in self._rank and candidate != self.fallback and (
+                    best is None or self._rank[candidate] < self._rank[best]
+                ):
+                    best = candidate
+        
+        return best if best is not None else self.fallback
+    
+    def lookup(self, name: str) -> str:
+        """Resolve a raw skill name to a catalog key"""
+        return self.resolve(normalize_skill_name(name))
@@ -0,0 +1,96 @@
+"""
+SkillSense AI - Streaming Utilities
+
+Helpers for endpoints that read and write newline-delimited JSON (NDJSON).
+"""
+
+from typing import AsyncIterable, AsyncIterator, List, Tuple
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+
+class LineTooLong(ValueError):
+    """Raised when an NDJSON line exceeds the allowed length"""
+    
+    def __init__(self, line: int, max_line_bytes: int):
+        super().__init__(f"NDJSON line exceeds {max_line_bytes} bytes")
+        self.line = line
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes],
+    max_line_bytes: int
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Split a stream of byte chunks into NDJSON lines.
+    
+    Only the chunks of one partial line are held at a time (and joined
+    once, when the line ends), so memory stays bounded by
+    ``max_line_bytes`` regardless of the total body size. Blank lines are
+    skipped but still counted, so line numbers match the client's file.
+    
+    Args:
+        chunks: Raw request body chunks
+        max_line_bytes: Maximum allowed length of a single line
+    
+    Yields:
+        (1-based line number, line without its trailing newline) for each
+        non-empty line
+    
+    Raises:
+        LineTooLong: If a line exceeds max_line_bytes
+    """
+    pending: List[bytes] = []
+    pending_bytes = 0
+    number = 0
+    
+    async for chunk in chunks:
+        start = 0
+        end = chunk.find(b"\n")
+        while end >= 0:
+            number += 1
+            line = chunk[start:end]
+            if pending:
+                pending.append(line)
+                line = b"".join(pending)
+                pending, pending_bytes = [], 0
+            
+            if len(line) > max_line_bytes:
+                raise LineTooLong(number, max_line_bytes)
+            if line.strip():
+                yield number, line
+            
+            start = end + 1
+            end = chunk.find(b"\n", start)
+        
+        if start < len(chunk):
+            pending.append(chunk[start:])
+            pending_bytes += len(chunk) - start
+            if pending_bytes > max_line_bytes:
+                raise LineTooLong(number + 1, max_line_bytes)
+    
+    if pending:
+        line = b"".join(pending)
+        if line.strip():
+            yield number + 1, line
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body is produced while the request is still
+    being read.
+    
+    StreamingResponse normally listens for ``http.disconnect`` on a second
+    task, which would swallow request body messages that the body iterator
+    still needs. Here the body iterator is the only reader; it sees the
+    disconnect itself through ``Request.stream()``.
+    """
+    
+    media_type = "application/x-ndjson"
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,6 @@
+"""
+SkillSense AI - Benchmarks
+
+Synthetic workloads and timing harnesses for the ML service. Run from the
+ml-service directory, e.g. ``python -m benchmarks.run --help``.
+"""
@@ -0,0 +1,158 @@
+"""
+SkillSense AI - Cold Start Measurement
+
+Times what a freshly scaled-out worker pays before it can answer: the
+interpreter start, importing the app, the startup hooks and warm-up (until
+/health/ready answers 200) and the first request to each of the predict,
+gap analysis and recommendation routes. Every run is a new Python process.
+
+    python -m benchmarks.coldstart --runs 10
+    python -m benchmarks.coldstart --runs 10 --no-bytecode   # fresh container
+
+--no-bytecode runs a copy of the service code without ``__pycache__``
+directories and with bytecode writing disabled, which is what a container
+image that ships the app without precompiled ``.pyc`` files pays on every
+start (installed packages keep their bytecode either way).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES = ("interpreter", "import", "startup", "first_request", "total")
+
+# Runs in the child process. Client-side modules (httpx, generators) are
+# imported before the clock starts so only the app's own cost is timed.
+_CHILD = r"""
+import time
+started_at = time.time()
+
+import asyncio, json, random
+import httpx
+
+random.seed(0)
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+
+async def main():
+    inbox, outbox = asyncio.Queue(), asyncio.Queue()
+    await inbox.put({"type": "lifespan.startup"})
+    lifespan = asyncio.ensure_future(
+        app({"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}, inbox.get, outbox.put)
+    )
+    message = await outbox.get()
+    if message["type"] != "lifespan.startup.complete":
+        raise RuntimeError(message)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://cold") as client:
+        # Startup includes the background warm-up: traffic arrives once ready
+        while (await client.get("/health/ready")).status_code != 200:
+            await asyncio.sleep(0.001)
+        t2 = time.perf_counter()
+
+        from benchmarks.generators import REQUEST_BUILDERS
+        requests = [builder(random.Random(1), "realistic") for builder in REQUEST_BUILDERS.values()]
+        first = {}
+        t3 = time.perf_counter()
+        for path, body in requests:
+            start = time.perf_counter()
+            response = await client.post(path, json=body)
+            response.raise_for_status()
+            first[path] = time.perf_counter() - start
+    t4 = time.perf_counter()
+
+    await inbox.put({"type": "lifespan.shutdown"})
+    await lifespan
+    return t2, t3, t4, first
+
+t2, t3, t4, first = asyncio.run(main())
+print(json.dumps({
+    "started_at": started_at,
+    "import": t1 - t0,
+    "startup": t2 - t1,
+    "first_request": t4 - t3,
+    "ready_after": t4 - t0 - (t3 - t2),
+    "routes": first,
+}))
+"""
+
+
+def measure_once(bytecode: bool = True) -> Dict[str, float]:
+    """
+    One cold start in a new process; phase durations in seconds.
+    
+    ``total`` runs from spawning the process to the last first response,
+    excluding time spent generating request payloads.
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    with tempfile.TemporaryDirectory() as copy_dir:
+        service_dir = SERVICE_DIR
+        if not bytecode:
+            ignore = shutil.ignore_patterns("__pycache__")
+            for package in ("app", "benchmarks"):
+                shutil.copytree(
+                    os.path.join(SERVICE_DIR, package), os.path.join(copy_dir, package), ignore=ignore
+                )
+            service_dir = copy_dir
+            env["PYTHONDONTWRITEBYTECODE"] = "1"
+        env["PYTHONPATH"] = service_dir
+        
+        spawned_at = time.time()
+        result = subprocess.run(
+            [sys.executable, "-c", _CHILD],
+            cwd=service_dir, env=env, capture_output=True, text=True, check=False,
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"Cold start run failed:\n{result.stderr[-2000:]}")
+    
+    child = json.loads(result.stdout.strip().splitlines()[-1])
+    interpreter = max(0.0, child["started_at"] - spawned_at)
+    return {
+        "interpreter": interpreter,
+        "import": child["import"],
+        "startup": child["startup"],
+        "first_request": child["first_request"],
+        "total": interpreter + child["ready_after"],
+    }
+
+
+def measure(runs: int, bytecode: bool = True) -> Dict[str, List[float]]:
+    """Phase durations (seconds) over ``runs`` cold starts"""
+    samples: Dict[str, List[float]] = {phase: [] for phase in PHASES}
+    for _ in range(runs):
+        for phase, value in measure_once(bytecode).items():
+            samples[phase].append(value)
+    return samples
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure ML service cold start")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--no-bytecode", action="store_true", help="Start without cached .pyc files every run"
+    )
+    args = parser.parse_args(argv)
+    
+    samples = measure(args.runs, bytecode=not args.no_bytecode)
+    print(f"{'phase':<16}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+    for phase, values in samples.items():
+        print(
+            f"{phase:<16}{statistics.median(values) * 1000:>12.1f}"
+            f"{min(values) * 1000:>10.1f}{max(values) * 1000:>10.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
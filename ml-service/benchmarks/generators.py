@@ -0,0 +1,140 @@
+"""
+SkillSense AI - Synthetic Workloads
+
+Seeded generators for assessments, skill profiles and gap lists, shaped
+like the API payloads the Node server sends. The same seed always yields
+the same payloads, so runs on different machines or commits are
+comparable.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+from app.services.gap_analyzer import ROLE_REQUIREMENTS
+from app.services.recommender import LEARNING_RESOURCES
+
+
+# Skills the roles and catalog know about, plus unknown ones that take
+# the fallback paths (extreme sizes mostly draw from these)
+KNOWN_SKILLS = sorted(
+    {skill["skillId"] for role in ROLE_REQUIREMENTS.values() for skill in role["skills"]}
+    | (set(LEARNING_RESOURCES) - {"default"})
+)
+ROLE_IDS = [role for role in ROLE_REQUIREMENTS if role != "default"]
+PRIORITIES = ["critical", "high", "medium", "low"]
+
+# Items per request: assessment responses, profile skills, gaps
+SIZES: Dict[str, Dict[str, int]] = {
+    "realistic": {"responses": 40, "skills": 12, "gaps": 8},
+    "large": {"responses": 500, "skills": 80, "gaps": 60},
+    "extreme": {"responses": 5000, "skills": 500, "gaps": 500},
+}
+
+_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _skill_ids(rng: random.Random, count: int) -> List[str]:
+    """``count`` distinct skill ids, known ones first"""
+    known = rng.sample(KNOWN_SKILLS, min(count, len(KNOWN_SKILLS)))
+    return known + [f"skill{i}" for i in range(count - len(known))]
+
+
+def _skill_name(skill_id: str) -> str:
+    return skill_id.replace("_", " ").title()
+
+
+def assessment_responses(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    """
+    Assessment responses over a handful of skills (about 5 per skill).
+    
+    Mixes objective answers (isCorrect / difficultyWeight set) with
+    self-ratings ("1".."5"), as the assessment flow does.
+    """
+    skills = _skill_ids(rng, max(1, count // 5))
+    responses = []
+    for i in range(count):
+        skill_id = rng.choice(skills)
+        response = {
+            "questionId": f"q{i}",
+            "skillId": skill_id,
+            "skillName": _skill_name(skill_id),
+            "timeSpent": rng.randint(5, 300),
+        }
+        if rng.random() < 0.6:
+            response["answer"] = rng.choice(["a", "b", "c", "d"])
+            response["isCorrect"] = rng.random() < 0.6
+            response["difficultyWeight"] = rng.choice([0.5, 1.0, 1.5, 2.0])
+        else:
+            response["answer"] = str(rng.randint(1, 5))
+        responses.append(response)
+    return responses
+
+
+def skill_profile(rng: random.Random, user_id: str, count: int) -> Dict[str, Any]:
+    """A SkillProfile payload with ``count`` assessed skills"""
+    assessed_at = (_EPOCH + timedelta(days=rng.randint(0, 365))).isoformat()
+    skills = [
+        {
+            "skillId": skill_id,
+            "skillName": _skill_name(skill_id),
+            "proficiencyLevel": rng.randint(0, 5),
+            "confidence": round(rng.uniform(0.3, 1.0), 2),
+            "assessedAt": assessed_at,
+            "source": rng.choice(["assessment", "self_reported"]),
+        }
+        for skill_id in _skill_ids(rng, count)
+    ]
+    return {
+        "userId": user_id,
+        "skills": skills,
+        "overallScore": round(rng.uniform(0, 100), 1),
+        "lastUpdated": assessed_at,
+    }
+
+
+def gap_list(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    """Skill gaps as returned by gap analysis (input to recommendations)"""
+    return [
+        {
+            "skillId": skill_id,
+            "skillName": _skill_name(skill_id),
+            "gapSize": rng.randint(1, 5),
+            "priority": rng.choice(PRIORITIES),
+        }
+        for skill_id in _skill_ids(rng, count)
+    ]
+
+
+def prediction_request(rng: random.Random, size: str) -> Tuple[str, Dict[str, Any]]:
+    """(path, body) for POST /api/v1/predict/proficiency"""
+    return "/api/v1/predict/proficiency", {
+        "userId": f"user{rng.randrange(10**6)}",
+        "assessmentResponses": assessment_responses(rng, SIZES[size]["responses"]),
+    }
+
+
+def gap_request(rng: random.Random, size: str) -> Tuple[str, Dict[str, Any]]:
+    """(path, body) for POST /api/v1/analyze/gaps"""
+    user_id = f"user{rng.randrange(10**6)}"
+    return "/api/v1/analyze/gaps", {
+        "userId": user_id,
+        "skillProfile": skill_profile(rng, user_id, SIZES[size]["skills"]),
+        "targetRoleId": rng.choice(ROLE_IDS),
+    }
+
+
+def recommendation_request(rng: random.Random, size: str) -> Tuple[str, Dict[str, Any]]:
+    """(path, body) for POST /api/v1/recommend"""
+    return "/api/v1/recommend", {
+        "userId": f"user{rng.randrange(10**6)}",
+        "gaps": gap_list(rng, SIZES[size]["gaps"]),
+    }
+
+
+# Call shapes made by the Node server's ML client
+REQUEST_BUILDERS = {
+    "predict": prediction_request,
+    "gaps": gap_request,
+    "recommend": recommendation_request,
+}
@@ -0,0 +1,493 @@
+"""
+SkillSense AI - Load and Soak Harness
+
+Stands in for the Node server's ML client: replays its three call shapes
+(predictProficiency, analyzeGaps, getRecommendations) against a running
+service, or against a uvicorn it launches locally, to size worker counts
+for peak traffic.
+
+    python -m benchmarks.load --workers 2 --concurrency 32 --duration 60
+    python -m benchmarks.load --rate 200 --mix predict=3,gaps=1,recommend=1
+    python -m benchmarks.load --soak --duration 1800 --output soak.json
+
+Without --rate the load is closed-loop: ``concurrency`` clients send
+back-to-back. With --rate, arrivals are Poisson at that rate and at most
+``concurrency`` requests are in flight; arrivals beyond that are counted
+as dropped, which means the client side saturated.
+
+Each report interval prints throughput, latency percentiles, the error
+rate and the RSS of the server processes (from /proc, Linux only). In
+soak mode the RSS trend after the warm-up fifth of the run is fitted, and
+growth above --max-growth MiB/min fails the run. Result caches grow until
+they reach their configured sizes, so soak runs need to be long enough
+(tens of minutes) for that to happen within the warm-up.
+
+Payloads are drawn from a pre-generated pool with one value varied per
+request, so result caches see realistic misses (--cacheable turns this
+off).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.generators import REQUEST_BUILDERS, SIZES
+from benchmarks.replay import LatencyHistogram
+from benchmarks.run import percentile
+
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Same as the Node client's default (ML_SERVICE_TIMEOUT)
+DEFAULT_TIMEOUT = 30.0
+
+
+def parse_mix(text: str, allowed) -> Dict[str, float]:
+    """
+    Parse ``name=weight,...`` into normalized weights.
+    
+    Raises:
+        ValueError: On unknown names or non-positive totals
+    """
+    weights = {}
+    for part in filter(None, text.split(",")):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in allowed:
+            raise ValueError(f"Unknown name '{name}' (expected one of {', '.join(allowed)})")
+        weights[name] = float(weight) if weight else 1.0
+    
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError(f"Weights must add up to more than 0: {text}")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def growth_rate(samples: List[Tuple[float, float]], skip_fraction: float = 0.2) -> float:
+    """
+    Least-squares slope of (seconds, MiB) samples in MiB per minute.
+    
+    The first ``skip_fraction`` of the samples is ignored: caches and
+    allocator arenas fill up during warm-up, which is not a leak.
+    """
+    samples = samples[int(len(samples) * skip_fraction):]
+    if len(samples) < 3:
+        return 0.0
+    
+    times = [t for t, _ in samples]
+    values = [v for _, v in samples]
+    mean_t = statistics.fmean(times)
+    mean_v = statistics.fmean(values)
+    variance = sum((t - mean_t) ** 2 for t in times)
+    if not variance:
+        return 0.0
+    slope = sum((t - mean_t) * (v - mean_v) for t, v in zip(times, values)) / variance
+    return slope * 60
+
+
+def _process_tree(root: int) -> List[int]:
+    """``root`` and all its descendants (uvicorn supervisor and workers)"""
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields resume after ")"
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[ppid].append(int(entry))
+    
+    pids, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def rss_mib(pid: int) -> Optional[float]:
+    """Resident set size of a process in MiB (None if gone or not Linux)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+class Payloads:
+    """Pre-generated request bodies by call shape and size"""
+    
+    def __init__(
+        self,
+        mix: Dict[str, float],
+        sizes: Dict[str, float],
+        pool: int,
+        seed: int,
+        vary: bool = True
+    ):
+        self.rng = random.Random(seed)
+        self.vary = vary
+        self.kinds = list(mix)
+        self.kind_weights = list(mix.values())
+        self.sizes = list(sizes)
+        self.size_weights = list(sizes.values())
+        self.pool = {
+            (kind, size): [REQUEST_BUILDERS[kind](self.rng, size) for _ in range(pool)]
+            for kind in self.kinds
+            for size in self.sizes
+        }
+    
+    def next(self) -> Tuple[str, str, Dict[str, Any]]:
+        """(kind, path, body) of the next request"""
+        kind = self.rng.choices(self.kinds, self.kind_weights)[0]
+        size = self.rng.choices(self.sizes, self.size_weights)[0]
+        path, body = self.rng.choice(self.pool[(kind, size)])
+        if self.vary:
+            body = self._varied(kind, body)
+        return kind, path, body
+    
+    def _varied(self, kind: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Shallow copy with one scored value changed (defeats result caches)"""
+        rng = self.rng
+        if kind == "predict":
+            responses = list(body["assessmentResponses"])
+            if responses:
+                responses[0] = {**responses[0], "timeSpent": rng.randint(5, 300)}
+            return {**body, "assessmentResponses": responses}
+        if kind == "gaps":
+            profile = body["skillProfile"]
+            skills = list(profile["skills"])
+            if skills:
+                skills[0] = {**skills[0], "proficiencyLevel": rng.randint(0, 5)}
+            return {**body, "skillProfile": {**profile, "skills": skills}}
+        gaps = list(body["gaps"])
+        if gaps:
+            gaps[0] = {**gaps[0], "gapSize": rng.randint(1, 5)}
+        return {**body, "gaps": gaps}
+
+
+class Recorder:
+    """
+    Per-interval and whole-run latency/error bookkeeping.
+    
+    Whole-run latencies (ms) go into bounded histograms, so memory does
+    not grow over a long soak run; only the current interval keeps raw
+    samples.
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.interval: List[Tuple[str, float, bool]] = []
+        self.latencies: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, int] = defaultdict(int)
+        self.dropped = 0
+        self.timeline: List[Dict[str, Any]] = []
+        self._last_flush = 0.0
+    
+    def record(self, kind: str, latency: float, status: str):
+        ok = status == "200"
+        self.interval.append((kind, latency, ok))
+        self.latencies[kind].add(latency * 1000)
+        self.statuses[status] += 1
+        if not ok:
+            self.errors[kind] += 1
+    
+    def flush(self, elapsed: float, rss: Dict[int, float]) -> Dict[str, Any]:
+        """Close the current interval and return its summary"""
+        window, self.interval = self.interval, []
+        span, self._last_flush = elapsed - self._last_flush, elapsed
+        latencies = [latency for _, latency, _ in window]
+        point = {
+            "t": round(elapsed, 1),
+            "requests": len(window),
+            "rps": round(len(window) / span, 1) if span > 0 else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+            "error_rate": round(sum(not ok for *_, ok in window) / len(window), 4) if window else 0.0,
+            "rss_mib": round(sum(rss.values()), 1) if rss else None,
+            "worker_rss_mib": {str(pid): round(value, 1) for pid, value in rss.items()},
+        }
+        self.timeline.append(point)
+        return point
+    
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        by_kind = {}
+        for kind, histogram in self.latencies.items():
+            by_kind[kind] = {
+                "requests": histogram.count,
+                "errors": self.errors[kind],
+                "p50_ms": round(histogram.percentile(0.50), 2),
+                "p95_ms": round(histogram.percentile(0.95), 2),
+                "p99_ms": round(histogram.percentile(0.99), 2),
+                "max_ms": round(histogram.max, 2),
+            }
+        total = sum(h.count for h in self.latencies.values())
+        errors = sum(self.errors.values())
+        return {
+            "duration": round(elapsed, 1),
+            "requests": total,
+            "rps": round(total / elapsed, 1) if elapsed else 0.0,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "dropped": self.dropped,
+            "statuses": dict(self.statuses),
+            "calls": by_kind,
+        }
+
+
+async def _send(client, recorder: Recorder, payloads: Payloads):
+    kind, path, body = payloads.next()
+    start = time.perf_counter()
+    try:
+        response = await client.post(path, json=body)
+        status = str(response.status_code)
+    except Exception as e:
+        status = type(e).__name__
+    recorder.record(kind, time.perf_counter() - start, status)
+
+
+async def run_load(
+    base_url: str,
+    payloads: Payloads,
+    duration: float,
+    concurrency: int,
+    rate: Optional[float] = None,
+    report_interval: float = 5.0,
+    server_pid: Optional[int] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    transport=None,
+    quiet: bool = False
+) -> Recorder:
+    """
+    Generate load for ``duration`` seconds and return the recorder.
+    
+    Args:
+        base_url: Service base URL
+        payloads: Request source
+        duration: Seconds to run
+        concurrency: Clients (closed loop) or in-flight cap (with rate)
+        rate: Poisson arrival rate in requests/s (closed loop if None)
+        report_interval: Seconds between timeline points
+        server_pid: Root process whose tree's RSS is sampled
+        timeout: Per-request timeout in seconds
+        transport: httpx transport override (e.g. ASGITransport in tests)
+        quiet: Do not print timeline points
+    """
+    import httpx
+    
+    recorder = Recorder()
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    
+    async with httpx.AsyncClient(
+        base_url=base_url, timeout=timeout, limits=limits, transport=transport
+    ) as client:
+        async def closed_loop():
+            while time.perf_counter() < deadline:
+                await _send(client, recorder, payloads)
+        
+        async def open_loop():
+            in_flight = set()
+            next_arrival = time.perf_counter()
+            while next_arrival < deadline:
+                await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+                if len(in_flight) >= concurrency:
+                    recorder.dropped += 1
+                else:
+                    task = asyncio.ensure_future(_send(client, recorder, payloads))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                # Seeded like the payloads, so open-loop runs are reproducible
+                next_arrival += payloads.rng.expovariate(rate)
+            if in_flight:
+                await asyncio.gather(*in_flight)
+        
+        async def reporter():
+            while True:
+                await asyncio.sleep(report_interval)
+                _report(recorder, server_pid, quiet)
+        
+        report_task = asyncio.ensure_future(reporter())
+        try:
+            if rate:
+                await open_loop()
+            else:
+                await asyncio.gather(*(closed_loop() for _ in range(concurrency)))
+        finally:
+            report_task.cancel()
+        _report(recorder, server_pid, quiet)
+    
+    return recorder
+
+
+def _report(recorder: Recorder, server_pid: Optional[int], quiet: bool):
+    rss = {}
+    if server_pid is not None:
+        for pid in _process_tree(server_pid):
+            value = rss_mib(pid)
+            if value is not None:
+                rss[pid] = value
+    
+    point = recorder.flush(time.perf_counter() - recorder.started, rss)
+    if quiet:
+        return
+    print(
+        f"t={point['t']:>7.1f}s  {point['rps']:>8.1f} req/s  "
+        f"p50={point['p50_ms'] or 0:>8.2f}ms  p99={point['p99_ms'] or 0:>8.2f}ms  "
+        f"errors={point['error_rate']:>6.1%}  "
+        + (f"rss={point['rss_mib']:.1f}MiB" if point["rss_mib"] is not None else "")
+    )
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, env: Dict[str, str], wait: float = 60.0) -> subprocess.Popen:
+    """Launch uvicorn on localhost and wait until /health/ready answers 200"""
+    import httpx
+    
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=SERVICE_DIR,
+        env={**os.environ, **env},
+    )
+    
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health/ready", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    
+    process.terminate()
+    raise RuntimeError(f"uvicorn did not become ready within {wait:.0f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load and soak test the ML service")
+    parser.add_argument("--url", help="Target a running service instead of launching one")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers to launch")
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="NAME=VALUE",
+        help="Environment for the launched server (e.g. ML_EXECUTION_MODE=process)",
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, help="Poisson arrival rate (req/s); closed loop if omitted")
+    parser.add_argument("--mix", default="predict=1,gaps=1,recommend=1", help="Call shape weights")
+    parser.add_argument(
+        "--sizes", default="realistic=0.9,large=0.09,extreme=0.01", help="Payload size weights"
+    )
+    parser.add_argument("--pool", type=int, default=64, help="Payloads per call shape and size")
+    parser.add_argument("--cacheable", action="store_true", help="Repeat pooled payloads verbatim")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--soak", action="store_true", help="Fail on sustained RSS growth")
+    parser.add_argument(
+        "--max-growth", type=float, default=1.0, help="Allowed RSS growth in soak mode (MiB/min)"
+    )
+    parser.add_argument("--output", help="Write the timeline and summary as JSON")
+    args = parser.parse_args(argv)
+    
+    try:
+        mix = parse_mix(args.mix, REQUEST_BUILDERS)
+        sizes = parse_mix(args.sizes, SIZES)
+    except ValueError as e:
+        parser.error(str(e))
+    env = dict(item.partition("=")[::2] for item in args.env)
+    
+    payloads = Payloads(mix, sizes, args.pool, args.seed, vary=not args.cacheable)
+    
+    server = None
+    if args.url:
+        base_url, server_pid = args.url.rstrip("/"), None
+    else:
+        port = _free_port()
+        server = start_server(args.workers, port, env)
+        base_url, server_pid = f"http://127.0.0.1:{port}", server.pid
+        print(f"Started uvicorn with {args.workers} worker(s) on {base_url}")
+    
+    try:
+        recorder = asyncio.run(run_load(
+            base_url,
+            payloads,
+            duration=args.duration,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            report_interval=args.report_interval,
+            server_pid=server_pid,
+            timeout=args.timeout,
+        ))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+    
+    summary = recorder.summary(time.perf_counter() - recorder.started)
+    rss_samples = [
+        (point["t"], point["rss_mib"]) for point in recorder.timeline if point["rss_mib"] is not None
+    ]
+    if rss_samples:
+        summary["rss_mib"] = {"start": rss_samples[0][1], "end": rss_samples[-1][1]}
+        summary["rss_growth_mib_per_min"] = round(growth_rate(rss_samples), 3)
+    
+    print()
+    print(
+        f"{summary['requests']} requests in {summary['duration']}s: {summary['rps']} req/s, "
+        f"error rate {summary['error_rate']:.2%}, dropped {summary['dropped']}"
+    )
+    for kind, stats in summary["calls"].items():
+        print(
+            f"  {kind:<10} n={stats['requests']:<7} p50={stats['p50_ms']}ms "
+            f"p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms max={stats['max_ms']}ms "
+            f"errors={stats['errors']}"
+        )
+    if "rss_mib" in summary:
+        print(
+            f"  RSS {summary['rss_mib']['start']} -> {summary['rss_mib']['end']} MiB "
+            f"({summary['rss_growth_mib_per_min']:+} MiB/min after warm-up)"
+        )
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "timeline": recorder.timeline}, f, indent=2)
+    
+    if args.soak:
+        growth = summary.get("rss_growth_mib_per_min")
+        if growth is None:
+            print("Soak: no RSS samples (needs a launched server on Linux)", file=sys.stderr)
+            return 2
+        if growth > args.max_growth:
+            print(f"Soak: RSS grew {growth} MiB/min (limit {args.max_growth})", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,366 @@
+"""
+SkillSense AI - Traffic Replay
+
+Streams a captured traffic log through the ASGI app in-process and records
+per-request latency and a hash of each response body, so one run checks
+both speed and output drift against an earlier run on the same corpus.
+
+The log is JSON Lines, one request per line:
+
+    {"method": "POST", "path": "/api/v1/analyze/gaps", "body": {...}}
+
+``method`` defaults to POST and ``json`` is accepted for ``body``. Lines
+in any other shape (blank, invalid JSON, no ``path``) are skipped and
+counted, so logs with interleaved non-request records can be replayed as
+they are. Note that the backlog file at the repository root is not a
+traffic capture.
+
+    python -m benchmarks.replay traffic.jsonl --output run-a.jsonl
+    python -m benchmarks.replay traffic.jsonl.gz --compare run-a.jsonl
+
+The log (plain or gzip, or "-" for stdin) is read line by line and results
+are written as they complete. Latencies go into log-scale histograms
+(percentiles within 1%), so memory stays bounded by ``--concurrency``
+whatever the size of the capture.
+
+With ``--compare``, results are matched by line number. Requests whose
+response hash changed and requests present in only one of the two runs
+(e.g. a different or truncated log) all count as drift.
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Response fields that legitimately differ between runs
+DEFAULT_IGNORED_FIELDS = ("timestamp",)
+
+
+def open_log(path: str) -> IO[str]:
+    """Open a plain or gzip-compressed log for streaming ("-" for stdin)"""
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def iter_requests(lines) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Yield (line number, request, skip reason) per line.
+    
+    The request is {"method", "path", "body"} or None when the line is
+    skipped, in which case the reason says why.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            yield number, None, "blank"
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, None, "invalid json"
+            continue
+        if not isinstance(record, dict) or not isinstance(record.get("path"), str):
+            yield number, None, "not a request"
+            continue
+        
+        yield number, {
+            "method": str(record.get("method", "POST")).upper(),
+            "path": record["path"],
+            "body": record.get("body", record.get("json")),
+        }, None
+
+
+def _strip(value: Any, ignored: frozenset) -> Any:
+    if isinstance(value, dict):
+        return {k: _strip(v, ignored) for k, v in value.items() if k not in ignored}
+    if isinstance(value, list):
+        return [_strip(v, ignored) for v in value]
+    return value
+
+
+def response_hash(status: int, content: bytes, ignored: frozenset = frozenset()) -> str:
+    """
+    Hash of the status and response body, independent of JSON formatting.
+    
+    JSON bodies are canonicalized (sorted keys, ``ignored`` fields dropped)
+    so switching serializers (e.g. fast_responses) is not reported as drift.
+    """
+    try:
+        canonical = json.dumps(
+            _strip(json.loads(content), ignored), sort_keys=True, separators=(",", ":")
+        ).encode()
+    except ValueError:
+        canonical = content
+    return hashlib.sha256(str(status).encode() + b"\n" + canonical).hexdigest()[:16]
+
+
+class LatencyHistogram:
+    """
+    Log-scale latency histogram with 2% wide buckets.
+    
+    Percentiles are within 1% of the exact value. It holds one counter per
+    occupied bucket (about a thousand at most between 1 microsecond and
+    hours), however many samples are recorded.
+    """
+    
+    GROWTH = 1.02
+    BASE_MS = 0.001
+    
+    def __init__(self):
+        self.buckets: Counter = Counter()
+        self.count = 0
+        self.min = math.inf
+        self.max = 0.0
+    
+    def add(self, value: float):
+        index = 0
+        if value > self.BASE_MS:
+            index = int(math.log(value / self.BASE_MS) / math.log(self.GROWTH))
+        self.buckets[index] += 1
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+    
+    def percentile(self, fraction: float) -> float:
+        """Nearest-rank percentile, as the geometric middle of its bucket"""
+        rank = min(self.count, max(1, int(round(fraction * self.count))))
+        if rank == self.count:
+            return self.max
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                middle = self.BASE_MS * self.GROWTH ** (index + 0.5)
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+
+class ReplayStats:
+    """Per-route latency histograms, counters and drift against a previous run"""
+    
+    def __init__(self):
+        self.latencies: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.statuses: Counter = Counter()
+        self.skipped: Counter = Counter()
+        self.drift = 0
+        self.compared = 0
+        # Requests found in only one of the two runs (also counted in drift)
+        self.only_previous = 0
+        self.only_current = 0
+        self.drift_lines: List[int] = []
+    
+    def record(self, result: Dict[str, Any]):
+        self.latencies[f"{result['method']} {result['path']}"].add(result["latency_ms"])
+        self.statuses[result["status"]] += 1
+    
+    def record_drift(self, line: int):
+        self.drift += 1
+        if len(self.drift_lines) < 100:
+            self.drift_lines.append(line)
+    
+    def summary(self) -> Dict[str, Any]:
+        routes = {}
+        for route, histogram in sorted(self.latencies.items()):
+            routes[route] = {
+                "requests": histogram.count,
+                "p50_ms": round(histogram.percentile(0.50), 3),
+                "p99_ms": round(histogram.percentile(0.99), 3),
+                "max_ms": round(histogram.max, 3),
+            }
+        summary = {
+            "requests": sum(h.count for h in self.latencies.values()),
+            "skipped": dict(self.skipped),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "routes": routes,
+        }
+        if self.compared or self.drift:
+            summary["compared"] = self.compared
+            summary["drift"] = self.drift
+            summary["only_previous"] = self.only_previous
+            summary["only_current"] = self.only_current
+            summary["drift_lines"] = self.drift_lines
+        return summary
+
+
+async def replay(
+    lines,
+    output: Optional[IO[str]] = None,
+    previous: Optional[IO[str]] = None,
+    concurrency: int = 1,
+    ignored_fields: Tuple[str, ...] = DEFAULT_IGNORED_FIELDS,
+    app=None
+) -> ReplayStats:
+    """
+    Replay requests from ``lines`` through the app.
+    
+    Args:
+        lines: Iterable of log lines (e.g. an open file)
+        output: Where to write one JSON result per request, in log order
+        previous: Results of an earlier run to check for drift, matched by
+            line number; lines found in only one run count as drift
+        concurrency: Requests in flight at once (1 keeps latencies
+            comparable between runs)
+        ignored_fields: Response fields excluded from hashes
+        app: ASGI app (the service app if None)
+    
+    Returns:
+        Collected stats (with drift counts if ``previous`` was given)
+    """
+    import httpx
+    
+    if app is None:
+        from app.main import app
+    
+    stats = ReplayStats()
+    ignored = frozenset(ignored_fields)
+    previous_hashes = _iter_previous(previous) if previous is not None else None
+    pending_previous: Optional[Tuple[int, str]] = None
+    
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://replay"
+    ) as client:
+        async def send(number: int, request: Dict[str, Any]) -> Dict[str, Any]:
+            start = time.perf_counter()
+            response = await client.request(
+                request["method"], request["path"], json=request["body"]
+            )
+            latency = (time.perf_counter() - start) * 1000
+            return {
+                "line": number,
+                "method": request["method"],
+                "path": request["path"],
+                "status": response.status_code,
+                "latency_ms": round(latency, 3),
+                "hash": response_hash(response.status_code, response.content, ignored),
+            }
+        
+        def finish(result: Dict[str, Any]):
+            nonlocal pending_previous
+            stats.record(result)
+            if output is not None:
+                output.write(json.dumps(result) + "\n")
+            if previous_hashes is None:
+                return
+            
+            # Both files are in log order: advance the previous run to this
+            # line; lines it passes over were not replayed this time
+            while pending_previous is None or pending_previous[0] < result["line"]:
+                if pending_previous is not None:
+                    stats.only_previous += 1
+                    stats.record_drift(pending_previous[0])
+                pending_previous = next(previous_hashes, (sys.maxsize, ""))
+            if pending_previous[0] == result["line"]:
+                stats.compared += 1
+                if pending_previous[1] != result["hash"]:
+                    stats.record_drift(result["line"])
+                pending_previous = None
+            else:
+                stats.only_current += 1
+                stats.record_drift(result["line"])
+        
+        window: List[Tuple[int, Dict[str, Any]]] = []
+        for number, request, reason in iter_requests(lines):
+            if request is None:
+                stats.skipped[reason] += 1
+                continue
+            window.append((number, request))
+            if len(window) >= concurrency:
+                for result in await asyncio.gather(*(send(n, r) for n, r in window)):
+                    finish(result)
+                window = []
+        for result in await asyncio.gather(*(send(n, r) for n, r in window)):
+            finish(result)
+    
+    if previous_hashes is not None:
+        # Whatever is left of the previous run has no counterpart here
+        remaining = [pending_previous] if pending_previous is not None else []
+        for number, _ in [*remaining, *previous_hashes]:
+            if number != sys.maxsize:
+                stats.only_previous += 1
+                stats.record_drift(number)
+    
+    return stats
+
+
+def _iter_previous(results: IO[str]) -> Iterator[Tuple[int, str]]:
+    for line in results:
+        if line.strip():
+            record = json.loads(line)
+            yield record["line"], record["hash"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay captured traffic through the ML service")
+    parser.add_argument("log", help="JSONL traffic log (.gz supported, - for stdin)")
+    parser.add_argument("--output", help="Write per-request results (JSONL) here")
+    parser.add_argument("--compare", help="Results of an earlier run to check for output drift")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--ignore-field", action="append", default=list(DEFAULT_IGNORED_FIELDS),
+        help="Response field to leave out of hashes (repeatable)",
+    )
+    parser.add_argument("--summary", help="Write the summary as JSON here")
+    args = parser.parse_args(argv)
+    
+    output = open(args.output, "w") if args.output else None
+    previous = open(args.compare) if args.compare else None
+    try:
+        with open_log(args.log) as lines:
+            stats = asyncio.run(replay(
+                lines,
+                output=output,
+                previous=previous,
+                concurrency=max(1, args.concurrency),
+                ignored_fields=tuple(args.ignore_field),
+            ))
+    finally:
+        for f in (output, previous):
+            if f is not None:
+                f.close()
+    
+    summary = stats.summary()
+    skipped = sum(summary["skipped"].values())
+    print(f"Replayed {summary['requests']} requests ({skipped} lines skipped)")
+    for route, route_stats in summary["routes"].items():
+        print(
+            f"  {route:<45} n={route_stats['requests']:<8} p50={route_stats['p50_ms']}ms "
+            f"p99={route_stats['p99_ms']}ms max={route_stats['max_ms']}ms"
+        )
+    print(f"  statuses: {summary['statuses']}")
+    if summary["requests"] == 0 and skipped:
+        print(
+            f"No request lines found; skipped: {summary['skipped']}. Expected "
+            '{"method", "path", "body"} per line.',
+            file=sys.stderr,
+        )
+        return 2
+    
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=2)
+    
+    if stats.compared or stats.drift:
+        print(
+            f"  drift: {stats.drift} ({stats.drift - stats.only_previous - stats.only_current} "
+            f"of {stats.compared} responses changed, {stats.only_previous} only in the "
+            f"previous run, {stats.only_current} only in this one)"
+        )
+        if stats.drift:
+            print(f"  first changed lines: {stats.drift_lines[:10]}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
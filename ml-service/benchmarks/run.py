@@ -0,0 +1,407 @@
+"""
+SkillSense AI - Benchmark Harness
+
+Times predict_proficiency, analyze_gaps and generate_recommendations on
+synthetic payloads, both as direct service calls and through the ASGI app
+in-process (httpx, no network), and reports p50/p99 latency, throughput
+and peak allocations per call.
+
+Results can be saved as a baseline and later runs compared against it:
+
+    python -m benchmarks.run --save baseline.json
+    python -m benchmarks.run --compare baseline.json
+
+Result caches are disabled by default so every call does the full work
+(--warm-cache measures the cached path instead). The garbage collector is
+paused while timing, and allocations are measured in a separate
+tracemalloc pass, so neither adds noise to the latencies.
+Baselines are only comparable on the same machine and Python version.
+--cold-start N adds the cold start phases (import, startup, first
+requests) measured over N fresh processes.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.generators import REQUEST_BUILDERS, SIZES
+from app.services.gap_analyzer import gap_analyzer_service
+from app.services.predictor import predictor_service
+from app.services.recommender import recommender_service
+from app.utils.cache import LRUCache
+
+
+SERVICES = (predictor_service, gap_analyzer_service, recommender_service)
+
+# Items per request, reported as items/s next to requests/s
+ITEM_KEYS = {"predict": "responses", "gaps": "skills", "recommend": "gaps"}
+
+# Distinct payloads cycled through per case, so the warm-cache mode sees
+# a realistic hit pattern and the cold mode no single hot input
+PAYLOAD_POOL = 16
+
+ALLOCATION_CALLS = 5
+
+# Each case is timed in several rounds and the round with the lowest median
+# is kept: interference from other processes only ever adds time
+ROUNDS = 3
+
+
+def _direct_call(kind: str) -> Callable[[Dict[str, Any]], Any]:
+    if kind == "predict":
+        return lambda body: predictor_service.predict_proficiency(
+            body["userId"], body["assessmentResponses"]
+        )
+    if kind == "gaps":
+        return lambda body: gap_analyzer_service.analyze_gaps(
+            body["userId"], body["skillProfile"], body["targetRoleId"]
+        )
+    return lambda body: recommender_service.generate_recommendations(
+        body["userId"], body["gaps"]
+    )
+
+
+@contextmanager
+def result_caches(warm: bool) -> Iterator[None]:
+    """Disable the service result caches for the duration (unless warm)"""
+    if warm:
+        yield
+        return
+    
+    original = [service.cache for service in SERVICES]
+    for service in SERVICES:
+        service.cache = LRUCache(maxsize=0)
+    try:
+        yield
+    finally:
+        for service, cache in zip(SERVICES, original):
+            service.cache = cache
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Collect once up front, then keep collector pauses out of the timings"""
+    gc.collect()
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _best_round(rounds: List[List[float]]) -> List[float]:
+    return min(rounds, key=statistics.median)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of unsorted values"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(
+    timings: List[float],
+    items: int,
+    peak_bytes: Optional[List[int]] = None
+) -> Dict[str, Any]:
+    """Latency percentiles (ms), throughput and allocation stats for one case"""
+    total = sum(timings)
+    stats = {
+        "iterations": len(timings),
+        "items_per_call": items,
+        "p50_ms": round(percentile(timings, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(timings, 0.99) * 1000, 4),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 4),
+        "ops_per_sec": round(len(timings) / total, 1) if total else 0.0,
+        "items_per_sec": round(len(timings) * items / total, 1) if total else 0.0,
+    }
+    if peak_bytes:
+        stats["peak_alloc_kib"] = round(statistics.median(peak_bytes) / 1024, 1)
+    return stats
+
+
+def _measure_sync(func: Callable, payloads: List[Any], iterations: int, warmup: int) -> List[float]:
+    for i in range(warmup):
+        func(payloads[i % len(payloads)])
+    
+    rounds = []
+    for _ in range(ROUNDS):
+        timings = []
+        with _gc_paused():
+            for i in range(iterations):
+                payload = payloads[i % len(payloads)]
+                start = time.perf_counter()
+                func(payload)
+                timings.append(time.perf_counter() - start)
+        rounds.append(timings)
+    return _best_round(rounds)
+
+
+def _allocations_sync(func: Callable, payloads: List[Any]) -> List[int]:
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(ALLOCATION_CALLS):
+            payload = payloads[i % len(payloads)]
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            func(payload)
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+async def _measure_route(
+    client,
+    path: str,
+    payloads: List[Any],
+    iterations: int,
+    warmup: int
+) -> Tuple[List[float], List[int]]:
+    async def call(body):
+        response = await client.post(path, json=body)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+    
+    for i in range(warmup):
+        await call(payloads[i % len(payloads)])
+    
+    rounds = []
+    for _ in range(ROUNDS):
+        timings = []
+        with _gc_paused():
+            for i in range(iterations):
+                body = payloads[i % len(payloads)]
+                start = time.perf_counter()
+                await call(body)
+                timings.append(time.perf_counter() - start)
+        rounds.append(timings)
+    timings = _best_round(rounds)
+    
+    tracemalloc.start()
+    peaks = []
+    try:
+        for i in range(ALLOCATION_CALLS):
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            await call(payloads[i % len(payloads)])
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+    
+    return timings, peaks
+
+
+def run_benchmarks(
+    sizes: List[str],
+    iterations: int = 200,
+    warmup: int = 20,
+    modes: List[str] = ("direct", "route"),
+    name_filter: str = "",
+    warm_cache: bool = False,
+    seed: int = 42
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run every selected case and return {case name: stats}.
+    
+    Case names are ``<mode>.<kind>.<size>``, e.g. ``route.gaps.extreme``.
+    Extreme sizes run a tenth of the iterations (at least 10).
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    cases = []
+    for size in sizes:
+        for kind, builder in REQUEST_BUILDERS.items():
+            rng = random.Random(f"{seed}:{kind}:{size}")
+            payloads = [builder(rng, size) for _ in range(PAYLOAD_POOL)]
+            count = iterations if size != "extreme" else max(10, iterations // 10)
+            for mode in modes:
+                name = f"{mode}.{kind}.{size}"
+                if name_filter in name:
+                    cases.append((name, mode, kind, size, payloads, count))
+    
+    route_cases = [case for case in cases if case[1] == "route"]
+    
+    with result_caches(warm_cache):
+        for name, mode, kind, size, payloads, count in cases:
+            if mode != "direct":
+                continue
+            func = _direct_call(kind)
+            bodies = [body for _, body in payloads]
+            timings = _measure_sync(func, bodies, count, min(warmup, count))
+            peaks = _allocations_sync(func, bodies)
+            results[name] = summarize(timings, SIZES[size][ITEM_KEYS[kind]], peaks)
+        
+        if route_cases:
+            results.update(asyncio.run(_run_routes(route_cases, warmup)))
+    
+    return {name: results[name] for name, *_ in cases}
+
+
+async def _run_routes(cases, warmup: int) -> Dict[str, Dict[str, Any]]:
+    import httpx
+    from app.main import app
+    
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, _, kind, size, payloads, count in cases:
+            path = payloads[0][0]
+            bodies = [body for _, body in payloads]
+            timings, peaks = await _measure_route(client, path, bodies, count, min(warmup, count))
+            results[name] = summarize(timings, SIZES[size][ITEM_KEYS[kind]], peaks)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """Where a run happened, stored with baselines"""
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float
+) -> List[Dict[str, Any]]:
+    """
+    Compare p50 latency and peak allocations against a baseline.
+    
+    Args:
+        results: Stats of the current run
+        baseline: Stats of the baseline run (cases missing there are skipped)
+        tolerance: Allowed relative increase (0.2 = 20%)
+    
+    Returns:
+        One row per shared case with the relative changes and a
+        ``regression`` flag
+    """
+    rows = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        
+        row = {"case": name, "regression": False}
+        for metric in ("p50_ms", "p99_ms", "peak_alloc_kib"):
+            if metric in stats and base.get(metric):
+                row[metric] = round(stats[metric] / base[metric] - 1, 3)
+        # p99 is reported but too noisy on shared machines to gate on
+        row["regression"] = any(
+            row.get(metric, 0) > tolerance for metric in ("p50_ms", "peak_alloc_kib")
+        )
+        rows.append(row)
+    return rows
+
+
+def _print_results(results: Dict[str, Dict[str, Any]]):
+    header = f"{'case':<28}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'items/s':>12}{'peak KiB':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, stats in results.items():
+        print(
+            f"{name:<28}{stats['p50_ms']:>10.3f}{stats['p99_ms']:>10.3f}"
+            f"{stats['ops_per_sec']:>10.1f}{stats['items_per_sec']:>12.1f}"
+            f"{stats.get('peak_alloc_kib', 0):>10.1f}"
+        )
+
+
+def _print_comparison(rows: List[Dict[str, Any]]):
+    print()
+    print(f"{'case':<28}{'p50':>9}{'p99':>9}{'alloc':>9}")
+    for row in rows:
+        cells = "".join(
+            f"{row[m] * 100:>+8.1f}%" if m in row else f"{'-':>9}"
+            for m in ("p50_ms", "p99_ms", "peak_alloc_kib")
+        )
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['case']:<28}{cells}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the ML service")
+    parser.add_argument(
+        "--sizes", default="realistic,extreme",
+        help=f"Comma-separated payload sizes ({', '.join(SIZES)})",
+    )
+    parser.add_argument("--modes", default="direct,route", help="direct, route or both")
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--warm-cache", action="store_true", help="Keep result caches enabled")
+    parser.add_argument(
+        "--cold-start", type=int, default=0, metavar="RUNS",
+        help="Also time this many cold starts in fresh processes (see benchmarks.coldstart)",
+    )
+    parser.add_argument("--save", help="Write results to this baseline file")
+    parser.add_argument("--compare", help="Compare against this baseline file")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="Allowed relative p50/allocation increase before a case regresses",
+    )
+    args = parser.parse_args(argv)
+    
+    sizes = [s for s in args.sizes.split(",") if s]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"Unknown size(s): {', '.join(unknown)}")
+    
+    results = run_benchmarks(
+        sizes,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        modes=[m for m in args.modes.split(",") if m],
+        name_filter=args.filter,
+        warm_cache=args.warm_cache,
+        seed=args.seed,
+    )
+    if args.cold_start:
+        from benchmarks.coldstart import measure
+        
+        for phase, timings in measure(args.cold_start).items():
+            results[f"coldstart.{phase}"] = summarize(timings, 1)
+    _print_results(results)
+    
+    options = {"seed": args.seed, "warm_cache": args.warm_cache, "iterations": args.iterations}
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {"environment": environment(), "options": options, "results": results},
+                f, indent=2,
+            )
+        print(f"\nSaved baseline to {args.save}")
+    
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("options", {}).get("warm_cache") != args.warm_cache:
+            print("\nWarning: baseline was recorded with a different cache mode", file=sys.stderr)
+        rows = compare(results, baseline["results"], args.tolerance)
+        _print_comparison(rows)
+        if any(row["regression"] for row in rows):
+            return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
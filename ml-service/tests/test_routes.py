@@ -0,0 +1,474 @@
+"""
+Tests for the ML service HTTP routes
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        # Startup warms up in the background; serve once ready
+        for _ in range(500):
+            if test_client.get("/health/ready").status_code == 200:
+                break
+            time.sleep(0.01)
+        yield test_client
+
+
+def _responses(skill_id, answers):
+    return [
+        {"questionId": f"q{i}", "skillId": skill_id, "answer": a, "timeSpent": 20}
+        for i, a in enumerate(answers)
+    ]
+
+
+class TestBatchPrediction:
+    """Tests for /api/v1/predict/proficiency:batch"""
+
+    def test_batch_matches_single_requests(self, client):
+        payloads = [
+            {"userId": "u1", "assessmentResponses": _responses("js", ["5", "4"])},
+            {"userId": "u2", "assessmentResponses": _responses("sql", ["1", "a", "b"])},
+            {"userId": "u3", "assessmentResponses": []},
+        ]
+        response = client.post(
+            "/api/v1/predict/proficiency:batch", json={"requests": payloads}
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+
+        assert [r["userId"] for r in results] == ["u1", "u2", "u3"]
+        for payload, result in zip(payloads, results):
+            single = client.post("/api/v1/predict/proficiency", json=payload).json()
+            assert result["predictions"] == single["predictions"]
+            assert result["confidence"] == single["confidence"]
+            assert result["error"] is None
+
+    def test_invalid_item_does_not_fail_batch(self, client):
+        payloads = [
+            {"userId": "u1", "assessmentResponses": _responses("js", ["5"])},
+            {"userId": "u2", "assessmentResponses": [{"skillId": "js"}]},
+            {"userId": "u3", "assessmentResponses": _responses("git", ["2"])},
+        ]
+        response = client.post(
+            "/api/v1/predict/proficiency:batch", json={"requests": payloads}
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+
+        assert results[0]["error"] is None
+        assert results[1]["error"].startswith("Invalid request")
+        assert results[1]["predictions"] is None
+        assert results[2]["predictions"][0]["skillId"] == "git"
+
+    def test_non_object_item_does_not_fail_batch(self, client):
+        payload = {"userId": "u1", "assessmentResponses": _responses("js", ["5"])}
+        response = client.post(
+            "/api/v1/predict/proficiency:batch", json={"requests": [payload, "oops", None]}
+        )
+        assert response.status_code == 200
+        results = response.json()["results"]
+
+        assert results[0]["error"] is None
+        for result in results[1:]:
+            assert result["userId"] is None
+            assert result["error"].startswith("Invalid request")
+
+    def test_saturated_pool_returns_429(self, client, monkeypatch):
+        from app.services.executor import scoring_executor
+
+        monkeypatch.setattr(scoring_executor, "mode", "thread")
+        monkeypatch.setattr(scoring_executor, "threshold", 1)
+        monkeypatch.setattr(scoring_executor, "max_pending", 0)
+        payload = {"userId": "u1", "assessmentResponses": _responses("js", ["5"])}
+
+        response = client.post("/api/v1/predict/proficiency:batch", json={"requests": [payload]})
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "1"
+
+
+class TestPredictionBatching:
+    """Tests for micro-batched /api/v1/predict/proficiency"""
+
+    def test_concurrent_requests_share_one_batch(self, client, monkeypatch):
+        from app.routes.prediction import prediction_batcher
+
+        payloads = [
+            {"userId": f"u{i}", "assessmentResponses": _responses("js", [str(i + 1), "a"])}
+            for i in range(4)
+        ]
+        expected = [
+            client.post("/api/v1/predict/proficiency", json=p).json() for p in payloads
+        ]
+
+        monkeypatch.setattr(prediction_batcher, "window", 0.05)
+        batches = prediction_batcher.batches
+
+        async def burst():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+                return await asyncio.gather(
+                    *(ac.post("/api/v1/predict/proficiency", json=p) for p in payloads)
+                )
+
+        responses = asyncio.run(burst())
+        assert [r.json() for r in responses] == expected
+        assert prediction_batcher.batches == batches + 1
+
+
+def _gap_request(user_id, role_id, skills):
+    return {
+        "userId": user_id,
+        "skillProfile": {
+            "userId": user_id,
+            "skills": [
+                {
+                    "skillId": skill_id,
+                    "skillName": skill_id,
+                    "proficiencyLevel": level,
+                    "confidence": 0.8,
+                    "assessedAt": "2024-01-01T00:00:00Z",
+                    "source": "quiz",
+                }
+                for skill_id, level in skills
+            ],
+            "overallScore": 50,
+            "lastUpdated": "2024-01-01T00:00:00Z",
+        },
+        "targetRoleId": role_id,
+    }
+
+
+class TestGapStream:
+    """Tests for /api/v1/analyze/gaps:stream"""
+
+    def test_stream_matches_single_requests(self, client):
+        payloads = [
+            _gap_request("u1", "frontend_developer", [("js", 4), ("react", 2)]),
+            _gap_request("u2", "data_scientist", []),
+        ]
+
+        def body():
+            for payload in payloads:
+                # Split each line across chunks to exercise buffering
+                line = json.dumps(payload).encode() + b"\n"
+                yield line[:10]
+                yield line[10:]
+
+        response = client.post("/api/v1/analyze/gaps:stream", content=body())
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 2
+        for payload, line in zip(payloads, lines):
+            single = client.post("/api/v1/analyze/gaps", json=payload).json()
+            assert line == single
+
+    def test_bad_line_reports_error_and_continues(self, client):
+        body = b"\n".join([
+            b"{not json",
+            json.dumps(_gap_request("u1", "backend_developer", [])).encode(),
+        ])
+        response = client.post("/api/v1/analyze/gaps:stream", content=body)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        assert lines[0]["line"] == 1
+        assert lines[0]["error"].startswith("Invalid request")
+        assert "gaps" in lines[1]
+
+    def test_error_line_numbers_count_blank_lines(self, client):
+        body = b"\n".join([
+            json.dumps(_gap_request("u1", "backend_developer", [])).encode(),
+            b"",
+            b"   ",
+            b"{not json",
+        ])
+        response = client.post("/api/v1/analyze/gaps:stream", content=body)
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        assert "gaps" in lines[0]
+        assert lines[1]["line"] == 4
+
+    def test_oversized_line_within_one_chunk_is_rejected(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "ndjson_max_line_bytes", 100)
+        line = json.dumps(_gap_request("u1", "backend_developer", [])).encode()
+        assert len(line) > 100
+        response = client.post(
+            "/api/v1/analyze/gaps:stream", content=b"\n" + line + b"\n{}\n"
+        )
+        lines = [json.loads(line) for line in response.text.splitlines()]
+
+        assert lines == [{"line": 2, "error": "NDJSON line exceeds 100 bytes"}]
+
+
+class TestRoleFit:
+    """Tests for /api/v1/analyze/roles"""
+
+    def test_returns_top_k_roles(self, client):
+        profile = _gap_request("u1", "", [("js", 4), ("react", 4)])["skillProfile"]
+        response = client.post(
+            "/api/v1/analyze/roles", json={"skillProfile": profile, "topK": 3}
+        )
+        assert response.status_code == 200
+        roles = response.json()["roles"]
+
+        assert len(roles) == 3
+        assert roles[0]["roleId"] == "frontend_developer"
+        assert all(len(r["topGaps"]) <= 3 for r in roles)
+
+    def test_rejects_invalid_top_k(self, client):
+        profile = _gap_request("u1", "", [])["skillProfile"]
+        response = client.post(
+            "/api/v1/analyze/roles", json={"skillProfile": profile, "topK": 0}
+        )
+        assert response.status_code == 422
+
+
+class TestRecommendations:
+    """Tests for /api/v1/recommend"""
+
+    def test_limit_is_applied(self, client):
+        gaps = [
+            {"skillId": s, "skillName": s, "gapSize": 3, "priority": "high"}
+            for s in ["Python", "SQL", "Git"]
+        ]
+        response = client.post(
+            "/api/v1/recommend", json={"userId": "u1", "gaps": gaps, "limit": 2}
+        )
+        assert response.status_code == 200
+        assert len(response.json()["recommendations"]) == 2
+
+    def test_limit_above_maximum_rejected(self, client):
+        response = client.post(
+            "/api/v1/recommend", json={"userId": "u1", "gaps": [], "limit": 10_000}
+        )
+        assert response.status_code == 422
+
+
+class TestPipeline:
+    """Tests for /api/v1/pipeline"""
+
+    def test_matches_chained_calls(self, client):
+        request = _gap_request("u1", "frontend_developer", [("js", 2), ("react", 1)])
+        request["assessmentResponses"] = _responses("react", ["5", "a", "b"])
+        body = client.post("/api/v1/pipeline", json=request).json()
+
+        prediction = client.post("/api/v1/predict/proficiency", json={
+            "userId": "u1", "assessmentResponses": request["assessmentResponses"],
+        }).json()
+        assert body["prediction"] == prediction
+
+        predicted = prediction["predictions"][0]
+        profile_request = _gap_request("u1", "frontend_developer", [
+            ("js", 2), ("react", 1), ("react", predicted["proficiencyLevel"]),
+        ])
+        analysis = client.post("/api/v1/analyze/gaps", json=profile_request).json()
+        assert body["gapAnalysis"] == analysis
+
+        recommendations = client.post("/api/v1/recommend", json={
+            "userId": "u1", "gaps": analysis["gaps"],
+        }).json()
+        assert body["recommendations"] == recommendations["recommendations"]
+
+    def test_stage_selection(self, client):
+        request = _gap_request("u1", "backend_developer", [("python", 1)])
+        request["stages"] = ["gaps"]
+        body = client.post("/api/v1/pipeline", json=request).json()
+        assert body["prediction"] is None and body["recommendations"] is None
+        assert body["gapAnalysis"]["gaps"]
+
+        gaps = [{"skillId": "s", "skillName": "SQL", "gapSize": 2, "priority": "high"}]
+        body = client.post("/api/v1/pipeline", json={
+            "userId": "u1", "stages": ["recommend"], "gaps": gaps, "limit": 1,
+        }).json()
+        assert len(body["recommendations"]) == 1
+
+    def test_missing_stage_input(self, client):
+        response = client.post("/api/v1/pipeline", json={
+            "userId": "u1", "stages": ["predict", "gaps"], "assessmentResponses": [],
+        })
+        assert response.status_code == 422
+
+
+class TestFastResponses:
+    """Tests for the trusted-output serialization path"""
+
+    def test_same_bodies_as_validated_responses(self, client, monkeypatch):
+        gap_request = _gap_request("u1", "frontend_developer", [("js", 2), ("react", 5)])
+        calls = [
+            ("/api/v1/predict/proficiency", {
+                "userId": "u1", "assessmentResponses": _responses("js", ["4", "a", "b"]),
+            }),
+            ("/api/v1/predict/proficiency:batch", {"requests": [
+                {"userId": "u1", "assessmentResponses": _responses("js", ["1"])},
+                {"userId": "u2"},
+            ]}),
+            ("/api/v1/analyze/gaps", gap_request),
+            ("/api/v1/analyze/roles", {"skillProfile": gap_request["skillProfile"]}),
+            ("/api/v1/recommend", {"userId": "u1", "gaps": [
+                {"skillId": "s", "skillName": "React", "gapSize": 3, "priority": "high"},
+            ]}),
+            ("/api/v1/pipeline", dict(gap_request, assessmentResponses=_responses("git", ["b"]))),
+        ]
+        for path, payload in calls:
+            monkeypatch.setattr(settings, "fast_responses", False)
+            validated = client.post(path, json=payload)
+            monkeypatch.setattr(settings, "fast_responses", True)
+            fast = client.post(path, json=payload)
+
+            assert fast.status_code == validated.status_code == 200
+            assert fast.json() == validated.json(), path
+
+    def test_openapi_keeps_response_models(self, client):
+        schema = client.get("/openapi.json").json()
+        response = schema["paths"]["/api/v1/recommend"]["post"]["responses"]["200"]
+        assert response["content"]["application/json"]["schema"] == {
+            "$ref": "#/components/schemas/RecommendationResponse"
+        }
+
+
+class TestMetricsEndpoint:
+    """Tests for /metrics"""
+
+    def test_records_stages_and_fallbacks(self, client):
+        from app.utils.metrics import FALLBACKS, REQUEST_STAGE_SECONDS
+
+        route = "/api/v1/analyze/gaps"
+        parsed = REQUEST_STAGE_SECONDS.count((route, "parse"))
+        fallbacks = FALLBACKS.value(("role",))
+
+        request = _gap_request("u1", "65f1c0ffee0123456789abcd", [("js", 1)])
+        assert client.post(route, json=request).status_code == 200
+
+        assert REQUEST_STAGE_SECONDS.count((route, "parse")) == parsed + 1
+        assert REQUEST_STAGE_SECONDS.count((route, "serialize")) == parsed + 1
+        assert FALLBACKS.value(("role",)) == fallbacks + 1
+
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        text = response.text
+        assert f'skillsense_requests_total{{route="{route}",status="200"}}' in text
+        assert 'skillsense_service_seconds_count{method="analyze_gaps"}' in text
+        assert 'skillsense_cache_misses_total{cache="gap_analysis"}' in text
+
+    def test_records_chunked_request_size(self, client):
+        from app.utils.metrics import REQUEST_BYTES
+
+        route = ("/api/v1/analyze/gaps:stream",)
+        count, total = REQUEST_BYTES.count(route), REQUEST_BYTES.sum(route)
+        line = json.dumps(_gap_request("u1", "frontend_developer", [("js", 2)])).encode() + b"\n"
+
+        def body():
+            yield line[:10]
+            yield line[10:]
+
+        response = client.post(route[0], content=body())
+        assert response.status_code == 200
+        assert "content-length" not in response.request.headers
+        assert REQUEST_BYTES.count(route) == count + 1
+        assert REQUEST_BYTES.sum(route) == total + len(line)
+
+
+class TestAdmin:
+    """Tests for /admin endpoints"""
+
+    def test_disabled_without_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "")
+        assert client.post("/admin/data/reload").status_code == 403
+
+    def test_requires_matching_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        assert client.post(
+            "/admin/data/reload", headers={"X-Admin-Token": "wrong"}
+        ).status_code == 401
+
+        response = client.post("/admin/data/reload", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 200
+        assert response.json() == {"roles": "builtin", "catalog": "builtin"}
+
+    def test_register_role_aliases(self, client, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        monkeypatch.setattr(settings, "role_aliases_path", str(tmp_path / "aliases.json"))
+        headers = {"X-Admin-Token": "secret"}
+        object_id = "65f1c0ffee0123456789abcd"
+        try:
+            response = client.post(
+                "/admin/roles/aliases",
+                json={"aliases": {object_id: "data_scientist"}},
+                headers=headers,
+            )
+            assert response.json() == {"registered": 1, "total": 1}
+
+            rejected = client.post(
+                "/admin/roles/aliases", json={"aliases": {"x": "astronaut"}}, headers=headers
+            )
+            assert rejected.status_code == 400
+
+            aliases = client.get("/admin/roles/aliases", headers=headers).json()
+            assert aliases == {"aliases": {object_id: "data_scientist"}}
+        finally:
+            client.post(
+                "/admin/roles/aliases", json={"aliases": {}, "replace": True}, headers=headers
+            )
+
+    def test_profiler_session(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "admin_token", "secret")
+        headers = {"X-Admin-Token": "secret"}
+        try:
+            started = client.post(
+                "/admin/profiler/start",
+                json={"sampleRate": 1, "durationSeconds": 30, "intervalMs": 1},
+                headers=headers,
+            ).json()
+            assert started["active"] is True
+
+            response = client.post("/api/v1/predict/proficiency:batch", json={"requests": [
+                {"userId": f"p{i}", "assessmentResponses": _responses(f"s{i}", ["4", "a"] * 300)}
+                for i in range(20)
+            ]})
+            assert response.status_code == 200
+        finally:
+            stopped = client.post("/admin/profiler/stop", headers=headers).json()
+
+        assert stopped["active"] is False
+        assert stopped["sampledRequests"] == 1
+
+        speedscope = client.get("/admin/profiler?format=speedscope", headers=headers).json()
+        assert speedscope["profiles"][0]["type"] == "sampled"
+        collapsed = client.get("/admin/profiler?format=collapsed", headers=headers)
+        assert collapsed.headers["content-type"].startswith("text/plain")
+        assert client.get("/admin/profiler?format=pprof", headers=headers).status_code == 400
+
+        too_long = client.post(
+            "/admin/profiler/start", json={"sampleRate": 1, "durationSeconds": 86400},
+            headers=headers,
+        )
+        assert too_long.status_code == 422
+
+    def test_readiness_reports_data_version(self, client):
+        body = client.get("/health/ready").json()
+        assert body["data_version"] == {"roles": "builtin", "catalog": "builtin"}
+
+    def test_readiness_waits_for_warmup(self, client, monkeypatch):
+        from app.services.warmup import COMPONENTS, warmup_service
+
+        body = client.get("/health/ready").json()
+        assert body["ready"] and body["warmup"]["state"] == "ready"
+        assert set(body["warmup"]["components"]) == set(COMPONENTS)
+        assert all(c["ready"] for c in body["warmup"]["components"].values())
+
+        monkeypatch.setattr(warmup_service, "state", "running")
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
@@ -2,9 +2,104 @@
 Tests for the ML service gap analyzer and recommender
 """
 
+import asyncio
+import json
+import random
+import socketserver
+import threading
+
 import pytest
-from app.services.gap_analyzer import gap_analyzer_service, ROLE_REQUIREMENTS
-from app.services.recommender import recommender_service, LEARNING_RESOURCES
+from app.config import settings
+from app.services.gap_analyzer import (
+    CompiledRoles,
+    RoleRequirements,
+    ROLE_REQUIREMENTS,
+    gap_analyzer_service,
+    load_role_aliases,
+    load_roles,
+    write_role_aliases,
+)
+from app.services.predictor import predictor_service
+from app.services.catalog import BuiltinCatalog, MappedCatalog, load_catalog, write_catalog
+from app.services import tasks
+from app.services.data_store import data_store
+from app.services.executor import ExecutorSaturated, ScoringExecutor
+from app.services.recommender import (
+    LEARNING_RESOURCES,
+    MAX_GAP_SIZE,
+    RELEVANCE_THRESHOLD,
+    RecommenderService,
+    recommender_service,
+)
+from app.utils.batching import MicroBatcher
+from app.utils.metrics import Registry
+from app.utils.profiler import SamplingProfiler
+from app.utils.cache import LRUCache, RedisCache, RedisError, SQLiteCache, create_cache
+from app.utils.skill_index import SkillNameIndex
+
+
+# ── Predictor Tests ────────────────────────────────────────────────
+
+
+class TestPredictor:
+    """Tests for PredictorService"""
+
+    def _make_responses(self, seed, count):
+        """Helper to build a random mix of objective and self-rating responses"""
+        rng = random.Random(seed)
+        skills = [f"skill{i}" for i in range(rng.randint(1, 8))]
+        responses = []
+        for i in range(count):
+            skill_id = rng.choice(skills)
+            response = {
+                "questionId": f"q{i}",
+                "skillId": skill_id,
+                "skillName": skill_id.title(),
+                "answer": rng.choice(["1", "3", "5", "a", "b", ["a", "b"], "9"]),
+                "timeSpent": rng.choice([5, 29, 30, 60, 120, 121, 300]),
+            }
+            if rng.random() < 0.7:
+                response["isCorrect"] = rng.random() < 0.6
+            if rng.random() < 0.5:
+                response["difficultyWeight"] = rng.choice([0.5, 1.0, 1.5, 2.0])
+            responses.append(response)
+        return responses
+
+    def _reference(self, responses):
+        """Per-skill scalar path the vectorized engine must reproduce"""
+        by_skill = {}
+        for response in responses:
+            by_skill.setdefault(response["skillId"], []).append(response)
+        predictions = [
+            predictor_service._predict_skill_proficiency(skill_id, group)
+            for skill_id, group in by_skill.items()
+        ]
+        total = 0.0
+        for p in predictions:
+            total += p["confidence"]
+        avg = total / len(predictions) if predictions else 0.0
+        return {"predictions": predictions, "confidence": round(avg, 2)}
+
+    def test_empty_responses(self):
+        result = predictor_service.predict_proficiency("u1", [])
+        assert result == {"predictions": [], "confidence": 0.0}
+
+    def test_matches_per_skill_reference(self):
+        """Vectorized engine should agree exactly with the per-skill model"""
+        for seed in range(200):
+            responses = self._make_responses(seed, random.Random(seed).randint(1, 80))
+            assert predictor_service.predict_proficiency("u2", responses) == (
+                self._reference(responses)
+            ), f"Mismatch for seed {seed}"
+
+    def test_responses_without_skill_are_ignored(self):
+        responses = [
+            {"questionId": "q1", "skillId": "", "answer": "a", "timeSpent": 10},
+            {"questionId": "q2", "skillId": "js", "answer": "4", "timeSpent": 10},
+        ]
+        result = predictor_service.predict_proficiency("u3", responses)
+        assert [p["skillId"] for p in result["predictions"]] == ["js"]
+        assert result["predictions"][0]["proficiencyLevel"] == 5
 
 
 # ── Gap Analyzer Tests ──────────────────────────────────────────────
@@ -108,6 +203,196 @@ class TestGapAnalyzer:
         }
         assert expected.issubset(set(ROLE_REQUIREMENTS.keys()))
 
+    def test_readiness_matches_reference(self):
+        """Compiled readiness should equal the per-requirement calculation"""
+        rng = random.Random(7)
+        for role_key, role in ROLE_REQUIREMENTS.items():
+            for _ in range(50):
+                skills = [
+                    {"skillId": req["skillId"], "proficiencyLevel": rng.randint(0, 5)}
+                    for req in role["skills"]
+                    if rng.random() < 0.7
+                ]
+                result = gap_analyzer_service.analyze_gaps(
+                    "u7", self._make_profile(skills), role_key
+                )
+                assert result["overallReadiness"] == (
+                    gap_analyzer_service._calculate_readiness(result["gaps"], role["skills"])
+                )
+
+    def test_roles_file_loads_compact(self, tmp_path):
+        """Roles read from a file are compacted without changing results"""
+        path = tmp_path / "roles.json"
+        path.write_text(json.dumps({"version": "v1", "roles": ROLE_REQUIREMENTS}))
+        roles, version = load_roles(str(path))
+
+        assert version == "v1"
+        assert all(isinstance(role, RoleRequirements) for role in roles.values())
+        assert {key: role.to_dict() for key, role in roles.items()} == ROLE_REQUIREMENTS
+
+        compiled, reference = CompiledRoles(roles), CompiledRoles(ROLE_REQUIREMENTS)
+        assert (compiled.required_matrix == reference.required_matrix).all()
+        assert compiled.skill_index == reference.skill_index
+
+    def test_large_gap_time_estimate(self):
+        """Gaps beyond the tabulated range should still be estimated"""
+        profile = self._make_profile([{"skillId": "ds", "proficiencyLevel": -3}])
+        result = gap_analyzer_service.analyze_gaps("u8", profile, "default")
+
+        gap = next(g for g in result["gaps"] if g["skillId"] == "ds")
+        assert gap["gapSize"] == 7
+        assert gap["priority"] == "critical"
+        assert gap["estimatedTimeToClose"] == (
+            gap_analyzer_service._estimate_time_to_close(7, "ds")
+        )
+
+    def test_title_lookup(self):
+        """Role titles should resolve to their requirement keys"""
+        assert gap_analyzer_service._resolve_role_key("Frontend Developer") == (
+            "frontend_developer"
+        )
+        assert gap_analyzer_service._resolve_role_key("full-stack-developer") == (
+            "full_stack_developer"
+        )
+
+    def test_object_ids_resolve_through_aliases(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "role_aliases_path", str(tmp_path / "aliases.json"))
+        object_id = "65f1c0ffee0123456789abcd"
+        try:
+            assert gap_analyzer_service._resolve_role_key(object_id) == "default"
+            misses = gap_analyzer_service.data.resolve_role_key.cache_info().misses
+            gap_analyzer_service._resolve_role_key(object_id)
+            assert gap_analyzer_service.data.resolve_role_key.cache_info().misses == misses
+
+            gap_analyzer_service.register_role_aliases({object_id: "Backend Developer"})
+            assert gap_analyzer_service._resolve_role_key(object_id) == "backend_developer"
+            assert gap_analyzer_service.role_aliases == {object_id: "backend_developer"}
+
+            with pytest.raises(ValueError):
+                gap_analyzer_service.register_role_aliases({"abc": "astronaut"})
+
+            data_store.reload()
+            assert gap_analyzer_service._resolve_role_key(object_id) == "backend_developer"
+            assert load_role_aliases() == {object_id: "backend_developer"}
+        finally:
+            gap_analyzer_service.register_role_aliases({}, replace=True)
+
+        assert gap_analyzer_service._resolve_role_key(object_id) == "default"
+
+    def test_workers_sharing_the_alias_file_keep_each_others_aliases(self, tmp_path, monkeypatch):
+        from app.services.gap_analyzer import GapAnalyzerService
+
+        monkeypatch.setattr(settings, "role_aliases_path", str(tmp_path / "aliases.json"))
+        worker_a, worker_b = GapAnalyzerService(), GapAnalyzerService()
+        worker_a.initialize()
+        worker_b.initialize()
+
+        worker_a.register_role_aliases({"65f1c0ffee0123456789aaaa": "data_scientist"})
+        worker_b.register_role_aliases({"65f1c0ffee0123456789bbbb": "backend_developer"})
+
+        expected = {
+            "65f1c0ffee0123456789aaaa": "data_scientist",
+            "65f1c0ffee0123456789bbbb": "backend_developer",
+        }
+        assert load_role_aliases() == expected
+        assert worker_b.role_aliases == expected
+
+    def test_publish_keeps_aliases_registered_during_build(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "role_aliases_path", str(tmp_path / "aliases.json"))
+        object_id = "65f1c0ffee0123456789abcd"
+        try:
+            # A reload builds its snapshot while another request registers
+            building = gap_analyzer_service.build_data(*load_roles())
+            gap_analyzer_service.register_role_aliases({object_id: "data_scientist"})
+            gap_analyzer_service.publish(building)
+
+            assert gap_analyzer_service._resolve_role_key(object_id) == "data_scientist"
+        finally:
+            gap_analyzer_service.register_role_aliases({}, replace=True)
+
+    def test_aliases_from_another_worker_are_picked_up(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "role_aliases_path", str(tmp_path / "aliases.json"))
+        object_id = "65f1c0ffee0123456789abcd"
+        data_store.reload()
+        data = gap_analyzer_service.data
+        try:
+            write_role_aliases({object_id: "data_scientist"})
+            assert data_store.check_for_changes() is True
+
+            assert gap_analyzer_service.data.compiled is data.compiled
+            assert gap_analyzer_service._resolve_role_key(object_id) == "data_scientist"
+        finally:
+            gap_analyzer_service.register_role_aliases({}, replace=True)
+
+    def test_rank_roles_matches_analyze_gaps(self):
+        """Per-role readiness from rank_roles should equal analyze_gaps"""
+        self._check_rank_roles_matches_analyze_gaps(random.Random(11))
+
+    def test_rank_roles_matches_analyze_gaps_with_level_zero(self, data_dir):
+        roles = dict(ROLE_REQUIREMENTS, qa_engineer={
+            "title": "QA Engineer",
+            "skills": [
+                {"skillId": "testing", "skillName": "Testing",
+                 "requiredLevel": 0, "importance": "must_have"},
+                {"skillId": "js", "skillName": "JavaScript",
+                 "requiredLevel": 3, "importance": "good_to_have"},
+            ],
+        })
+        (data_dir / "roles.json").write_text(json.dumps(roles))
+        data_store.reload()
+
+        profile = self._make_profile([{"skillId": "js", "proficiencyLevel": 3}])
+        qa = next(r for r in gap_analyzer_service.rank_roles(profile) if r["roleId"] == "qa_engineer")
+        assert qa["readiness"] == 100.0
+        self._check_rank_roles_matches_analyze_gaps(random.Random(12))
+
+    def _check_rank_roles_matches_analyze_gaps(self, rng):
+        skill_ids = list(gap_analyzer_service.compiled.skill_index)
+        for _ in range(100):
+            skills = [
+                {"skillId": rng.choice(skill_ids), "proficiencyLevel": rng.randint(0, 5)}
+                for _ in range(rng.randint(0, 10))
+            ]
+            profile = self._make_profile(skills)
+            ranked = gap_analyzer_service.rank_roles(profile)
+
+            assert {r["roleId"] for r in ranked} == set(gap_analyzer_service.compiled.keys) - {"default"}
+            readiness = [r["readiness"] for r in ranked]
+            assert readiness == sorted(readiness, reverse=True)
+            for role in ranked:
+                analysis = gap_analyzer_service.analyze_gaps("u9", profile, role["roleId"])
+                assert role["readiness"] == analysis["overallReadiness"]
+                assert role["topGaps"] == analysis["gaps"][:3]
+
+    def test_rank_roles_top_k(self):
+        profile = self._make_profile([{"skillId": "python", "proficiencyLevel": 5}])
+        ranked = gap_analyzer_service.rank_roles(profile, top_k=2, max_gaps=1)
+
+        assert len(ranked) == 2
+        assert ranked[0]["roleId"] == "data_scientist"
+        assert all(len(r["topGaps"]) <= 1 for r in ranked)
+
+    def test_cache_hits_for_equivalent_profiles(self):
+        """Reordered skills and changed metadata should reuse the cached result"""
+        gap_analyzer_service.cache.clear()
+        skills = [
+            {"skillId": "js", "proficiencyLevel": 2, "assessedAt": "2024-01-01"},
+            {"skillId": "react", "proficiencyLevel": 3, "assessedAt": "2024-01-01"},
+        ]
+        first = gap_analyzer_service.analyze_gaps("u10", self._make_profile(skills), "frontend_developer")
+        hits = gap_analyzer_service.cache.hits
+
+        reordered = [dict(s, assessedAt="2025-06-01") for s in reversed(skills)]
+        second = gap_analyzer_service.analyze_gaps(
+            "u11", self._make_profile(reordered), "Frontend Developer"
+        )
+        assert second is first
+        assert gap_analyzer_service.cache.hits == hits + 1
+
+        changed = [dict(skills[0], proficiencyLevel=4), skills[1]]
+        third = gap_analyzer_service.analyze_gaps("u10", self._make_profile(changed), "frontend_developer")
+        assert third is not first
+
     def test_estimated_time_positive(self):
         """Every gap's estimatedTimeToClose should be positive"""
         profile = self._make_profile([])
@@ -162,6 +447,19 @@ class TestRecommender:
         recs = recommender_service.generate_recommendations("u3", gaps)
         assert len(recs) <= 10
 
+    def test_custom_limit(self):
+        """A custom limit should cap results and keep the same leading items"""
+        gaps = [
+            {"skillId": s, "skillName": s, "gapSize": 3, "priority": "high"}
+            for s in ["Python", "SQL", "Git", "React", "Algorithms"]
+        ]
+        full = recommender_service.generate_recommendations("u7", gaps, limit=100)
+        top3 = recommender_service.generate_recommendations("u7", gaps, limit=3)
+
+        assert len(full) > 10
+        assert top3 == full[:3]
+        assert recommender_service.generate_recommendations("u7", gaps) == full[:10]
+
     def test_no_duplicate_resources(self):
         """Each recommendation title+provider should be unique"""
         gaps = [
@@ -203,6 +501,31 @@ class TestRecommender:
                 f"Missing fields: {required_fields - set(rec.keys())}"
             )
 
+    def test_score_tables_sorted_and_consistent(self):
+        """Score tables should rank exactly the relevant resources by descending score"""
+        for key in LEARNING_RESOURCES:
+            table = recommender_service.score_table(key)
+            for gap_size in range(MAX_GAP_SIZE + 1):
+                ranked = [table.resources[i] for i in table.rankings[gap_size]]
+                scores = [recommender_service._score_resource(r, gap_size) for r in ranked]
+                assert scores == sorted(scores, reverse=True)
+                assert all(score > RELEVANCE_THRESHOLD for score in scores)
+                left_out = [r for r in table.resources if r not in ranked]
+                assert all(
+                    recommender_service._score_resource(r, gap_size) <= RELEVANCE_THRESHOLD
+                    for r in left_out
+                )
+
+    def test_recommendations_ordered_by_gap_priority(self):
+        gaps = [
+            {"skillId": "sql", "skillName": "SQL", "gapSize": 1, "priority": "low"},
+            {"skillId": "git", "skillName": "Git", "gapSize": 3, "priority": "critical"},
+        ]
+        recs = recommender_service.generate_recommendations("u6", gaps)
+        priorities = [r["priority"] for r in recs]
+        assert priorities == sorted(priorities)
+        assert recs[0]["skillId"] == "git"
+
     def test_resource_catalog_covers_all_core_skills(self):
         """Key skills from seed data should have resources (not just default)"""
         core_keys = [
@@ -213,3 +536,781 @@ class TestRecommender:
         for key in core_keys:
             assert key in LEARNING_RESOURCES, f"Missing resources for '{key}'"
             assert len(LEARNING_RESOURCES[key]) > 0
+
+
+class TestCatalog:
+    """Tests for the on-disk resource catalog"""
+
+    def test_round_trip(self, tmp_path):
+        version = write_catalog(LEARNING_RESOURCES, str(tmp_path))
+        catalog = load_catalog({}, path=str(tmp_path))
+
+        assert isinstance(catalog, MappedCatalog)
+        assert catalog.version == version
+        assert catalog.keys == list(LEARNING_RESOURCES)
+        for key, resources in LEARNING_RESOURCES.items():
+            assert [r.to_dict() for r in catalog.resources(key)] == resources
+
+    def test_missing_directory_uses_builtin(self, tmp_path):
+        catalog = load_catalog(LEARNING_RESOURCES, path=str(tmp_path / "none"))
+        assert catalog.version == "builtin"
+        assert [r.to_dict() for r in catalog.resources("react")] == LEARNING_RESOURCES["react"]
+
+    def test_recommender_on_mapped_catalog(self, tmp_path):
+        """Recommendations should not depend on the catalog backend"""
+        write_catalog(LEARNING_RESOURCES, str(tmp_path))
+        mapped = RecommenderService(catalog=load_catalog({}, path=str(tmp_path)))
+        gaps = [
+            {"skillId": s, "skillName": s, "gapSize": g, "priority": p}
+            for s, g, p in [("Node.js", 2, "high"), ("SQL", 1, "low"), ("Ruby", 3, "critical")]
+        ]
+        assert mapped.generate_recommendations("u1", gaps) == (
+            recommender_service.generate_recommendations("u1", gaps)
+        )
+
+    def test_mapped_catalog_is_scored_lazily(self, tmp_path):
+        write_catalog(LEARNING_RESOURCES, str(tmp_path))
+        mapped = RecommenderService(catalog=load_catalog({}, path=str(tmp_path)))
+        assert mapped.data.score_table.cache_info().currsize == 0
+
+        builtin = RecommenderService()
+        assert builtin.data.score_table.cache_info().currsize == len(LEARNING_RESOURCES)
+
+    def test_unicode_and_missing_level(self, tmp_path):
+        resources = {
+            "café": [{"title": "Crème ☕", "type": "video", "provider": "Ü",
+                      "url": "https://x/é", "duration": 1}],
+            "empty": [],
+            "default": LEARNING_RESOURCES["default"],
+        }
+        write_catalog(resources, str(tmp_path), version="v1")
+        catalog = load_catalog({}, path=str(tmp_path))
+        assert [r.to_dict() for r in catalog.resources("café")] == resources["café"]
+        assert catalog.resources("café")[0].level is None
+        assert catalog.resources("empty") == ()
+
+    def test_catalog_without_default_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="default"):
+            write_catalog({"react": LEARNING_RESOURCES["react"]}, str(tmp_path))
+
+        # A directory written by an older build without the check
+        write_catalog(LEARNING_RESOURCES, str(tmp_path))
+        meta_path = tmp_path / "meta.json"
+        meta = json.loads(meta_path.read_text())
+        meta["skills"] = ["fallback" if key == "default" else key for key in meta["skills"]]
+        meta_path.write_text(json.dumps(meta))
+        with pytest.raises(ValueError, match="default"):
+            load_catalog({}, path=str(tmp_path))
+
+    def test_vocabulary_strings_are_shared(self, tmp_path):
+        write_catalog(LEARNING_RESOURCES, str(tmp_path))
+        for catalog in (load_catalog({}, path=str(tmp_path)), BuiltinCatalog(LEARNING_RESOURCES)):
+            resources = [r for key in catalog.keys for r in catalog.resources(key)]
+            assert len({id(r.provider) for r in resources}) == len({r.provider for r in resources})
+            assert len({id(r.type) for r in resources}) == len({r.type for r in resources})
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point role and catalog sources at a temp dir; restore built-ins after"""
+    monkeypatch.setattr(settings, "roles_path", str(tmp_path / "roles.json"))
+    monkeypatch.setattr(settings, "catalog_path", str(tmp_path / "catalog"))
+    monkeypatch.setattr(settings, "role_aliases_path", str(tmp_path / "aliases.json"))
+    yield tmp_path
+    monkeypatch.undo()
+    data_store.reload()
+
+
+class TestDataStore:
+    """Tests for hot-reloading role and catalog snapshots"""
+
+    def test_reload_swaps_snapshots(self, data_dir):
+        roles = {
+            "default": ROLE_REQUIREMENTS["default"],
+            "qa_engineer": {
+                "title": "QA Engineer",
+                "skills": [
+                    {"skillId": "testing", "skillName": "Testing",
+                     "requiredLevel": 4, "importance": "must_have"},
+                ],
+            },
+        }
+        (data_dir / "roles.json").write_text(json.dumps({"version": "v2", "roles": roles}))
+        write_catalog(
+            {"testing": LEARNING_RESOURCES["default"], "default": LEARNING_RESOURCES["default"]},
+            str(data_dir / "catalog"), version="c2",
+        )
+        old_data = gap_analyzer_service.data
+
+        assert data_store.reload() == {"roles": "v2", "catalog": "c2"}
+
+        result = gap_analyzer_service.analyze_gaps("u1", {"skills": []}, "QA Engineer")
+        assert [g["skillId"] for g in result["gaps"]] == ["testing"]
+        recs = recommender_service.generate_recommendations(
+            "u1", [{"skillId": "testing", "skillName": "Testing", "gapSize": 2, "priority": "high"}]
+        )
+        assert recs[0]["title"] == LEARNING_RESOURCES["default"][0]["title"]
+
+        # A request holding the previous snapshot still sees the old roles
+        assert "frontend_developer" in old_data.compiled.role_index
+
+    def test_invalid_roles_keep_active_snapshot(self, data_dir):
+        before = data_store.versions()
+        (data_dir / "roles.json").write_text(json.dumps({"qa": {"title": "QA"}}))
+
+        with pytest.raises(ValueError):
+            data_store.reload()
+        assert data_store.versions() == before
+
+    def test_change_detection(self, data_dir):
+        data_store.reload()
+        assert data_store.check_for_changes() is False
+
+        roles = {"default": ROLE_REQUIREMENTS["default"]}
+        (data_dir / "roles.json").write_text(json.dumps(roles))
+        assert data_store.check_for_changes() is True
+        assert data_store.versions()["roles"] != "builtin"
+
+
+class TestLRUCache:
+    """Tests for LRUCache"""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1 and cache.get("c") == 3
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["hits"] == 3
+
+    def test_ttl_expiry(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("app.utils.cache.time.monotonic", lambda: now[0])
+        cache = LRUCache(maxsize=10, ttl=5)
+        cache.set("a", 1)
+        now[0] += 4
+        assert cache.get("a") == 1
+        now[0] += 2
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_reads_do_not_write(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "c.db"), "ns", maxsize=10)
+        cache.set_many([("a", 1), ("b", 2)])
+        conn = cache._connection()
+        changes = conn.total_changes
+
+        assert cache.get_many(["b", "missing", "a"]) == [2, None, 1]
+        assert conn.total_changes == changes
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_zero_size_disables(self):
+        cache = LRUCache(maxsize=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None and len(cache) == 0
+
+
+class TestSQLiteCache:
+    """Tests for SQLiteCache"""
+
+    def test_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        worker_a = SQLiteCache(path, "gaps", maxsize=10)
+        worker_b = SQLiteCache(path, "gaps", maxsize=10)
+        other = SQLiteCache(path, "recommendations", maxsize=10)
+
+        worker_a.set("k", {"gaps": [1, 2], "score": 0.5})
+        assert worker_b.get("k") == {"gaps": [1, 2], "score": 0.5}
+        assert other.get("k") is None
+        assert worker_b.stats()["hits"] == 1
+
+        worker_b.clear()
+        assert worker_a.get("k") is None
+
+    def test_trims_least_recently_used(self, tmp_path):
+        cache = SQLiteCache(str(tmp_path / "c.db"), "ns", maxsize=3, trim_interval=1)
+        for key in "abc":
+            cache.set(key, key)
+        cache.get("a")
+        cache.set("d", "d")
+
+        assert cache.size() == 3
+        assert cache.get("b") is None
+        assert cache.get("a") == "a"
+        assert cache.stats()["evictions"] == 1
+
+    def test_ttl_expiry(self, tmp_path, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr("app.utils.cache.time.time", lambda: now[0])
+        cache = SQLiteCache(str(tmp_path / "c.db"), "ns", maxsize=10, ttl=5)
+        cache.set("a", 1)
+        now[0] += 6
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+
+class _FakeRedisHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough RESP for RedisCache"""
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2].decode())
+        return args
+
+    def bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        data = value.encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            if self.server.drop_connection:
+                # Close without replying, like a server dropping an idle client
+                self.server.drop_connection = False
+                return
+            command = args[0].upper()
+            self.server.commands.append(args)
+            if command == "GET":
+                reply = self.bulk(store.get(args[1]))
+            elif command == "MGET":
+                reply = b"*%d\r\n" % (len(args) - 1)
+                reply += b"".join(self.bulk(store.get(key)) for key in args[1:])
+            elif command == "DBSIZE":
+                reply = b":%d\r\n" % len(store)
+            elif command == "SET":
+                store[args[1]] = args[2]
+                reply = b"+OK\r\n"
+            elif command == "DEL":
+                removed = sum(store.pop(key, None) is not None for key in args[1:])
+                reply = b":%d\r\n" % removed
+            elif command == "SCAN":
+                prefix = args[3].rstrip("*")
+                keys = [key for key in store if key.startswith(prefix)]
+                reply = b"*2\r\n" + self.bulk("0") + b"*%d\r\n" % len(keys)
+                reply += b"".join(self.bulk(key) for key in keys)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def fake_redis():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _FakeRedisHandler)
+    server.daemon_threads = True
+    server.store, server.commands, server.drop_connection = {}, [], False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestRedisCache:
+    """Tests for RedisCache against a local fake server"""
+
+    def test_round_trip_and_clear(self, fake_redis):
+        url = "redis://127.0.0.1:%d/0" % fake_redis.server_address[1]
+        cache = RedisCache(url, "gaps", maxsize=10, ttl=2.5)
+        cache.set("k", {"readiness": 40})
+
+        assert cache.get("k") == {"readiness": 40}
+        assert cache.get("missing") is None
+        assert ["SET", "skillsense:gaps:k", '{"readiness":40}', "PX", "2500"] in fake_redis.commands
+
+        fake_redis.store["skillsense:other:k"] = "1"
+        cache.clear()
+        assert "skillsense:other:k" in fake_redis.store
+        # DBSIZE counts the whole database
+        assert cache.size() == 1
+
+    def test_batches_use_one_round_trip(self, fake_redis):
+        url = "redis://127.0.0.1:%d/0" % fake_redis.server_address[1]
+        cache = RedisCache(url, "gaps", maxsize=10)
+        cache.set_many([("a", 1), ("b", [2])])
+        commands = len(fake_redis.commands)
+
+        assert cache.get_many(["a", "missing", "b"]) == [1, None, [2]]
+        assert fake_redis.commands[commands:] == [
+            ["MGET", "skillsense:gaps:a", "skillsense:gaps:missing", "skillsense:gaps:b"]
+        ]
+        assert (cache.hits, cache.misses) == (2, 1)
+
+    def test_reconnects_after_server_closed_connection(self, fake_redis):
+        url = "redis://127.0.0.1:%d/0" % fake_redis.server_address[1]
+        cache = RedisCache(url, "gaps", maxsize=10)
+        cache.set("k", 1)
+
+        fake_redis.drop_connection = True
+        assert cache.get("k") == 1
+        assert cache.get_many(["k"]) == [1]
+        assert cache.errors == 0
+
+    def test_error_replies_are_not_retried(self, fake_redis):
+        url = "redis://127.0.0.1:%d/0" % fake_redis.server_address[1]
+        cache = RedisCache(url, "gaps", maxsize=10)
+
+        with pytest.raises(RedisError):
+            cache.command("BOGUS")
+        assert [args[0] for args in fake_redis.commands] == ["BOGUS"]
+
+    def test_unreachable_server_degrades_to_misses(self, fake_redis):
+        url = "redis://127.0.0.1:%d" % fake_redis.server_address[1]
+        fake_redis.shutdown()
+        fake_redis.server_close()
+
+        cache = RedisCache(url, "gaps", maxsize=10)
+        cache.set("k", 1)
+        assert cache.get("k") is None
+        assert cache.errors == 2
+
+
+class TestServiceCaches:
+    """Tests for result caching in the services"""
+
+    def test_create_cache_uses_configured_backend(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "cache_backend", "sqlite")
+        monkeypatch.setattr(settings, "cache_sqlite_path", str(tmp_path / "c.db"))
+        assert isinstance(create_cache("gaps", 10, 0), SQLiteCache)
+
+        monkeypatch.setattr(settings, "cache_backend", "memcached")
+        with pytest.raises(ValueError):
+            create_cache("gaps", 10, 0)
+
+    def test_prediction_cache_hits_ignore_metadata(self):
+        predictor_service.cache.clear()
+        responses = [
+            {"skillId": "python", "answer": "b", "isCorrect": True, "timeSpent": 30,
+             "questionId": "q1"},
+        ]
+        first = predictor_service.predict_proficiency("u1", responses)
+        hits = predictor_service.cache.hits
+
+        renamed = [dict(responses[0], questionId="q2")]
+        results = predictor_service.predict_proficiency_batch([renamed, responses])
+        assert results == [first, first]
+        assert predictor_service.cache.hits == hits + 2
+
+    def test_recommendation_cache_keyed_by_catalog_version(self):
+        service = RecommenderService()
+        gaps = [{"skillId": "s1", "skillName": "Python", "gapSize": 2, "priority": "high"}]
+        first = service.generate_recommendations("u1", gaps, limit=3)
+        assert service.generate_recommendations("u2", gaps, limit=3) is first
+
+        service.data = service.build_data(BuiltinCatalog(LEARNING_RESOURCES, version="v2"))
+        assert service.generate_recommendations("u1", gaps, limit=3) is not first
+        assert service.cache.stats()["hits"] == 1
+
+
+class TestScoringExecutor:
+    """Tests for ScoringExecutor"""
+
+    def test_pool_token_changes_on_every_publish(self):
+        from app.services.executor import _data_token
+
+        before = _data_token()
+        data_store.reload()
+        after_one = _data_token()
+        data_store.reload()
+        after_two = _data_token()
+
+        # Revisions never repeat, even if a freed snapshot's id is reused
+        assert before < after_one < after_two
+        assert all(a < b for a, b in zip(after_one, after_two))
+
+    def _responses(self, count):
+        return [
+            {"skillId": f"s{i % 7}", "answer": str(i % 5 + 1) if i % 3 else "a",
+             "isCorrect": i % 2 == 0, "timeSpent": 10 + i}
+            for i in range(count)
+        ]
+
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    def test_pool_results_match_inline(self, mode):
+        executor = ScoringExecutor(mode=mode, workers=1, threshold=10)
+        responses = self._responses(50)
+        expected = tasks.predict_proficiency("u1", responses)
+        try:
+            result = asyncio.run(
+                executor.run(len(responses), tasks.predict_proficiency, "u1", responses)
+            )
+        finally:
+            executor.shutdown()
+
+        assert result == expected
+        assert executor.stats()["dispatched"] == 1
+
+    def test_small_work_stays_inline(self):
+        executor = ScoringExecutor(mode="thread", workers=1, threshold=10)
+        asyncio.run(executor.run(3, tasks.predict_proficiency, "u1", self._responses(3)))
+        assert executor.inline == 1 and executor._pool is None
+
+    def test_rejects_when_saturated(self):
+        executor = ScoringExecutor(mode="thread", workers=1, threshold=0, max_pending=1)
+
+        async def run_two():
+            first = asyncio.ensure_future(
+                executor.run(1, tasks.predict_proficiency, "u1", self._responses(2000))
+            )
+            await asyncio.sleep(0)
+            with pytest.raises(ExecutorSaturated):
+                await executor.run(1, tasks.predict_proficiency, "u2", [])
+            await first
+
+        try:
+            asyncio.run(run_two())
+        finally:
+            executor.shutdown()
+        assert executor.rejected == 1
+
+
+class TestMicroBatcher:
+    """Tests for MicroBatcher"""
+
+    def _batcher(self, window, max_items):
+        calls = []
+
+        async def process(items):
+            calls.append(list(items))
+            if "bad" in items:
+                raise ValueError("bad item")
+            return [item * 2 for item in items]
+
+        return MicroBatcher(process, window=window, max_items=max_items), calls
+
+    def test_coalesces_concurrent_items(self):
+        batcher, calls = self._batcher(window=0.05, max_items=100)
+
+        async def burst():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        assert asyncio.run(burst()) == [0, 2, 4, 6, 8]
+        assert calls == [[0, 1, 2, 3, 4]]
+
+    def test_flushes_at_max_items(self):
+        batcher, calls = self._batcher(window=10, max_items=2)
+
+        async def burst():
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.submit(i) for i in range(4))), timeout=1
+            )
+
+        assert asyncio.run(burst()) == [0, 2, 4, 6]
+        assert calls == [[0, 1], [2, 3]]
+
+    def test_batch_failure_reaches_every_caller(self):
+        batcher, _ = self._batcher(window=0.01, max_items=10)
+
+        async def burst():
+            return await asyncio.gather(
+                batcher.submit(1), batcher.submit("bad"), return_exceptions=True
+            )
+
+        results = asyncio.run(burst())
+        assert all(isinstance(r, ValueError) for r in results)
+
+
+class TestMetrics:
+    """Tests for the metrics registry"""
+
+    def test_prometheus_text_format(self):
+        registry = Registry()
+        counter = registry.counter("jobs_total", "Jobs", ("kind",))
+        histogram = registry.histogram("job_seconds", "Job time", buckets=(0.1, 1.0))
+        registry.register_collector(lambda: [("queue", "gauge", "Queue", {(): 3})])
+
+        counter.inc(("a",))
+        counter.inc(("a",), 2)
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        lines = registry.render().splitlines()
+        assert "# TYPE jobs_total counter" in lines
+        assert 'jobs_total{kind="a"} 3' in lines
+        assert 'job_seconds_bucket{le="0.1"} 1' in lines
+        assert 'job_seconds_bucket{le="1.0"} 2' in lines
+        assert 'job_seconds_bucket{le="+Inf"} 3' in lines
+        assert "job_seconds_sum 5.55" in lines
+        assert "job_seconds_count 3" in lines
+        assert "queue 3" in lines
+
+
+class TestSamplingProfiler:
+    """Tests for SamplingProfiler"""
+
+    def test_samples_only_sampled_requests(self):
+        profiler = SamplingProfiler()
+        responses = TestPredictor()._make_responses(7, 3000)
+        profiler.start(sample_rate=1.0, duration=30, interval=0.001)
+        try:
+            with profiler.sample_request():
+                for i in range(20):
+                    predictor_service.predict_proficiency(f"profile-{i}", responses)
+        finally:
+            profiler.stop()
+
+        assert profiler.sampled_requests == 1
+        assert profiler.samples > 0
+        assert "predict_proficiency_batch" in profiler.collapsed()
+        assert profiler.status()["stoppedReason"] == "stopped"
+
+        speedscope = profiler.speedscope()
+        profile = speedscope["profiles"][0]
+        assert len(profile["samples"]) == len(profile["weights"]) == len(profiler.stacks)
+
+    def test_switches_itself_off(self):
+        profiler = SamplingProfiler()
+        profiler.start(sample_rate=1.0, duration=0.05, interval=0.005)
+        profiler._thread.join(timeout=5)
+
+        assert not profiler.active
+        assert profiler.status()["stoppedReason"] == "duration elapsed"
+        with profiler.sample_request():
+            pass
+        assert profiler.sampled_requests == 0
+        profiler.stop()
+
+
+class TestBenchmarks:
+    """Tests for the benchmark harness"""
+
+    def test_generators_are_seeded(self):
+        from benchmarks.generators import REQUEST_BUILDERS
+
+        for builder in REQUEST_BUILDERS.values():
+            assert builder(random.Random(1), "realistic") == builder(random.Random(1), "realistic")
+
+    def test_run_and_compare(self):
+        from benchmarks.run import compare, run_benchmarks
+
+        results = run_benchmarks(["realistic"], iterations=3, warmup=1, name_filter="gaps")
+        assert list(results) == ["direct.gaps.realistic", "route.gaps.realistic"]
+        assert all(stats["p50_ms"] > 0 and stats["peak_alloc_kib"] > 0 for stats in results.values())
+
+        slower = {
+            name: {**stats, "p50_ms": stats["p50_ms"] * 2} for name, stats in results.items()
+        }
+        assert not any(row["regression"] for row in compare(results, results, 0.2))
+        assert all(row["regression"] for row in compare(slower, results, 0.2))
+
+    def test_load_helpers(self):
+        from benchmarks.load import growth_rate, parse_mix
+
+        assert parse_mix("predict=3,gaps=1", ["predict", "gaps"]) == {"predict": 0.75, "gaps": 0.25}
+        with pytest.raises(ValueError):
+            parse_mix("train=1", ["predict"])
+
+        flat = [(t, 100.0) for t in range(0, 600, 10)]
+        leaking = [(t, 100.0 + t / 30) for t in range(0, 600, 10)]  # 2 MiB/min
+        assert growth_rate(flat) == 0.0
+        assert growth_rate(leaking) == pytest.approx(2.0)
+
+    def test_load_against_app(self):
+        import httpx
+        from app.main import app
+        from benchmarks.load import Payloads, parse_mix, run_load
+
+        kinds = ["predict", "gaps", "recommend"]
+        payloads = Payloads(parse_mix(",".join(kinds), kinds), {"realistic": 1.0}, pool=2, seed=1)
+        recorder = asyncio.run(run_load(
+            "http://load", payloads, duration=0.3, concurrency=4,
+            transport=httpx.ASGITransport(app=app), quiet=True,
+        ))
+        summary = recorder.summary(0.3)
+        assert summary["requests"] > 0
+        assert summary["error_rate"] == 0.0
+        assert set(summary["calls"]) <= {"predict", "gaps", "recommend"}
+
+    def test_recorder_memory_is_bounded(self):
+        from benchmarks.load import Recorder
+
+        recorder = Recorder()
+        for i in range(20000):
+            recorder.record("predict", 0.001 + (i % 100) / 1000, "200")
+        recorder.flush(1.0, {})
+
+        summary = recorder.summary(1.0)["calls"]["predict"]
+        assert summary["requests"] == 20000
+        assert summary["max_ms"] == 100.0
+        assert abs(summary["p50_ms"] - 50.0) <= 0.5
+        assert len(recorder.latencies["predict"].buckets) < 300
+
+    def test_replay_detects_drift(self):
+        import io
+        from benchmarks.replay import replay
+
+        body = {"userId": "u1", "gaps": [
+            {"skillId": "react", "skillName": "React", "gapSize": 3, "priority": "high"}
+        ]}
+        log = [
+            json.dumps({"path": "/api/v1/recommend", "body": body}),
+            json.dumps({"request_id": "user-001", "title": "not traffic"}),
+            "",
+            json.dumps({"method": "GET", "path": "/health/cache"}),
+        ]
+
+        first = io.StringIO()
+        stats = asyncio.run(replay(log, output=first))
+        assert stats.summary()["requests"] == 2
+        assert stats.skipped == {"not a request": 1, "blank": 1}
+
+        baseline = io.StringIO()
+        asyncio.run(replay(log[:1], output=baseline))
+        baseline.seek(0)
+        again = asyncio.run(replay(log[:1], previous=baseline))
+        assert (again.compared, again.drift) == (1, 0)
+
+        # Requests replayed in only one of the runs are drift too
+        first.seek(0)
+        truncated = asyncio.run(replay(log[:1], previous=first))
+        assert (truncated.compared, truncated.only_previous, truncated.drift) == (1, 1, 1)
+        assert truncated.drift_lines == [4]
+
+        baseline.seek(0)
+        extended = asyncio.run(replay(log[:1] * 2, previous=baseline))
+        assert (extended.compared, extended.only_current, extended.drift) == (1, 1, 1)
+        assert extended.drift_lines == [2]
+
+        first.seek(0)
+        body["gaps"][0]["gapSize"] = 1
+        changed = [json.dumps({"path": "/api/v1/recommend", "body": body})]
+        drifted = asyncio.run(replay(changed, previous=first))
+        assert (drifted.compared, drifted.only_previous, drifted.drift) == (1, 1, 2)
+        assert drifted.drift_lines == [1, 4]
+
+
+    def test_replay_latency_histogram(self):
+        from benchmarks.replay import LatencyHistogram
+        from benchmarks.run import percentile
+
+        rng = random.Random(5)
+        values = [rng.lognormvariate(1, 1) for _ in range(5000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.add(value)
+
+        assert histogram.count == len(values)
+        assert len(histogram.buckets) < 1000
+        for fraction in (0.5, 0.99):
+            exact = percentile(values, fraction)
+            assert abs(histogram.percentile(fraction) - exact) <= exact * 0.01
+        assert histogram.percentile(1.0) == max(values)
+
+
+class TestColdStart:
+    """Tests for deferred imports and service construction"""
+
+    def test_services_build_data_on_first_use(self):
+        from app.services.gap_analyzer import GapAnalyzerService
+
+        service = GapAnalyzerService()
+        assert not service.is_initialized
+        service.initialize()
+        assert service.is_initialized
+        assert service.data.version == gap_analyzer_service.data.version
+
+    def test_service_modules_load_independently(self):
+        import subprocess
+        import sys
+
+        code = (
+            "import sys; import app.services.tasks; import app.services as s; "
+            "print('sqlite3' in sys.modules, 'multiprocessing' in sys.modules, "
+            "s.recommender_service.is_initialized)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.split() == ["False", "False", "False"]
+
+    def test_cold_start_measurement(self):
+        from benchmarks.coldstart import PHASES, measure_once
+
+        phases = measure_once()
+        assert set(phases) == set(PHASES)
+        assert phases["total"] >= phases["import"] > 0
+
+
+class TestWarmup:
+    """Tests for the startup warm-up"""
+
+    def test_warmup_marks_components_ready(self):
+        from app.main import app
+        from app.services.warmup import WarmupService, synthetic_requests
+
+        paths = [path for path, _ in synthetic_requests()]
+        assert "/api/v1/pipeline" in paths and "/api/v1/recommend" in paths
+
+        warmup = WarmupService()
+        assert not warmup.ready
+        assert asyncio.run(warmup.run(app))
+        status = warmup.status()
+        assert status["state"] == "ready" and status["seconds"] > 0
+        assert all(c["ready"] and c["seconds"] is not None for c in status["components"].values())
+
+    def test_failed_step_is_reported(self, monkeypatch):
+        from app.main import app
+        from app.services import warmup as warmup_module
+
+        def broken():
+            raise ValueError("roles file is invalid")
+
+        monkeypatch.setattr(warmup_module, "_warm_roles", broken)
+        warmup = warmup_module.WarmupService()
+        assert not asyncio.run(warmup.run(app))
+        assert warmup.state == "failed" and not warmup.ready
+        assert warmup.components["predictor"]["ready"]
+        assert warmup.components["roles"]["error"] == "roles file is invalid"
+        assert not warmup.components["catalog"]["ready"]
+
+
+class TestSkillNameIndex:
+    """Tests for SkillNameIndex"""
+
+    def test_exact_alias_and_fallback(self):
+        index = SkillNameIndex(["javascript", "nodejs", "default"], aliases={"JS": "javascript"})
+        assert index.lookup("Java Script") == "javascript"
+        assert index.lookup("js") == "javascript"
+        assert index.lookup("cobol") == "default"
+
+    def test_substring_matches_prefer_catalog_order(self):
+        index = SkillNameIndex(["machinelearning", "learning", "default"])
+        # Name contained in several keys
+        assert index.lookup("learn") == "machinelearning"
+        # Keys contained in the name
+        assert index.lookup("deep-learning") == "learning"
+        assert index.lookup("applied machine learning") == "machinelearning"
+
+    def test_matches_linear_scan_on_catalog(self):
+        """Index resolution should agree with scanning every catalog key"""
+        def scan(name):
+            normalized = name.lower().replace(" ", "").replace(".", "").replace("-", "")
+            if normalized in LEARNING_RESOURCES:
+                return normalized
+            for key in LEARNING_RESOURCES:
+                if key != "default" and (key in normalized or normalized in key):
+                    return key
+            return "default"
+
+        index = SkillNameIndex(LEARNING_RESOURCES)
+        rng = random.Random(3)
+        names = ["REST APIs", "Node.js", "Agile", "Cloud", "Data Structures", ""]
+        for key in LEARNING_RESOURCES:
+            start = rng.randint(0, len(key))
+            names += [key[start:], "advanced " + key, key[: len(key) // 2]]
+        for name in names:
+            assert index.lookup(name) == scan(name), name
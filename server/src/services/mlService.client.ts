@@ -27,6 +27,13 @@ interface ProficiencyPredictionResponse {
   confidence: number;
 }
 
+interface ProficiencyBatchResult {
+  userId: string | null;
+  predictions: ProficiencyPredictionResponse['predictions'] | null;
+  confidence: number | null;
+  error: string | null;
+}
+
 interface GapAnalysisRequest {
   userId: string;
   skillProfile: {
@@ -69,6 +76,7 @@ interface RecommendationRequest {
     gapSize: number;
     priority: string;
   }[];
+  limit?: number;
 }
 
 interface LearningRecommendation {
@@ -83,6 +91,24 @@ interface LearningRecommendation {
   priority: number;
 }
 
+type PipelineStage = 'predict' | 'gaps' | 'recommend';
+
+interface PipelineRequest {
+  userId: string;
+  stages?: PipelineStage[];
+  assessmentResponses?: ProficiencyPredictionRequest['assessmentResponses'];
+  skillProfile?: GapAnalysisRequest['skillProfile'];
+  targetRoleId?: string;
+  gaps?: RecommendationRequest['gaps'];
+  limit?: number;
+}
+
+interface PipelineResponse {
+  prediction: ProficiencyPredictionResponse | null;
+  gapAnalysis: GapAnalysisResponse | null;
+  recommendations: LearningRecommendation[] | null;
+}
+
 class MLServiceClient {
   private client: AxiosInstance;
 
@@ -133,6 +159,21 @@ class MLServiceClient {
     }
   }
 
+  async predictProficiencyBatch(
+    requests: ProficiencyPredictionRequest[]
+  ): Promise<ProficiencyBatchResult[] | null> {
+    try {
+      const response = await this.client.post<{ results: ProficiencyBatchResult[] }>(
+        '/api/v1/predict/proficiency:batch',
+        { requests }
+      );
+      return response.data.results;
+    } catch (error) {
+      console.warn('Batch proficiency prediction failed:', error);
+      return null;
+    }
+  }
+
   async analyzeGaps(
     request: GapAnalysisRequest
   ): Promise<GapAnalysisResponse | null> {
@@ -162,6 +203,23 @@ class MLServiceClient {
       return null;
     }
   }
+
+  /**
+   * Predict, analyze gaps and recommend in one round trip; stages that
+   * are not requested come back as null.
+   */
+  async runPipeline(request: PipelineRequest): Promise<PipelineResponse | null> {
+    try {
+      const response = await this.client.post<PipelineResponse>(
+        '/api/v1/pipeline',
+        request
+      );
+      return response.data;
+    } catch (error) {
+      console.warn('Assessment pipeline failed:', error);
+      return null;
+    }
+  }
 }
 
 export const mlServiceClient = new MLServiceClient();